@@ -0,0 +1,23 @@
+"""
+BAR Build Order Simulator - Benchmark Suite
+=============================================
+Speed benchmarks for the simulator, optimizer, data layer and web API,
+run with `python cli.py bench`.
+
+Groups:
+    startup    import time of the engine + optimizer (fresh interpreter)
+    engine     ticks/s simulating each shipped build order
+    optimizer  evaluate_candidate() throughput per goal (with early stops)
+    operators  enforce_constraints / mutation / crossover cost
+    db         unit DB load and per-unit lookup latency
+    maps       cached map resolution latency
+    web        /api/simulate and /api/build-orders throughput (in-process)
+
+Reports are JSON; compare() flags metrics that regressed by more than a
+threshold against a saved baseline.
+"""
+
+from bar_sim.bench.suite import (
+    CASES, DEFAULT_BASELINE, BenchConfig, Metric, compare, load_report,
+    run_suite, save_report,
+)
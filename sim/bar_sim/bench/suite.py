@@ -0,0 +1,281 @@
+"""
+Benchmark cases and runner.
+
+Each case is a function taking a BenchConfig and returning a list of
+Metric. Cases are registered with @bench("group") and selected by group
+name prefix. Timings use the best of `repeat` runs to damp scheduler
+noise.
+"""
+
+import copy
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SIM_ROOT = Path(__file__).resolve().parent.parent.parent
+BUILD_ORDERS_DIR = SIM_ROOT / "data" / "build_orders"
+DEFAULT_BASELINE = SIM_ROOT / "data" / "bench_baseline.json"
+
+
+@dataclass
+class Metric:
+    name: str
+    value: float
+    unit: str
+    higher_is_better: bool = True
+
+
+@dataclass
+class BenchConfig:
+    repeat: int = 3
+    quick: bool = False     # fewer candidates / requests, for CI smoke runs
+    duration: int = 600
+
+
+CASES: Dict[str, Callable[[BenchConfig], List[Metric]]] = {}
+
+
+def bench(group: str):
+    """Register a benchmark case under `group`."""
+    def register(fn):
+        CASES[group] = fn
+        return fn
+    return register
+
+
+def _best_time(fn: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _shipped_build_orders():
+    from bar_sim.io import load_build_order
+    return [(p.stem, load_build_order(str(p)))
+            for p in sorted(BUILD_ORDERS_DIR.glob("*.yaml"))]
+
+
+def _candidates(n: int):
+    from bar_sim.models import MapConfig
+    from bar_sim.optimizer import enforce_constraints, random_seed
+    mc = MapConfig()
+    rng = random.Random(1234)
+    return [enforce_constraints(random_seed(mc, rng), mc) for _ in range(n)]
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+@bench("startup")
+def bench_startup(cfg: BenchConfig) -> List[Metric]:
+    code = "import bar_sim.engine, bar_sim.optimizer"
+
+    def run():
+        subprocess.run([sys.executable, "-c", code], cwd=str(SIM_ROOT), check=True)
+
+    return [Metric("startup.import_ms", _best_time(run, cfg.repeat) * 1000, "ms", False)]
+
+
+@bench("engine")
+def bench_engine(cfg: BenchConfig) -> List[Metric]:
+    from bar_sim.engine import SimulationEngine
+    metrics = []
+    for name, bo in _shipped_build_orders():
+        def run():
+            SimulationEngine(copy.deepcopy(bo), cfg.duration).run()
+        elapsed = _best_time(run, cfg.repeat)
+        metrics.append(Metric(f"engine.ticks_per_sec.{name}", cfg.duration / elapsed, "ticks/s"))
+    return metrics
+
+
+@bench("optimizer")
+def bench_optimizer(cfg: BenchConfig) -> List[Metric]:
+    from bar_sim.optimizer import evaluate_candidate, make_goal
+    goal_names = ["max_metal", "max_energy", "fastest_factory", "fastest_t2",
+                  "max_army", "min_stall", "balanced"]
+    bos = _candidates(4 if cfg.quick else 12)
+    metrics = []
+    for name in goal_names:
+        goal = make_goal(name)
+
+        def run():
+            for bo in bos:
+                evaluate_candidate(copy.deepcopy(bo), goal, cfg.duration)
+        elapsed = _best_time(run, cfg.repeat)
+        metrics.append(Metric(f"optimizer.evals_per_sec.{name}", len(bos) / elapsed, "evals/s"))
+    return metrics
+
+
+@bench("operators")
+def bench_operators(cfg: BenchConfig) -> List[Metric]:
+    from bar_sim.models import MapConfig
+    from bar_sim.optimizer import (
+        MUTATIONS, _crossover_one_point, _crossover_uniform, enforce_constraints,
+    )
+    mc = MapConfig()
+    bos = _candidates(20 if cfg.quick else 100)
+    rng = random.Random(99)
+    n = len(bos)
+
+    def constraints():
+        for bo in bos:
+            enforce_constraints(copy.deepcopy(bo), mc)
+
+    def mutations():
+        for bo in bos:
+            for mut in MUTATIONS:
+                mut(bo, rng)
+
+    def crossovers():
+        for a, b in zip(bos, bos[1:]):
+            _crossover_one_point(a, b, rng)
+            _crossover_uniform(a, b, rng)
+
+    return [
+        Metric("operators.enforce_constraints_us",
+               _best_time(constraints, cfg.repeat) / n * 1e6, "us", False),
+        Metric("operators.mutation_us",
+               _best_time(mutations, cfg.repeat) / (n * len(MUTATIONS)) * 1e6, "us", False),
+        Metric("operators.crossover_us",
+               _best_time(crossovers, cfg.repeat) / (2 * (n - 1)) * 1e6, "us", False),
+    ]
+
+
+@bench("db")
+def bench_db(cfg: BenchConfig) -> List[Metric]:
+    from bar_sim import db
+    ids = list(db.get_game_id_map("ARMADA").values())
+
+    def cold_load():
+        db.clear_cache()
+        db.load_units_dict("ARMADA")
+
+    def lookups():
+        for game_id in ids:
+            db.get_unit_by_game_id(game_id)
+
+    return [
+        Metric("db.load_units_ms", _best_time(cold_load, cfg.repeat) * 1000, "ms", False),
+        Metric("db.lookup_us", _best_time(lookups, cfg.repeat) / len(ids) * 1e6, "us", False),
+    ]
+
+
+@bench("maps")
+def bench_maps(cfg: BenchConfig) -> List[Metric]:
+    from bar_sim.map_data import get_map_data, list_cached_maps, map_data_to_map_config
+    metrics = []
+    for name in list_cached_maps():
+        def resolve():
+            map_data_to_map_config(get_map_data(name))
+        metrics.append(Metric(f"maps.resolve_ms.{name}",
+                              _best_time(resolve, cfg.repeat) * 1000, "ms", False))
+    return metrics
+
+
+@bench("web")
+def bench_web(cfg: BenchConfig) -> List[Metric]:
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError:
+        # Needs the test client's optional dependency (httpx)
+        return []
+    from bar_sim.web import _bo_to_dict, _response_cache, app
+    client = TestClient(app)
+    _, bo = _shipped_build_orders()[0]
+    body = _bo_to_dict(bo)
+    n = 5 if cfg.quick else 20
+
+    def uncached():
+        _response_cache.clear()
+        for i in range(n):
+            client.post("/api/simulate", json={"build_order": body,
+                                               "duration": cfg.duration - i}).raise_for_status()
+
+    def cached():
+        for _ in range(n):
+            client.post("/api/simulate", json={"build_order": body,
+                                               "duration": cfg.duration}).raise_for_status()
+
+    def listing():
+        for _ in range(n):
+            client.get("/api/build-orders").raise_for_status()
+
+    return [
+        Metric("web.simulate_rps", n / _best_time(uncached, cfg.repeat), "req/s"),
+        Metric("web.simulate_cached_rps", n / _best_time(cached, cfg.repeat), "req/s"),
+        Metric("web.build_orders_rps", n / _best_time(listing, cfg.repeat), "req/s"),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Runner & baseline comparison
+# ---------------------------------------------------------------------------
+
+def run_suite(only: Optional[List[str]] = None, cfg: Optional[BenchConfig] = None,
+              progress: Optional[Callable[[str], None]] = None) -> dict:
+    """Run the selected groups (all by default) and return a JSON-ready report."""
+    cfg = cfg or BenchConfig()
+    metrics: List[Metric] = []
+    for group, case in CASES.items():
+        if only and not any(group.startswith(o) for o in only):
+            continue
+        if progress:
+            progress(group)
+        metrics.extend(case(cfg))
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": asdict(cfg),
+        },
+        "metrics": {m.name: {"value": round(m.value, 4), "unit": m.unit,
+                             "higher_is_better": m.higher_is_better}
+                    for m in metrics},
+    }
+
+
+def compare(report: dict, baseline: dict, threshold: float = 0.15) -> List[dict]:
+    """Compare metrics present in both reports.
+
+    change is the relative improvement (+) or regression (-) in the
+    metric's own direction; a regression beyond `threshold` is flagged.
+    """
+    rows = []
+    for name, cur in report["metrics"].items():
+        base = baseline.get("metrics", {}).get(name)
+        if not base or not base["value"]:
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        if not cur["higher_is_better"]:
+            change = -change
+        rows.append({
+            "name": name,
+            "baseline": base["value"],
+            "value": cur["value"],
+            "unit": cur["unit"],
+            "change": round(change, 4),
+            "regression": change < -threshold,
+        })
+    return rows
+
+
+def save_report(report: dict, path):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def load_report(path) -> dict:
+    with open(path) as f:
+        return json.load(f)
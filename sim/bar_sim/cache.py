@@ -0,0 +1,77 @@
+"""
+BAR Build Order Simulator - Result Cache
+==========================================
+Small thread-safe LRU cache keyed by a canonical hash of the request.
+
+The simulation engine is deterministic for a given build order, duration
+and seed, so identical requests can be answered from memory. Keys are
+SHA-256 digests of the canonical JSON of the key parts plus a generation
+counter; clear() bumps the generation so previously issued keys (and the
+ETags derived from them) stop matching. The generation also carries a
+random per-cache token, so keys from another process (e.g. before a
+server restart, possibly with different unit data) never match either.
+"""
+
+import hashlib
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def canonical_hash(*parts: Any) -> str:
+    """Order-independent digest of JSON-compatible key parts."""
+    blob = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """Bounded LRU mapping of canonical request hashes to computed payloads."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.token = secrets.token_hex(8)
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def key(self, *parts: Any) -> str:
+        return canonical_hash(self.token, self.generation, *parts)
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry and invalidate all previously issued keys."""
+        with self._lock:
+            self._entries.clear()
+            self.generation += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "generation": self.generation,
+        }
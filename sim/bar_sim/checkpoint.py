@@ -0,0 +1,52 @@
+"""
+BAR Build Order Simulator - Optimizer Checkpoints
+===================================================
+On-disk snapshots of a GA run, so long searches survive crashes and
+pre-emption and can be resumed exactly where they stopped.
+
+A checkpoint is a pickle of Optimizer.state_dict() tagged with a format
+version. It is written to a temporary file in the target directory,
+fsynced and renamed over the target, so readers only ever see the old
+checkpoint or the new one, never a partial write.
+
+Checkpoints are pickles: only load files you wrote yourself.
+"""
+
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Union
+
+CHECKPOINT_VERSION = 1
+
+PathLike = Union[str, Path]
+
+
+def save_checkpoint(state: dict, path: PathLike):
+    """Atomically write `state` to `path`."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"version": CHECKPOINT_VERSION, "state": state}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def load_checkpoint(path: PathLike) -> dict:
+    """Read a checkpoint written by save_checkpoint() and return its state."""
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if not isinstance(data, dict) or data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: not a version {CHECKPOINT_VERSION} optimizer checkpoint")
+    return data["state"]
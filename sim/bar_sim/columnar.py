@@ -0,0 +1,407 @@
+"""
+BAR Build Order Simulator - Columnar Result Format
+====================================================
+Compact, column-oriented encoding of SimResult for the web API and exports.
+
+Row-oriented JSON repeats every key for every snapshot and ships a full
+unit_counts dict each time. The columnar layout stores one array per metric,
+delta-encodes tick columns and dictionary-encodes unit keys / builder ids:
+
+    {
+      "format": "bar-sim-columnar", "version": 1,
+      "build_order_name": ..., "summary": {...},
+      "unit_keys": ["mex", "wind", ...],
+      "snapshots": {
+        "tick": [0, 30, 30, ...],              # first value absolute, then deltas
+        "metal_income": [...], ...,
+        "unit_counts": {"0": [...], "1": [...]}, # unit_keys index -> count per snapshot
+        "army_by_role": {"0": [...]}            # army_roles index -> count, null if absent
+      },
+      "army_roles": ["raider", ...],
+      "completion_log": {"tick": [...deltas], "unit": [...], "builder": [...]},
+      "builder_ids": ["commander", "factory_0", ...],
+      "milestones": {...}, "stall_events": {...},
+    }
+
+The same document can be serialized as JSON, MessagePack (needs `msgpack`)
+or Arrow IPC (needs `pyarrow`).
+"""
+
+import json
+from typing import Dict, Iterable, List, Optional
+
+from bar_sim.models import SimResult, Snapshot, Milestone, StallEvent, expand_unit_counts
+
+FORMAT_NAME = "bar-sim-columnar"
+FORMAT_VERSION = 1
+
+# Numeric snapshot columns, in output order
+SNAPSHOT_FIELDS = (
+    "metal_income", "energy_income", "metal_stored", "energy_stored",
+    "metal_expenditure", "energy_expenditure", "build_power",
+    "army_value_metal", "stall_factor",
+)
+
+# Scalar SimResult fields carried in the "summary" block
+SUMMARY_FIELDS = (
+    "time_to_first_factory", "time_to_first_constructor",
+    "time_to_first_nano", "time_to_t2_lab",
+    "peak_metal_income", "peak_energy_income",
+    "total_metal_stall_seconds", "total_energy_stall_seconds",
+    "total_army_metal_value", "strategy_used",
+)
+
+# Wire formats: name -> media type
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": "application/vnd.bar-sim.columnar+json",
+    "msgpack": "application/x-msgpack",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+
+# Extra media types accepted for each format during negotiation
+_MEDIA_ALIASES = {
+    "application/msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+}
+
+# File extension -> format for save_result/load_result
+FILE_FORMATS = {
+    ".json": "columnar",
+    ".msgpack": "msgpack",
+    ".mpk": "msgpack",
+    ".arrow": "arrow",
+    ".arrows": "arrow",
+}
+
+
+# ---------------------------------------------------------------------------
+# Delta / dictionary helpers
+# ---------------------------------------------------------------------------
+
+def delta_encode(values: List[int]) -> List[int]:
+    """[0, 30, 60, 90] -> [0, 30, 30, 30]."""
+    out = []
+    prev = 0
+    for v in values:
+        out.append(v - prev)
+        prev = v
+    return out
+
+
+def delta_decode(deltas: List[int]) -> List[int]:
+    """[0, 30, 30, 30] -> [0, 30, 60, 90]."""
+    out = []
+    total = 0
+    for d in deltas:
+        total += d
+        out.append(total)
+    return out
+
+
+class _KeyTable:
+    """Assigns stable integer ids to strings in first-seen order."""
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def id(self, key: str) -> int:
+        idx = self._index.get(key)
+        if idx is None:
+            idx = len(self.keys)
+            self._index[key] = idx
+            self.keys.append(key)
+        return idx
+
+
+# ---------------------------------------------------------------------------
+# SimResult <-> columnar document
+# ---------------------------------------------------------------------------
+
+def result_to_columnar(result: SimResult) -> dict:
+    """Convert a SimResult to the columnar document (plain dict/lists)."""
+    unit_keys = _KeyTable()
+    builder_ids = _KeyTable()
+    snaps = result.snapshots
+    n = len(snaps)
+
+    snap_cols: dict = {"tick": delta_encode([s.tick for s in snaps])}
+    for name in SNAPSHOT_FIELDS:
+        snap_cols[name] = [getattr(s, name) for s in snaps]
+
+    # Dense count matrix: one column per unit key, zero where absent
+    counts: Dict[int, List[int]] = {}
+    cfg = result.snapshot_config
+    if cfg is not None and cfg.unit_count_deltas:
+        per_snap = expand_unit_counts(snaps)
+    else:
+        per_snap = [s.unit_counts for s in snaps]
+    for i, snap_counts in enumerate(per_snap):
+        for key, count in snap_counts.items():
+            idx = unit_keys.id(key)
+            col = counts.get(idx)
+            if col is None:
+                col = counts[idx] = [0] * n
+            col[i] = count
+    snap_cols["unit_counts"] = {str(k): v for k, v in counts.items()}
+
+    # Roles are few, so keep them dense too; None marks "role not present"
+    # (a present role may legitimately count 0)
+    roles = _KeyTable()
+    by_role: Dict[int, List[Optional[int]]] = {}
+    for i, snap in enumerate(snaps):
+        for role, count in snap.army_by_role.items():
+            idx = roles.id(role)
+            col = by_role.get(idx)
+            if col is None:
+                col = by_role[idx] = [None] * n
+            col[i] = count
+    snap_cols["army_by_role"] = {str(k): v for k, v in by_role.items()}
+
+    econ_states = _KeyTable()
+    snap_cols["econ_state"] = [econ_states.id(s.econ_state) for s in snaps]
+    snap_cols["econ_states"] = econ_states.keys
+
+    log = result.completion_log
+    completion = {
+        "tick": delta_encode([t for t, _, _ in log]),
+        "unit": [unit_keys.id(u) for _, u, _ in log],
+        "builder": [builder_ids.id(b) for _, _, b in log],
+    }
+
+    milestones = {
+        "tick": [m.tick for m in result.milestones],
+        "event": [m.event for m in result.milestones],
+        "description": [m.description for m in result.milestones],
+        "metal_income": [m.metal_income for m in result.milestones],
+        "energy_income": [m.energy_income for m in result.milestones],
+    }
+
+    stalls = {
+        "start_tick": [s.start_tick for s in result.stall_events],
+        "end_tick": [s.end_tick for s in result.stall_events],
+        "resource": [s.resource for s in result.stall_events],
+        "severity": [s.severity for s in result.stall_events],
+    }
+
+    return {
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "build_order_name": result.build_order_name,
+        "total_ticks": result.total_ticks,
+        "summary": {name: getattr(result, name) for name in SUMMARY_FIELDS},
+        "unit_keys": unit_keys.keys,
+        "army_roles": roles.keys,
+        "builder_ids": builder_ids.keys,
+        "snapshots": snap_cols,
+        "completion_log": completion,
+        "milestones": milestones,
+        "stall_events": stalls,
+        "army_composition_final": dict(result.army_composition_final),
+        "goal_completions": [[t, d] for t, d in result.goal_completions],
+    }
+
+
+def columnar_to_result(doc: dict) -> SimResult:
+    """Rebuild a SimResult from a columnar document."""
+    if doc.get("format") != FORMAT_NAME:
+        raise ValueError(f"Not a {FORMAT_NAME} document")
+    if doc.get("version", 0) > FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar version: {doc.get('version')}")
+
+    unit_keys = doc.get("unit_keys", [])
+    builder_ids = doc.get("builder_ids", [])
+    result = SimResult(
+        build_order_name=doc.get("build_order_name", ""),
+        total_ticks=doc.get("total_ticks", 0),
+    )
+    for name, value in doc.get("summary", {}).items():
+        if name in SUMMARY_FIELDS:
+            setattr(result, name, value)
+
+    cols = doc.get("snapshots", {})
+    ticks = delta_decode(cols.get("tick", []))
+    counts = {unit_keys[int(k)]: v for k, v in cols.get("unit_counts", {}).items()}
+    army_roles = doc.get("army_roles", [])
+    by_role = {army_roles[int(k)]: v for k, v in cols.get("army_by_role", {}).items()}
+    econ_states = cols.get("econ_states", [])
+    econ_col = cols.get("econ_state", [])
+    for i, tick in enumerate(ticks):
+        fields = {name: cols[name][i] for name in SNAPSHOT_FIELDS if name in cols}
+        if econ_col:
+            fields["econ_state"] = econ_states[econ_col[i]]
+        result.snapshots.append(Snapshot(
+            tick=tick,
+            unit_counts={key: col[i] for key, col in counts.items() if col[i]},
+            army_by_role={role: col[i] for role, col in by_role.items() if col[i] is not None},
+            **fields,
+        ))
+
+    log = doc.get("completion_log", {})
+    for tick, unit, builder in zip(delta_decode(log.get("tick", [])),
+                                   log.get("unit", []), log.get("builder", [])):
+        result.completion_log.append((tick, unit_keys[unit], builder_ids[builder]))
+
+    ms = doc.get("milestones", {})
+    for i, tick in enumerate(ms.get("tick", [])):
+        result.milestones.append(Milestone(
+            tick=tick,
+            event=ms["event"][i],
+            description=ms["description"][i],
+            metal_income=ms["metal_income"][i],
+            energy_income=ms["energy_income"][i],
+        ))
+
+    st = doc.get("stall_events", {})
+    for i, start in enumerate(st.get("start_tick", [])):
+        result.stall_events.append(StallEvent(
+            start_tick=start,
+            end_tick=st["end_tick"][i],
+            resource=st["resource"][i],
+            severity=st["severity"][i],
+        ))
+
+    result.army_composition_final = dict(doc.get("army_composition_final", {}))
+    result.goal_completions = [(t, d) for t, d in doc.get("goal_completions", [])]
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Wire encodings
+# ---------------------------------------------------------------------------
+
+def encode_payload(payload, fmt: str) -> bytes:
+    """Serialize a JSON-compatible payload as JSON or MessagePack bytes."""
+    if fmt in ("json", "columnar"):
+        return json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    if fmt == "msgpack":
+        import msgpack
+        return msgpack.packb(payload, use_bin_type=True)
+    raise ValueError(f"Format '{fmt}' cannot encode arbitrary payloads")
+
+
+def decode_payload(data: bytes, fmt: str):
+    if fmt in ("json", "columnar"):
+        return json.loads(data)
+    if fmt == "msgpack":
+        import msgpack
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    raise ValueError(f"Format '{fmt}' cannot decode arbitrary payloads")
+
+
+def encode_result(result: SimResult, fmt: str = "columnar") -> bytes:
+    """Encode a SimResult as columnar JSON, MessagePack or Arrow IPC bytes."""
+    doc = result_to_columnar(result)
+    if fmt == "arrow":
+        return _columnar_to_arrow(doc)
+    return encode_payload(doc, fmt)
+
+
+def decode_result(data: bytes, fmt: str = "columnar") -> SimResult:
+    if fmt == "arrow":
+        return columnar_to_result(_arrow_to_columnar(data))
+    return columnar_to_result(decode_payload(data, fmt))
+
+
+def _columnar_to_arrow(doc: dict) -> bytes:
+    """Snapshot columns become the record batch; everything else rides along
+    as JSON in the schema metadata."""
+    import pyarrow as pa
+
+    cols = doc["snapshots"]
+    arrays = {"tick": pa.array(cols["tick"], pa.int32())}
+    for name in SNAPSHOT_FIELDS:
+        arrays[name] = pa.array(cols[name], pa.float64())
+    arrays["econ_state"] = pa.array(cols["econ_state"], pa.int16())
+    for idx, col in cols["unit_counts"].items():
+        arrays[f"unit_counts.{idx}"] = pa.array(col, pa.int32())
+    for idx, col in cols["army_by_role"].items():
+        arrays[f"army_by_role.{idx}"] = pa.array(col, pa.int32())
+
+    meta = {k: v for k, v in doc.items() if k != "snapshots"}
+    meta["econ_states"] = cols["econ_states"]
+    table = pa.table(arrays).replace_schema_metadata(
+        {FORMAT_NAME: json.dumps(meta, separators=(",", ":"))})
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _arrow_to_columnar(data: bytes) -> dict:
+    import pyarrow as pa
+
+    table = pa.ipc.open_stream(data).read_all()
+    doc = json.loads(table.schema.metadata[FORMAT_NAME.encode()])
+    cols: dict = {"unit_counts": {}, "army_by_role": {},
+                  "econ_states": doc.pop("econ_states", [])}
+    for name in table.column_names:
+        values = table.column(name).to_pylist()
+        group, _, idx = name.partition(".")
+        if group in ("unit_counts", "army_by_role") and idx:
+            cols[group][idx] = values
+        else:
+            cols[name] = values
+    doc["snapshots"] = cols
+    return doc
+
+
+# ---------------------------------------------------------------------------
+# Content negotiation
+# ---------------------------------------------------------------------------
+
+def negotiate_format(accept: Optional[str], default: str = "json",
+                     supported: Optional[Iterable[str]] = None) -> Optional[str]:
+    """Pick a wire format from an HTTP Accept header.
+
+    Only formats in `supported` (default: every format whose optional
+    dependency is installed) are considered, so a client preferring an
+    unavailable format still gets the next one it accepts. Returns the
+    format name, `default` (or the first supported format) for a missing or
+    wildcard header, or None if nothing acceptable is supported.
+    """
+    if supported is None:
+        supported = [fmt for fmt in MEDIA_TYPES if format_available(fmt)]
+    supported = list(supported)
+    if default not in supported:
+        default = supported[0] if supported else None
+    if not accept:
+        return default
+
+    by_media = {media: fmt for fmt, media in MEDIA_TYPES.items()}
+    by_media.update(_MEDIA_ALIASES)
+
+    candidates = []
+    for pos, part in enumerate(accept.split(",")):
+        fields = [p.strip() for p in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for param in fields[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            candidates.append((-q, pos, media))
+
+    for _, _, media in sorted(candidates):
+        if by_media.get(media) in supported:
+            return by_media[media]
+        if media in ("*/*", "application/*") and default is not None:
+            return default
+    return None
+
+
+def format_available(fmt: str) -> bool:
+    """Whether the optional dependency for a wire format is installed."""
+    try:
+        if fmt == "msgpack":
+            import msgpack  # noqa: F401
+        elif fmt == "arrow":
+            import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return fmt in MEDIA_TYPES
@@ -9,16 +9,6 @@ from bar_sim.models import SimResult
 from bar_sim.format import fmt_time, fmt_rate
 
 
-def _find_snapshot_at(result: SimResult, tick: int):
-    best = None
-    for s in result.snapshots:
-        if s.tick <= tick:
-            best = s
-        else:
-            break
-    return best
-
-
 def compare_and_print(results: List[SimResult]):
     if not results:
         return
@@ -52,7 +42,7 @@ def compare_and_print(results: List[SimResult]):
     for key, label in milestone_keys:
         print(f" {label:<15}", end="")
         for r in results:
-            ms = next((m for m in r.milestones if m.event == key), None)
+            ms = r.milestone(key)
             val = fmt_time(ms.tick) if ms else "--"
             print(f"{val:>{col_w}}", end="")
         print()
@@ -60,27 +50,24 @@ def compare_and_print(results: List[SimResult]):
     # Economy at checkpoints
     for t in [180, 300, 420]:
         print(f"\nECONOMY @ {fmt_time(t)}")
+        snaps = [r.snapshot_at(t) for r in results]
         print(f" {'M/s':<15}", end="")
-        for r in results:
-            s = _find_snapshot_at(r, t)
+        for s in snaps:
             print(f"{fmt_rate(s.metal_income) if s else '--':>{col_w}}", end="")
         print()
 
         print(f" {'E/s':<15}", end="")
-        for r in results:
-            s = _find_snapshot_at(r, t)
+        for s in snaps:
             print(f"{fmt_rate(s.energy_income) if s else '--':>{col_w}}", end="")
         print()
 
         print(f" {'Stored M':<15}", end="")
-        for r in results:
-            s = _find_snapshot_at(r, t)
+        for s in snaps:
             print(f"{f'{s.metal_stored:.0f}' if s else '--':>{col_w}}", end="")
         print()
 
         print(f" {'Army Value':<15}", end="")
-        for r in results:
-            s = _find_snapshot_at(r, t)
+        for s in snaps:
             print(f"{f'{s.army_value_metal:.0f}' if s else '--':>{col_w}}", end="")
         print()
 
@@ -115,10 +102,10 @@ def compare_and_print(results: List[SimResult]):
                   lambda r: r.time_to_first_factory,
                   lambda v: fmt_time(v), lower_is_better=True)
     _print_winner("Best 5:00 eco", results, names,
-                  lambda r: _find_snapshot_at(r, 300).metal_income if _find_snapshot_at(r, 300) else 0,
+                  lambda r: getattr(r.snapshot_at(300), "metal_income", 0),
                   lambda v: f"{v:.1f} M/s")
     _print_winner("Best 5:00 army", results, names,
-                  lambda r: _find_snapshot_at(r, 300).army_value_metal if _find_snapshot_at(r, 300) else 0,
+                  lambda r: getattr(r.snapshot_at(300), "army_value_metal", 0),
                   lambda v: f"{v:.0f} metal")
     _print_winner("Least stalling", results, names,
                   lambda r: r.total_metal_stall_seconds + r.total_energy_stall_seconds,
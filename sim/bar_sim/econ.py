@@ -9,9 +9,12 @@ from unitlist.csv. Falls back to legacy hardcoded values if DB is unavailable.
 See bar_db.py for the import pipeline and alias mapping.
 """
 
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import Optional
+from types import MappingProxyType
+from typing import Dict, Iterator, Optional
 import math
+import threading
 
 
 # =============================================================================
@@ -371,6 +374,7 @@ def _load_units(faction: str = "ARMADA") -> dict:
 
 # Module-level UNITS dict -- all consumers import this
 UNITS = _load_units()
+_current_faction = "ARMADA"
 
 
 def set_faction(faction: str):
@@ -379,9 +383,69 @@ def set_faction(faction: str):
     Clears and repopulates the existing dict object so that all modules
     that imported UNITS via 'from bar_econ import UNITS' see the update.
     """
+    global _current_faction
     new_data = _load_units(faction.upper())
     UNITS.clear()
     UNITS.update(new_data)
+    _current_faction = faction.upper()
+
+
+def get_faction() -> str:
+    """Faction currently loaded into UNITS."""
+    return _current_faction
+
+
+# =============================================================================
+# PER-FACTION CATALOGS
+# =============================================================================
+
+class UnitCatalog(Mapping):
+    """Read-only {unit_key: Unit} table for one faction.
+
+    Unlike the module-level UNITS dict, a catalog never changes after it is
+    built, so one instance can be shared by any number of concurrent
+    simulations. Use get_catalog() rather than constructing these directly.
+    """
+
+    def __init__(self, faction: str, units: dict):
+        self.faction = faction
+        self._units = MappingProxyType(dict(units))
+
+    def __getitem__(self, key: str) -> Unit:
+        return self._units[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._units)
+
+    def __len__(self) -> int:
+        return len(self._units)
+
+    def __repr__(self) -> str:
+        return f"UnitCatalog({self.faction!r}, {len(self)} units)"
+
+    def __reduce__(self):
+        # Pickle by faction; the receiving process loads its own copy
+        return get_catalog, (self.faction,)
+
+
+_catalogs: Dict[str, UnitCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(faction: Optional[str] = None) -> UnitCatalog:
+    """Shared catalog for `faction` (default: the faction loaded into UNITS).
+
+    Each faction is loaded from the DB once per process and reused.
+    """
+    faction = (faction or _current_faction).upper()
+    catalog = _catalogs.get(faction)
+    if catalog is None:
+        with _catalogs_lock:
+            catalog = _catalogs.get(faction)
+            if catalog is None:
+                catalog = UnitCatalog(faction, _load_units(faction))
+                _catalogs[faction] = catalog
+    return catalog
 
 
 # =============================================================================
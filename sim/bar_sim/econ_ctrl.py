@@ -8,7 +8,7 @@ Mirrors engine_totallylegal_econ.lua AnalyzeEconomy + GetBuildTask logic.
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
-from bar_sim.models import BuildAction, BuildActionType, SimState
+from bar_sim.models import BuildAction, BuildActionType, SimState, build_action
 from bar_sim.strategy import StrategyConfig, Role, EmergencyMode
 from bar_sim.parity import STALL_THRESHOLD, FLOAT_THRESHOLD
 
@@ -96,7 +96,7 @@ def choose_econ_build(
 
     # Emergency: defend_base -> build LLT
     if emergency == EmergencyMode.DEFEND_BASE:
-        return BuildAction(unit_key="llt", action_type=BuildActionType.BUILD_STRUCTURE)
+        return build_action(unit_key="llt", action_type=BuildActionType.BUILD_STRUCTURE)
 
     # Emergency: mobilization -> skip econ building entirely
     if emergency == EmergencyMode.MOBILIZATION:
@@ -108,7 +108,7 @@ def choose_econ_build(
 
     # Override: forced build
     if override and override.force_build:
-        return BuildAction(unit_key=override.force_build, action_type=BuildActionType.BUILD_STRUCTURE)
+        return build_action(unit_key=override.force_build, action_type=BuildActionType.BUILD_STRUCTURE)
 
     # Apply reserve thresholds (suppress float while banking)
     adjusted_econ = econ_state
@@ -124,7 +124,7 @@ def choose_econ_build(
 
     # Role: eco -> always try mex first
     if role == Role.ECO and remaining_mex > 0:
-        return BuildAction(unit_key="mex", action_type=BuildActionType.BUILD_STRUCTURE)
+        return build_action(unit_key="mex", action_type=BuildActionType.BUILD_STRUCTURE)
 
     # Standard priority iteration
     for key, condition, _prio in ECON_PRIORITIES:
@@ -132,10 +132,10 @@ def choose_econ_build(
             # Skip mex if no spots left
             if key == "mex" and remaining_mex <= 0:
                 continue
-            return BuildAction(unit_key=key, action_type=BuildActionType.BUILD_STRUCTURE)
+            return build_action(unit_key=key, action_type=BuildActionType.BUILD_STRUCTURE)
 
     # Role: support -> fallback to radar
     if role == Role.SUPPORT:
-        return BuildAction(unit_key="radar", action_type=BuildActionType.BUILD_STRUCTURE)
+        return build_action(unit_key="radar", action_type=BuildActionType.BUILD_STRUCTURE)
 
     return None
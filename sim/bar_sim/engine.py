@@ -4,17 +4,18 @@ BAR Build Order Simulator - Simulation Engine
 Tick-based economy simulation (1 tick = 1 game second).
 """
 
-import math
 import random
+import time
 from copy import deepcopy
-from typing import Dict, Optional
+from typing import Dict, Iterator, List, Mapping, Optional
 
-from bar_sim.econ import UNITS as ECON_UNITS
+from bar_sim.econ import UNITS as ECON_UNITS, Unit
 from bar_sim.models import (
     BuildOrder, BuildAction, BuildActionType,
     Builder, BuildTask, SimState, SimResult,
-    Milestone, StallEvent, Snapshot, MapConfig,
+    Milestone, StallEvent, Snapshot, SnapshotConfig, SimEvent, MapConfig,
 )
+from bar_sim.wind import wind_trace
 
 # Unit keys that are factories
 FACTORY_KEYS = {"bot_lab", "vehicle_plant", "aircraft_plant",
@@ -27,9 +28,41 @@ CONSTRUCTOR_KEYS = {"con_bot", "con_vehicle", "adv_con_bot", "adv_con_vehicle"}
 WALK_TIME = 3
 
 
+# Snapshot field -> value read from the engine, for partial snapshots
+SNAPSHOT_GETTERS = {
+    "metal_income": lambda e: e.state.metal_income,
+    "energy_income": lambda e: e.state.energy_income,
+    "metal_stored": lambda e: e.state.metal_stored,
+    "energy_stored": lambda e: e.state.energy_stored,
+    "metal_expenditure": lambda e: e.state.metal_expenditure,
+    "energy_expenditure": lambda e: e.state.energy_expenditure,
+    "build_power": lambda e: e._active_bp,
+    "army_value_metal": lambda e: e._army_value,
+    "stall_factor": lambda e: e.state.effective_stall_factor,
+    "unit_counts": lambda e: e.state.buildings | e.state.units,
+    "army_by_role": lambda e: dict(e.state.army_by_role),
+    "econ_state": lambda e: e.state.econ_state,
+}
+
+
 class SimulationEngine:
-    def __init__(self, build_order: BuildOrder, duration: int = 600, seed: int = 42):
+    def __init__(self, build_order: BuildOrder, duration: int = 600, seed: int = 42,
+                 catalog: Optional[Mapping[str, Unit]] = None,
+                 keep_snapshots: bool = True,
+                 profile: bool = False,
+                 snapshot_config: Optional[SnapshotConfig] = None):
         self.bo = build_order
+        # Streaming callers that consume snapshots from iter_run() can turn
+        # this off so long runs don't accumulate them in the SimResult.
+        self.keep_snapshots = keep_snapshots
+        # Snapshot interval / fields / encoding (default: every field every 30s)
+        self.snapshot_config = snapshot_config or SnapshotConfig()
+        self._snap_interval = self.snapshot_config.interval
+        self._snap_full = self.snapshot_config.records_all
+        self._last_unit_counts: Dict[str, int] = {}
+        # Unit table for this run. A UnitCatalog (econ.get_catalog) isolates the
+        # run from set_faction(); the default follows the global UNITS dict.
+        self.units = catalog if catalog is not None else ECON_UNITS
         self._map_data = None  # store raw MapData for walk time estimator
         # Auto-resolve map_name to MapConfig if set
         if build_order.map_name and build_order.map_config == MapConfig():
@@ -42,9 +75,14 @@ class SimulationEngine:
             except Exception:
                 pass
         self.duration = duration
+        self.seed = seed
+        # Engine RNG for stochastic features; wind has its own shared trace
         self.rng = random.Random(seed)
+        self._wind: tuple = ()
         self.state = SimState()
         self.result = SimResult(build_order_name=build_order.name, total_ticks=duration)
+        if self.snapshot_config != SnapshotConfig():
+            self.result.snapshot_config = self.snapshot_config
         self._next_task_id_counter = 0
         self._factory_counter = 0
         self._con_counter = 0
@@ -53,6 +91,31 @@ class SimulationEngine:
         self._army_value = 0.0
         self._mex_build_count = 0  # track how many mexes have been assigned
 
+        # Task bookkeeping. state.active_tasks holds every task; these split
+        # it so the per-tick phases only touch what can change. Both are
+        # keyed and ordered by task_id, like active_tasks, so resource
+        # drains are summed in the same order as a single list would be.
+        self._walking: Dict[int, BuildTask] = {}
+        self._building: Dict[int, BuildTask] = {}
+        self._completed: List[BuildTask] = []  # finished this tick
+
+        # Builder indexes, maintained as builders are added, assigned and
+        # freed. The idle map is visited in builder creation order (the
+        # order of state.builders), re-sorted only when a builder rejoins
+        # out of order. Builders that can never act again are parked.
+        self._builder_seq: Dict[str, int] = {}
+        self._idle: Dict[str, Builder] = {}
+        self._idle_sorted = True
+        self._parked: set = set()
+        self._factories: List[str] = []  # factory builder ids, oldest first
+        self._active_bp = 0
+
+        # Run lifecycle (see iter_run / step / finish)
+        self._started = False
+        self._finished = False
+        self._events: Optional[List[SimEvent]] = None  # buffer while streaming
+        self._goals_seen = 0
+
         # Walk time estimator (uses map data if available)
         self._walk_estimator = None
         self._init_walk_estimator()
@@ -73,6 +136,13 @@ class SimulationEngine:
             self._army = None
             self._goal_queue = None
 
+        # Opt-in phase timing (see profiling.py); wraps methods on this instance only
+        self._profile = None
+        if profile:
+            from bar_sim.profiling import instrument
+            self._profile = instrument(self)
+            self._profile_t0 = time.perf_counter()
+
     def _init_walk_estimator(self):
         """Initialize the walk time estimator from map data if available."""
         if not self._map_data:
@@ -97,12 +167,12 @@ class SimulationEngine:
             # Get builder speed from unit data
             speed = 0.0
             if builder.builder_type == "commander":
-                cmd_unit = ECON_UNITS.get("commander")
+                cmd_unit = self.units.get("commander")
                 speed = cmd_unit.speed if cmd_unit else 37.0
             else:
                 # Constructor: find speed from the constructor's unit key
                 for key in CONSTRUCTOR_KEYS:
-                    u = ECON_UNITS.get(key)
+                    u = self.units.get(key)
                     if u and u.speed > 0:
                         speed = u.speed
                         break
@@ -123,28 +193,106 @@ class SimulationEngine:
     # ------------------------------------------------------------------
 
     def run(self) -> SimResult:
-        self._initialize()
-        for tick in range(1, self.duration + 1):
-            self.state.tick = tick
-            self._step_tick()
-            if tick % 30 == 0:
-                self._record_snapshot()
-        self._finalize()
+        if not self._started:
+            self._initialize()
+        while self.state.tick < self.duration:
+            self._advance()
+        return self.finish()
+
+    def iter_run(self) -> Iterator[SimEvent]:
+        """Run the simulation, yielding events as they happen.
+
+        Breaking out of the loop stops the simulation early; the partial
+        SimResult (total_ticks = ticks actually simulated) is available from
+        finish() or self.result once the generator is closed.
+        """
+        self._events = []
+        try:
+            if not self._started:
+                self._initialize()
+            yield from self._drain_events()
+            while self.state.tick < self.duration:
+                self._advance()
+                if self._events:
+                    yield from self._drain_events()
+            self.finish()
+            yield from self._drain_events()
+        finally:
+            self.finish()
+            self._events = None
+
+    def step(self, n: int = 1) -> List[SimEvent]:
+        """Advance up to n ticks and return the events they produced.
+
+        The run is finalized automatically when it reaches its duration;
+        afterwards step() returns an empty list.
+        """
+        if self._finished:
+            return []
+        if self._events is None:
+            self._events = []
+        if not self._started:
+            self._initialize()
+        end = min(self.duration, self.state.tick + n)
+        while self.state.tick < end:
+            self._advance()
+        if self.state.tick >= self.duration:
+            self.finish()
+        return list(self._drain_events())
+
+    def finish(self) -> SimResult:
+        """Finalize the run at the current tick and return the SimResult."""
+        if not self._finished:
+            self._finished = True
+            self.result.total_ticks = self.state.tick
+            self._finalize()
+            if self._profile is not None:
+                self._profile.ticks = self.state.tick
+                self._profile.wall_seconds = time.perf_counter() - self._profile_t0
+                self.result.profile = self._profile
         return self.result
 
+    @property
+    def done(self) -> bool:
+        return self._finished or (self._started and self.state.tick >= self.duration)
+
+    def _advance(self):
+        tick = self.state.tick + 1
+        self.state.tick = tick
+        self._step_tick()
+        if tick % self._snap_interval == 0:
+            self._record_snapshot()
+        if self._events is not None and self._goal_queue is not None:
+            completions = self._goal_queue.completions
+            while self._goals_seen < len(completions):
+                self._emit("goal", completions[self._goals_seen])
+                self._goals_seen += 1
+
+    def _emit(self, kind: str, data):
+        if self._events is not None:
+            self._events.append(SimEvent(kind, self.state.tick, data))
+
+    def _drain_events(self) -> List[SimEvent]:
+        events = list(self._events)
+        self._events.clear()
+        return events
+
     # ------------------------------------------------------------------
     # Initialization
     # ------------------------------------------------------------------
 
     def _initialize(self):
+        self._started = True
         s = self.state
+        mc = self.bo.map_config
+        self._wind = wind_trace(mc.avg_wind, mc.wind_variance, self.seed, self.duration)
         s.metal_stored = 500.0
         s.energy_stored = 1000.0
         s.metal_storage_cap = 500.0
         s.energy_storage_cap = 1000.0
 
         # Commander BP from unit data (fixes old hardcode of 200 -> actual 300)
-        cmd_unit = ECON_UNITS.get("commander")
+        cmd_unit = self.units.get("commander")
         cmd_bp = cmd_unit.build_power if cmd_unit else 300
 
         # Strategy mode: generate opening from config
@@ -162,7 +310,7 @@ class SimulationEngine:
             activated_at=0,
             queue=cmd_queue,
         )
-        s.builders["commander"] = cmd
+        self._add_builder(cmd)
 
         # Take initial snapshot at tick 0
         self._record_snapshot()
@@ -192,21 +340,28 @@ class SimulationEngine:
     # ------------------------------------------------------------------
 
     def _update_wind(self):
-        mc = self.bo.map_config
-        base = mc.avg_wind + mc.wind_variance * math.sin(self.state.tick * 0.05)
-        noise = self.rng.uniform(-mc.wind_variance * 0.3, mc.wind_variance * 0.3)
-        self.state.current_wind = max(0, min(25, base + noise))
+        self.state.current_wind = self._wind[self.state.tick - 1]
 
     # ------------------------------------------------------------------
     # Phase 2: Assign idle builders to next task
     # ------------------------------------------------------------------
 
     def _assign_idle_builders(self):
-        for bid, builder in self.state.builders.items():
+        if not self._idle_sorted:
+            seq = self._builder_seq
+            self._idle = dict(sorted(self._idle.items(), key=lambda kv: seq[kv[0]]))
+            self._idle_sorted = True
+
+        for bid, builder in list(self._idle.items()):
             if not builder.is_active or not builder.is_idle:
                 continue
             if builder.builder_type == "nano":
                 self._assign_nano(builder)
+                if not builder.is_idle:
+                    del self._idle[bid]
+                elif not self._strategy_mode and builder.assist_target in self._parked:
+                    # Its factory has finished its queue for good
+                    self._park(bid)
                 continue
 
             # Strategy mode: once queue exhausted, switch to dynamic decisions
@@ -216,13 +371,14 @@ class SimulationEngine:
                     if action is None:
                         continue
                 else:
+                    self._park(bid)
                     continue
             else:
                 action = builder.queue[builder.queue_index]
                 builder.queue_index += 1
 
             unit_key = action.unit_key
-            unit = ECON_UNITS.get(unit_key)
+            unit = self.units.get(unit_key)
             if unit is None:
                 continue
 
@@ -251,14 +407,37 @@ class SimulationEngine:
             )
             builder.current_task = task
             builder.is_idle = False
-            self.state.active_tasks.append(task)
+            del self._idle[bid]
+            self._add_task(task)
+
+    def _add_builder(self, builder: Builder):
+        bid = builder.builder_id
+        self.state.builders[bid] = builder
+        self._builder_seq[bid] = len(self._builder_seq)
+        if builder.is_active:
+            self._active_bp += builder.build_power
+        if builder.builder_type == "factory":
+            self._factories.append(bid)
+        if builder.is_idle:
+            self._mark_idle(builder)
+
+    def _mark_idle(self, builder: Builder):
+        bid = builder.builder_id
+        idle = self._idle
+        if idle and self._builder_seq[bid] < self._builder_seq[next(reversed(idle))]:
+            self._idle_sorted = False
+        idle[bid] = builder
+
+    def _park(self, bid: str):
+        del self._idle[bid]
+        self._parked.add(bid)
 
     def _assign_nano(self, nano: Builder):
         target_id = nano.assist_target
         if not target_id:
             # Find first active factory
-            for bid, b in self.state.builders.items():
-                if b.builder_type == "factory" and b.is_active:
+            for bid in self._factories:
+                if self.state.builders[bid].is_active:
                     nano.assist_target = bid
                     target_id = bid
                     break
@@ -267,9 +446,12 @@ class SimulationEngine:
 
         target = self.state.builders.get(target_id)
         if target and target.current_task:
-            if nano.builder_id not in target.current_task.assigned_builders:
-                target.current_task.assigned_builders.append(nano.builder_id)
-            nano.current_task = target.current_task
+            task = target.current_task
+            if nano.builder_id not in task.assigned_builders:
+                task.assigned_builders.append(nano.builder_id)
+                if task.task_id in self._building:
+                    self._refresh_drain(task)
+            nano.current_task = task
             nano.is_idle = False
         else:
             nano.is_idle = True
@@ -286,7 +468,7 @@ class SimulationEngine:
         energy = 0.0
 
         # Commander energy (from unit data; fixes old hardcode of 25 -> actual 30)
-        cmd_unit = ECON_UNITS.get("commander")
+        cmd_unit = self.units.get("commander")
         energy += cmd_unit.energy_production if cmd_unit else 30.0
 
         # Buildings
@@ -302,7 +484,7 @@ class SimulationEngine:
         for key in ("solar", "adv_solar", "geo_t1", "fusion"):
             count = s.buildings.get(key, 0)
             if count > 0:
-                unit = ECON_UNITS.get(key)
+                unit = self.units.get(key)
                 if unit:
                     energy += count * unit.energy_production
 
@@ -313,13 +495,13 @@ class SimulationEngine:
 
         # Energy upkeep from buildings
         for key, count in s.buildings.items():
-            unit = ECON_UNITS.get(key)
+            unit = self.units.get(key)
             if unit and unit.energy_upkeep > 0 and count > 0:
                 energy -= count * unit.energy_upkeep
 
         # Constructor energy production
         for key, count in s.units.items():
-            unit = ECON_UNITS.get(key)
+            unit = self.units.get(key)
             if unit and unit.energy_production > 0 and count > 0:
                 energy += count * unit.energy_production
 
@@ -331,40 +513,34 @@ class SimulationEngine:
     # ------------------------------------------------------------------
 
     def _calculate_expenditure(self):
+        # Drains only change when a task's builders do (see _refresh_drain);
+        # walking tasks drain nothing.
         total_m = 0.0
         total_e = 0.0
+        for task in self._building.values():
+            total_m += task._pending_metal_drain
+            total_e += task._pending_energy_drain
 
-        for task in self.state.active_tasks:
-            if task.walk_delay > 0:
-                task._pending_bp = 0
-                task._pending_metal_drain = 0
-                task._pending_energy_drain = 0
-                continue
-
-            unit = ECON_UNITS.get(task.unit_key)
-            if not unit or unit.build_time == 0:
-                continue
-
-            bp = 0
-            for bid in task.assigned_builders:
-                b = self.state.builders.get(bid)
-                if b and b.is_active:
-                    bp += b.build_power
-            if bp == 0:
-                continue
-
-            m_per_s = unit.metal_cost * bp / unit.build_time
-            e_per_s = unit.energy_cost * bp / unit.build_time
+        self.state.metal_expenditure = total_m
+        self.state.energy_expenditure = total_e
 
-            task._pending_bp = bp
-            task._pending_metal_drain = m_per_s
-            task._pending_energy_drain = e_per_s
+    def _refresh_drain(self, task: BuildTask):
+        """Recompute a building task's BP and full-speed resource drain."""
+        unit = self.units.get(task.unit_key)
+        if not unit or unit.build_time == 0:
+            return
 
-            total_m += m_per_s
-            total_e += e_per_s
+        bp = 0
+        for bid in task.assigned_builders:
+            b = self.state.builders.get(bid)
+            if b and b.is_active:
+                bp += b.build_power
+        if bp == 0:
+            return
 
-        self.state.metal_expenditure = total_m
-        self.state.energy_expenditure = total_e
+        task._pending_bp = bp
+        task._pending_metal_drain = unit.metal_cost * bp / unit.build_time
+        task._pending_energy_drain = unit.energy_cost * bp / unit.build_time
 
     # ------------------------------------------------------------------
     # Phase 5: Stall factor
@@ -392,13 +568,10 @@ class SimulationEngine:
     # ------------------------------------------------------------------
 
     def _apply_construction(self):
-        stall = self.state.effective_stall_factor
-
-        for task in self.state.active_tasks:
-            if task.walk_delay > 0:
-                task.walk_delay -= 1
-                continue
+        s = self.state
+        stall = s.effective_stall_factor
 
+        for task in self._building.values():
             eff_bp = task._pending_bp * stall
             m_drain = task._pending_metal_drain * stall
             e_drain = task._pending_energy_drain * stall
@@ -407,8 +580,21 @@ class SimulationEngine:
             task.metal_spent += m_drain
             task.energy_spent += e_drain
 
-            self.state.metal_stored -= m_drain
-            self.state.energy_stored -= e_drain
+            s.metal_stored -= m_drain
+            s.energy_stored -= e_drain
+
+            if eff_bp and task.is_complete:
+                self._completed.append(task)
+
+        # Builders that arrive start building next tick
+        arrived = []
+        for task in self._walking.values():
+            task.walk_delay -= 1
+            if task.walk_delay <= 0:
+                arrived.append(task)
+        for task in arrived:
+            del self._walking[task.task_id]
+            self._start_building(task)
 
     # ------------------------------------------------------------------
     # Phase 7: Update resources (income)
@@ -461,13 +647,37 @@ class SimulationEngine:
     # ------------------------------------------------------------------
 
     def _process_completions(self):
-        completed = [t for t in self.state.active_tasks if t.is_complete]
+        if not self._completed:
+            return
+        completed = sorted(self._completed, key=lambda t: t.task_id)
+        self._completed = []
         for task in completed:
             task.completed_at = self.state.tick
-            self.state.active_tasks.remove(task)
+            del self.state.active_tasks[task.task_id]
+            self._walking.pop(task.task_id, None)
+            self._building.pop(task.task_id, None)
             self.state.completed_tasks.append(task)
             self._on_complete(task)
 
+    def _add_task(self, task: BuildTask):
+        self.state.active_tasks[task.task_id] = task
+        if task.is_complete:
+            # Zero-work tasks finish on the tick they start
+            self._completed.append(task)
+        if task.walk_delay > 0:
+            self._walking[task.task_id] = task
+        else:
+            self._start_building(task)
+
+    def _start_building(self, task: BuildTask):
+        self._refresh_drain(task)
+        building = self._building
+        behind = bool(building) and task.task_id < next(reversed(building))
+        building[task.task_id] = task
+        if behind:
+            # Walked in after newer tasks started: restore task_id order
+            self._building = dict(sorted(building.items()))
+
     def _on_complete(self, task: BuildTask):
         s = self.state
         key = task.unit_key
@@ -490,10 +700,11 @@ class SimulationEngine:
             if b and b.current_task is task:
                 b.current_task = None
                 b.is_idle = True
+                self._mark_idle(b)
 
     def _on_building_complete(self, key: str, task: BuildTask):
         s = self.state
-        unit = ECON_UNITS.get(key)
+        unit = self.units.get(key)
 
         # Factory -> activate as builder
         if key in FACTORY_KEYS:
@@ -517,7 +728,7 @@ class SimulationEngine:
                 activated_at=self.state.tick,
                 queue=list(fqueue),
             )
-            s.builders[fid] = new_builder
+            self._add_builder(new_builder)
             self._milestone("first_factory", f"{unit.name if unit else key} online")
 
         # Nano -> activate as assisting builder
@@ -531,7 +742,7 @@ class SimulationEngine:
                 is_active=True,
                 activated_at=self.state.tick,
             )
-            s.builders[nid] = new_builder
+            self._add_builder(new_builder)
             self._milestone("first_nano", "Nano turret online")
 
         # Mex tracking (for strategy mode remaining_mex calc)
@@ -546,7 +757,7 @@ class SimulationEngine:
 
     def _on_unit_produced(self, key: str, task: BuildTask):
         s = self.state
-        unit = ECON_UNITS.get(key)
+        unit = self.units.get(key)
 
         # Constructor -> activate as builder
         if key in CONSTRUCTOR_KEYS:
@@ -569,7 +780,7 @@ class SimulationEngine:
                 activated_at=self.state.tick,
                 queue=list(cqueue),
             )
-            s.builders[cid] = new_builder
+            self._add_builder(new_builder)
 
             # Constructor storage bonus (+50 each)
             s.metal_storage_cap += 50
@@ -589,8 +800,7 @@ class SimulationEngine:
             s.army_by_role = dict(self._army.counts_by_role)
 
             if self._goal_queue:
-                total_bp = sum(b.build_power for b in s.builders.values() if b.is_active)
-                self._goal_queue.tick(s, self._army.counts_by_unit, total_bp)
+                self._goal_queue.tick(s, self._army.counts_by_unit, self._active_bp)
 
         self._milestone_for_unit(key)
 
@@ -603,15 +813,17 @@ class SimulationEngine:
     # ------------------------------------------------------------------
 
     def _milestone(self, event: str, desc: str):
-        if any(m.event == event for m in self.result.milestones):
+        if self.result.milestone(event) is not None:
             return
-        self.result.milestones.append(Milestone(
+        milestone = Milestone(
             tick=self.state.tick,
             event=event,
             description=desc,
             metal_income=self.state.metal_income,
             energy_income=self.state.energy_income,
-        ))
+        )
+        self.result.milestones.append(milestone)
+        self._emit("milestone", milestone)
         # Set convenience fields
         if event == "first_factory":
             self.result.time_to_first_factory = self.state.tick
@@ -651,6 +863,7 @@ class SimulationEngine:
             if self._current_stall is not None:
                 self._current_stall.end_tick = s.tick - 1
                 self.result.stall_events.append(self._current_stall)
+                self._emit("stall", self._current_stall)
                 self._current_stall = None
 
     def _track_peaks(self):
@@ -663,8 +876,10 @@ class SimulationEngine:
 
     def _record_snapshot(self):
         s = self.state
-        total_bp = sum(b.build_power for b in s.builders.values() if b.is_active)
-        self.result.snapshots.append(Snapshot(
+        if not self._snap_full:
+            self._record_partial_snapshot()
+            return
+        snap = Snapshot(
             tick=s.tick,
             metal_income=s.metal_income,
             energy_income=s.energy_income,
@@ -672,13 +887,41 @@ class SimulationEngine:
             energy_stored=s.energy_stored,
             metal_expenditure=s.metal_expenditure,
             energy_expenditure=s.energy_expenditure,
-            build_power=total_bp,
+            build_power=self._active_bp,
             army_value_metal=self._army_value,
             stall_factor=s.effective_stall_factor,
-            unit_counts=dict(s.buildings | s.units),
+            unit_counts=s.buildings | s.units,  # `|` already builds a new dict
             army_by_role=dict(s.army_by_role),
             econ_state=s.econ_state,
-        ))
+        )
+        if self.keep_snapshots:
+            self.result.snapshots.append(snap)
+        self._emit("snapshot", snap)
+
+    def _record_partial_snapshot(self):
+        """_record_snapshot() under a non-default SnapshotConfig."""
+        s = self.state
+        cfg = self.snapshot_config
+        if cfg.keep_until is not None and s.tick > cfg.keep_until:
+            self._emit("snapshot", None)
+            return
+        fields = cfg.fields
+        values = {}
+        for name in SNAPSHOT_GETTERS if fields is None else fields:
+            values[name] = SNAPSHOT_GETTERS[name](self)
+        if cfg.unit_count_deltas and "unit_counts" in values:
+            counts = values["unit_counts"]
+            last = self._last_unit_counts
+            delta = {k: v for k, v in counts.items() if last.get(k) != v}
+            delta.update((k, 0) for k in last.keys() - counts.keys())
+            values["unit_counts"] = delta
+            self._last_unit_counts = counts
+        snap = Snapshot(tick=s.tick, **values)
+        if self.keep_snapshots:
+            if cfg.keep_until is not None:
+                self.result.snapshots.clear()
+            self.result.snapshots.append(snap)
+        self._emit("snapshot", snap)
 
     # ------------------------------------------------------------------
     # Finalization
@@ -689,6 +932,8 @@ class SimulationEngine:
         if self._current_stall:
             self._current_stall.end_tick = self.state.tick
             self.result.stall_events.append(self._current_stall)
+            self._emit("stall", self._current_stall)
+            self._current_stall = None
         self.result.total_army_metal_value = self._army_value
 
         # Strategy mode results
@@ -767,7 +1012,8 @@ class SimulationEngine:
             _, prod_override = self._goal_queue.get_overrides()
 
         return choose_factory_production(
-            self._strategy_config, self._army, factory_type, prod_override
+            self._strategy_config, self._army, factory_type, prod_override,
+            units=self.units,
         )
 
     def _strategy_econ_action(self, builder_bid: str) -> Optional[BuildAction]:
@@ -0,0 +1,198 @@
+"""
+BAR Build Order Simulator - Wind Ensembles
+============================================
+Runs one build order across many wind seeds and summarizes how much the
+outcome depends on the wind: mean, spread, percentiles and a confidence
+interval for the mean of each metric (`cli.py simulate --ensemble N`).
+
+Seeds are run in batches and the ensemble stops once every metric's
+confidence interval is within `rel_tol` of its mean, so well-behaved
+build orders don't pay for all N runs. Two shortcuts need only one run:
+
+- the map has no wind variance, or
+- no wind turbine was ever completed in the first run. Wind then never
+  touched the simulation, and the seed only drives the wind trace, so
+  every other seed gives the same result.
+
+With workers > 1 each batch is split across a process pool.
+"""
+
+import copy
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bar_sim.econ import UnitCatalog
+from bar_sim.engine import SimulationEngine
+from bar_sim.models import BuildOrder, SimResult, SnapshotConfig
+
+# Seeds start at the engine default, so run 1 is the usual single run
+BASE_SEED = 42
+
+# (name, label, value from a result and the checkpoint tick); None = no value
+METRICS: Tuple[Tuple[str, str, Callable[[SimResult, int], Optional[float]]], ...] = (
+    ("metal_income", "Metal income @", lambda r, at: _snap_value(r, at, "metal_income")),
+    ("energy_income", "Energy income @", lambda r, at: _snap_value(r, at, "energy_income")),
+    ("army_value", "Army value @", lambda r, at: _snap_value(r, at, "army_value_metal")),
+    ("stall_seconds", "Stall seconds",
+     lambda r, at: r.total_metal_stall_seconds + r.total_energy_stall_seconds),
+    ("first_factory", "1st factory", lambda r, at: r.time_to_first_factory),
+    ("t2_lab", "T2 lab", lambda r, at: r.time_to_t2_lab),
+)
+
+# Two-sided 95% Student t critical values by degrees of freedom
+_T95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+        8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086,
+        30: 2.042, 60: 2.000}
+
+
+def _snap_value(result: SimResult, tick: int, name: str) -> Optional[float]:
+    snap = result.snapshot_at(tick)
+    return getattr(snap, name) if snap else None
+
+
+def _t95(df: int) -> float:
+    if df > 60:
+        return 1.96
+    return _T95[max(d for d in _T95 if d <= df)]
+
+
+def _percentile(ordered: Sequence[float], q: float) -> float:
+    pos = (len(ordered) - 1) * q
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+@dataclass
+class MetricSummary:
+    name: str
+    label: str
+    n: int              # runs where the metric had a value
+    missing: int        # runs where it didn't (e.g. no factory built)
+    mean: float = 0.0
+    std: float = 0.0
+    p10: float = 0.0
+    p50: float = 0.0
+    p90: float = 0.0
+    ci_low: float = 0.0   # 95% confidence interval for the mean
+    ci_high: float = 0.0
+
+    @property
+    def half_width(self) -> float:
+        return (self.ci_high - self.ci_low) / 2
+
+    def is_tight(self, rel_tol: float) -> bool:
+        return self.half_width <= rel_tol * abs(self.mean)
+
+
+def summarize(name: str, label: str, values: Sequence[Optional[float]]) -> MetricSummary:
+    present = sorted(v for v in values if v is not None)
+    summary = MetricSummary(name, label, n=len(present), missing=len(values) - len(present))
+    if not present:
+        return summary
+    n = len(present)
+    mean = sum(present) / n
+    std = math.sqrt(sum((v - mean) ** 2 for v in present) / (n - 1)) if n > 1 else 0.0
+    half = _t95(n - 1) * std / math.sqrt(n) if n > 1 else 0.0
+    summary.mean, summary.std = mean, std
+    summary.p10, summary.p50, summary.p90 = (_percentile(present, q) for q in (0.1, 0.5, 0.9))
+    summary.ci_low, summary.ci_high = mean - half, mean + half
+    return summary
+
+
+@dataclass
+class EnsembleResult:
+    seeds: List[int]
+    at: int                                   # checkpoint tick for the @ metrics
+    metrics: Dict[str, MetricSummary]
+    samples: Dict[str, List[Optional[float]]]  # per metric, in seed order
+    base: SimResult                           # full result of the first seed
+    requested: int = 0
+    converged: bool = False    # stopped early on tight intervals
+    wind_independent: bool = False
+    simulated: int = 0         # engine runs actually performed
+
+    @property
+    def runs(self) -> int:
+        return len(self.seeds)
+
+
+def _metric_values(result: SimResult, at: int) -> Dict[str, Optional[float]]:
+    return {name: fn(result, at) for name, _, fn in METRICS}
+
+
+def _run_seeds(bo: BuildOrder, duration: int, catalog: Optional[UnitCatalog],
+               seeds: Sequence[int], at: int) -> List[Dict[str, Optional[float]]]:
+    config = SnapshotConfig.score_only(
+        ("metal_income", "energy_income", "army_value_metal"), at)
+    out = []
+    for seed in seeds:
+        engine = SimulationEngine(copy.deepcopy(bo), duration, seed=seed,
+                                  catalog=catalog, snapshot_config=config)
+        out.append(_metric_values(engine.run(), at))
+    return out
+
+
+def run_ensemble(bo: BuildOrder, runs: int = 32, duration: int = 600, at: int = 300,
+                 catalog: Optional[UnitCatalog] = None,
+                 workers: int = 1,
+                 min_runs: int = 8,
+                 rel_tol: float = 0.02,
+                 base_seed: int = BASE_SEED) -> EnsembleResult:
+    """Simulate `bo` over up to `runs` wind seeds (base_seed, base_seed+1, ...).
+
+    After every batch of `min_runs` seeds the run stops if each metric's
+    95% interval half-width is within rel_tol of its mean (rel_tol=0
+    always runs all seeds). Results don't depend on `workers`.
+    """
+    runs = max(1, runs)
+    min_runs = max(2, min_runs)
+    seeds = [base_seed + i for i in range(runs)]
+
+    engine = SimulationEngine(copy.deepcopy(bo), duration, seed=seeds[0], catalog=catalog)
+    base = engine.run()
+    rows = [_metric_values(base, at)]
+    mc = engine.bo.map_config  # after any map_name resolution
+    wind_independent = (mc.wind_variance == 0
+                        or all(unit != "wind" for _, unit, _ in base.completion_log))
+    simulated = 1
+    converged = False
+    pool = None
+    try:
+        if wind_independent:
+            rows *= runs
+        while len(rows) < runs and not converged:
+            batch = seeds[len(rows):min(runs, len(rows) + min_runs - (len(rows) % min_runs))]
+            if workers > 1 and len(batch) > 1:
+                pool = pool or ProcessPoolExecutor(max_workers=workers)
+                chunks = [batch[i::workers] for i in range(workers) if batch[i::workers]]
+                futures = [pool.submit(_run_seeds, bo, duration, catalog, c, at) for c in chunks]
+                by_seed = {}
+                for chunk, fut in zip(chunks, futures):
+                    by_seed.update(zip(chunk, fut.result()))
+                rows.extend(by_seed[s] for s in batch)
+            else:
+                rows.extend(_run_seeds(bo, duration, catalog, batch, at))
+            simulated += len(batch)
+            if rel_tol > 0 and len(rows) >= min_runs and len(rows) < runs:
+                converged = all(
+                    summarize(name, label, [r[name] for r in rows]).is_tight(rel_tol)
+                    for name, label, _ in METRICS)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    samples = {name: [r[name] for r in rows] for name, _, _ in METRICS}
+    return EnsembleResult(
+        seeds=seeds[:len(rows)],
+        at=at,
+        metrics={name: summarize(name, label, samples[name]) for name, label, _ in METRICS},
+        samples=samples,
+        base=base,
+        requested=runs,
+        converged=converged,
+        wind_independent=wind_independent,
+        simulated=simulated,
+    )
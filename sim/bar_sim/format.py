@@ -45,29 +45,15 @@ def print_timeline(result: SimResult):
     print(f" {'Time':>6}  {'Builder':<14} {'Completed':<24} {'M/s':>6} {'E/s':>7}")
     print(f" {'----':>6}  {'-------':<14} {'---------':<24} {'---':>6} {'---':>7}")
 
-    # Find the income at each completion tick from snapshots
-    snap_map = {}
-    for s in result.snapshots:
-        snap_map[s.tick] = s
+    # Milestone income is exact for its tick; otherwise use the latest snapshot
+    milestone_at = {}
+    for ms in result.milestones:
+        milestone_at.setdefault(ms.tick, ms)
 
     for tick, unit_key, builder_id in result.completion_log:
-        # Find nearest snapshot for income data
-        nearest = None
-        for s in result.snapshots:
-            if s.tick <= tick:
-                nearest = s
-            else:
-                break
-
-        m_inc = nearest.metal_income if nearest else 0
-        e_inc = nearest.energy_income if nearest else 0
-
-        # Use milestone data if available (more accurate for that tick)
-        for ms in result.milestones:
-            if ms.tick == tick:
-                m_inc = ms.metal_income
-                e_inc = ms.energy_income
-                break
+        source = milestone_at.get(tick) or result.snapshot_at(tick)
+        m_inc = source.metal_income if source else 0
+        e_inc = source.energy_income if source else 0
 
         from bar_sim.econ import UNITS
         unit = UNITS.get(unit_key)
@@ -158,3 +144,50 @@ def print_summary(result: SimResult):
         print(f" First constructor:    {fmt_time(result.time_to_first_constructor)}")
     if result.time_to_first_nano:
         print(f" First nano:           {fmt_time(result.time_to_first_nano)}")
+
+
+def print_profile(result: SimResult):
+    profile = result.profile
+    if profile is None:
+        return
+    print()
+    print("--- ENGINE PROFILE ---")
+    print(f" {profile.ticks} ticks in {profile.wall_seconds * 1000:.1f} ms "
+          f"({profile.ticks / max(profile.wall_seconds, 1e-9):,.0f} ticks/s, instrumented)")
+    print(f" {'Phase':<24} {'Calls':>7} {'ms':>9} {'%':>6} {'us/call':>9}")
+    print(f" {'-' * 24} {'-' * 7} {'-' * 9} {'-' * 6} {'-' * 9}")
+    for name, calls, ms, pct, per_call in profile.rows():
+        print(f" {name:<24} {calls:>7} {ms:>9.2f} {pct:>5.1f}% {per_call:>9.2f}")
+
+    if profile.samples:
+        peak_tasks = max(s.active_tasks for s in profile.samples)
+        peak_builders = max(s.active_builders for s in profile.samples)
+        allocs = [s.alloc_blocks_per_tick for s in profile.samples[1:]] or [0.0]
+        print(f" Peak active tasks: {peak_tasks}, peak active builders: {peak_builders}, "
+              f"net allocated blocks/tick: {sum(allocs) / len(allocs):.1f} avg, "
+              f"{max(allocs):.1f} max")
+
+
+def print_ensemble(ens):
+    """Summary table for an ensemble.EnsembleResult."""
+    print()
+    print("--- WIND ENSEMBLE ---")
+    if ens.wind_independent:
+        note = "wind-independent: every seed gives the same result"
+    elif ens.converged:
+        note = f"stopped early, intervals within tolerance after {ens.runs}/{ens.requested} seeds"
+    else:
+        note = f"{ens.runs} seeds"
+    print(f" Seeds {ens.seeds[0]}-{ens.seeds[-1]} ({note}; {ens.simulated} simulated)")
+    print(f" {'Metric':<22} {'Mean':>8} {'95% CI':>17} {'P10':>8} {'P50':>8} {'P90':>8} {'Std':>7}")
+    print(f" {'-' * 22} {'-' * 8} {'-' * 17} {'-' * 8} {'-' * 8} {'-' * 8} {'-' * 7}")
+    for m in ens.metrics.values():
+        label = m.label + fmt_time(ens.at) if m.label.endswith("@") else m.label
+        if m.missing:
+            label += f" ({m.n}/{m.n + m.missing})"
+        if not m.n:
+            print(f" {label:<22} {'--':>8}")
+            continue
+        ci = f"{m.ci_low:.1f} - {m.ci_high:.1f}"
+        print(f" {label:<22} {m.mean:>8.1f} {ci:>17} {m.p10:>8.1f} {m.p50:>8.1f} "
+              f"{m.p90:>8.1f} {m.std:>7.2f}")
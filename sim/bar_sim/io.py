@@ -2,20 +2,129 @@
 BAR Build Order Simulator - I/O
 ================================
 Load and save build orders from YAML files.
+
+Parsing uses libyaml (yaml.CSafeLoader) when PyYAML was built with it.
+Loaded build orders are cached by path and the file's mtime and size;
+callers always get their own copy. `index_build_orders` lists a
+directory with each file's metadata, re-reading only changed files.
 """
 
+import copy
 import json
+import os
+import threading
+from collections import OrderedDict
 import yaml
 from pathlib import Path
-from bar_sim.models import BuildOrder, BuildAction, BuildActionType, MapConfig
+from typing import Dict, List, Optional, Tuple
+from bar_sim.models import BuildOrder, BuildActionType, MapConfig, SimResult, build_action
 from bar_sim.strategy import StrategyConfig, parse_strategy_string
 from bar_sim.goals import GoalQueue, GoalType, parse_goal_string
 
 
-def load_build_order(filepath: str) -> BuildOrder:
+# libyaml-backed loader when available (several times faster)
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed build orders kept per process, least recently used evicted first
+BUILD_ORDER_CACHE_SIZE = 128
+
+_FileStamp = Tuple[int, int]
+_bo_cache: "OrderedDict[str, Tuple[_FileStamp, BuildOrder]]" = OrderedDict()
+_index_cache: Dict[str, Tuple[_FileStamp, dict]] = {}
+_cache_lock = threading.Lock()
+
+
+def _read_yaml(filepath) -> dict:
     with open(filepath, "r") as f:
-        data = yaml.safe_load(f)
+        return yaml.load(f, Loader=_YamlLoader)
+
+
+def _stamp(st: os.stat_result) -> _FileStamp:
+    return st.st_mtime_ns, st.st_size
+
 
+def load_build_order(filepath: str) -> BuildOrder:
+    """Load a build order YAML file (a fresh copy each call).
+
+    Repeat loads of an unchanged file come from the cache. A map_name
+    file's map config is resolved when first loaded, so call
+    clear_build_order_cache() after rescanning a map.
+    """
+    key = os.path.abspath(filepath)
+    stamp = _stamp(os.stat(key))
+    with _cache_lock:
+        hit = _bo_cache.get(key)
+        if hit and hit[0] == stamp:
+            _bo_cache.move_to_end(key)
+            return copy.deepcopy(hit[1])
+
+    bo = _parse_build_order(_read_yaml(key), filepath)
+    with _cache_lock:
+        _bo_cache[key] = (stamp, bo)
+        _bo_cache.move_to_end(key)
+        while len(_bo_cache) > BUILD_ORDER_CACHE_SIZE:
+            _bo_cache.popitem(last=False)
+    return copy.deepcopy(bo)
+
+
+def clear_build_order_cache():
+    with _cache_lock:
+        _bo_cache.clear()
+        _index_cache.clear()
+
+
+def index_build_orders(directory) -> List[dict]:
+    """Metadata for every *.yaml build order in `directory`, sorted by filename.
+
+    Only new or changed files are read; queues aren't turned into
+    BuildOrder objects and map names aren't resolved. Files that don't
+    parse to a mapping are skipped.
+    """
+    directory = Path(directory)
+    if not directory.exists():
+        return []
+    index = []
+    for path in sorted(directory.glob("*.yaml")):
+        key = str(path.resolve())
+        try:
+            stamp = _stamp(path.stat())
+        except FileNotFoundError:
+            continue
+        with _cache_lock:
+            hit = _index_cache.get(key)
+        if hit and hit[0] == stamp:
+            index.append(hit[1])
+            continue
+        try:
+            data = _read_yaml(path)
+        except (OSError, yaml.YAMLError):
+            continue
+        if not isinstance(data, dict):
+            continue  # valid YAML, but not a build order (list, scalar, empty)
+        entry = _index_entry(path, data)
+        with _cache_lock:
+            _index_cache[key] = (stamp, entry)
+        index.append(entry)
+    return index
+
+
+def _index_entry(path: Path, data: dict) -> dict:
+    queues = {k: v for k, v in data.items()
+              if k.endswith("_queue") and isinstance(v, list)}
+    return {
+        "filename": path.name,
+        "stem": path.stem,
+        "name": data.get("name", path.stem),
+        "description": data.get("description", ""),
+        "map_name": data.get("map_name"),
+        "commander_items": len(queues.get("commander_queue", [])),
+        "factories": sum(1 for k in queues if k.startswith("factory_")),
+        "constructors": sum(1 for k in queues if k.startswith("con_")),
+        "has_strategy": bool(data.get("strategy")),
+    }
+
+
+def _parse_build_order(data: dict, filepath: str) -> BuildOrder:
     map_name = data.get("map_name")
     map_data = data.get("map", {})
 
@@ -51,7 +160,7 @@ def load_build_order(filepath: str) -> BuildOrder:
     # Commander queue
     for item in data.get("commander_queue", []):
         bo.commander_queue.append(
-            BuildAction(unit_key=item, action_type=BuildActionType.BUILD_STRUCTURE)
+            build_action(unit_key=item, action_type=BuildActionType.BUILD_STRUCTURE)
         )
 
     # Factory queues (factory_0_queue, factory_1_queue, etc.)
@@ -59,7 +168,7 @@ def load_build_order(filepath: str) -> BuildOrder:
         if key.startswith("factory_") and key.endswith("_queue"):
             factory_id = key.replace("_queue", "")
             bo.factory_queues[factory_id] = [
-                BuildAction(unit_key=item, action_type=BuildActionType.PRODUCE_UNIT)
+                build_action(unit_key=item, action_type=BuildActionType.PRODUCE_UNIT)
                 for item in value
             ]
 
@@ -68,7 +177,7 @@ def load_build_order(filepath: str) -> BuildOrder:
         if key.startswith("con_") and key.endswith("_queue"):
             con_id = key.replace("_queue", "")
             bo.constructor_queues[con_id] = [
-                BuildAction(unit_key=item, action_type=BuildActionType.BUILD_STRUCTURE)
+                build_action(unit_key=item, action_type=BuildActionType.BUILD_STRUCTURE)
                 for item in value
             ]
 
@@ -106,6 +215,10 @@ def save_build_order(bo: BuildOrder, filepath: str):
 
     with open(filepath, "w") as f:
         yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+    # A rewrite within the filesystem's timestamp granularity can keep the
+    # same mtime and size, so don't rely on the stamp for our own writes
+    with _cache_lock:
+        _bo_cache.pop(os.path.abspath(filepath), None)
 
 
 def export_build_order_json(bo: BuildOrder, filepath: str):
@@ -123,6 +236,35 @@ def export_build_order_json(bo: BuildOrder, filepath: str):
         json.dump(data, f, indent=2)
 
 
+# ---------------------------------------------------------------------------
+# Simulation results (columnar format, see columnar.py)
+# ---------------------------------------------------------------------------
+
+def _result_format(filepath: str, fmt: Optional[str]) -> str:
+    from bar_sim.columnar import FILE_FORMATS
+    if fmt:
+        return fmt
+    return FILE_FORMATS.get(Path(filepath).suffix.lower(), "columnar")
+
+
+def save_result(result: SimResult, filepath: str, fmt: Optional[str] = None):
+    """Write a SimResult in the columnar format used by the web API.
+
+    The wire format is picked from the extension (.json, .msgpack, .arrow)
+    unless `fmt` is given.
+    """
+    from bar_sim.columnar import encode_result
+    with open(filepath, "wb") as f:
+        f.write(encode_result(result, _result_format(filepath, fmt)))
+
+
+def load_result(filepath: str, fmt: Optional[str] = None) -> SimResult:
+    """Read a SimResult written by save_result."""
+    from bar_sim.columnar import decode_result
+    with open(filepath, "rb") as f:
+        return decode_result(f.read(), _result_format(filepath, fmt))
+
+
 # ---------------------------------------------------------------------------
 # Strategy YAML helpers
 # ---------------------------------------------------------------------------
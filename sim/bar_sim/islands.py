@@ -0,0 +1,379 @@
+"""
+BAR Build Order Simulator - Island Model GA
+=============================================
+Runs K independent Optimizer populations ("islands") in worker processes
+and periodically migrates each island's elites to its neighbour on a ring.
+
+The master drives the islands in synchronous epochs:
+
+    run `migration_interval` generations on every island
+    collect the top `migrants` from each island
+    send island i's migrants to island (i + 1) % K
+
+Because every island is seeded from the master seed and migration happens
+at fixed points in a fixed order, a run is reproducible regardless of how
+the OS schedules the workers.
+
+Islands talk to the master over multiprocessing connections: local Pipes
+by default, or TCP (multiprocessing.connection Listener/Client) so islands
+can run on other machines via `cli.py island-worker --connect host:port`.
+
+Connections exchange pickles, and unpickling data from an untrusted peer
+can run arbitrary code, so the authkey is the only thing standing between
+a reachable port and remote code execution. There is no default key: a
+loopback master running only local islands makes up a random one, and
+anything else (a non-loopback address, remote islands, island-worker)
+needs a shared secret from --authkey or BAR_SIM_AUTHKEY.
+"""
+
+import ipaddress
+import os
+import random
+import secrets
+import time
+from dataclasses import dataclass, field
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Client, Connection, Listener
+from typing import List, Optional, Tuple
+
+from bar_sim.models import BuildOrder, MapConfig
+from bar_sim.optimizer import Optimizer, make_goal
+
+AUTHKEY_ENV = "BAR_SIM_AUTHKEY"
+
+
+def _authkey(authkey: Optional[bytes]) -> Optional[bytes]:
+    """The explicit key, else BAR_SIM_AUTHKEY, else None."""
+    if authkey:
+        return authkey
+    env = os.environ.get(AUTHKEY_ENV)
+    return env.encode() if env else None
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Island specification (picklable; goals are rebuilt from their name)
+# ---------------------------------------------------------------------------
+
+@dataclass
+class IslandSpec:
+    index: int
+    seed: int
+    goal_name: str
+    target_time: int
+    map_config: MapConfig
+    duration: int
+    population_size: int
+    mutation_rate: float
+    mutation_decay: float
+    prune: str = "population"
+    faction: Optional[str] = None
+    initial_bo: Optional[BuildOrder] = None
+
+
+def island_schedule(index: int, count: int,
+                    base_rate: float = 0.4, base_decay: float = 0.995) -> Tuple[float, float]:
+    """Mutation rate and decay for island `index` of `count`.
+
+    Islands spread from exploitative (low rate, fast decay) to exploratory
+    (high rate, slow decay) around the single-population defaults.
+    """
+    if count <= 1:
+        return base_rate, base_decay
+    t = index / (count - 1)
+    rate = base_rate * (0.5 + t)                       # 0.5x .. 1.5x
+    decay = 1.0 - (1.0 - base_decay) * (2.0 - 1.5 * t)  # 2x .. 0.5x decay speed
+    return round(min(rate, 0.95), 4), round(decay, 5)
+
+
+def _build_optimizer(spec: IslandSpec) -> Optimizer:
+    catalog = None
+    if spec.faction:
+        from bar_sim.econ import get_catalog
+        catalog = get_catalog(spec.faction)
+    return Optimizer(
+        goal=make_goal(spec.goal_name, target_time=spec.target_time),
+        map_config=spec.map_config,
+        duration=spec.duration,
+        seed=spec.seed,
+        population_size=spec.population_size,
+        mutation_rate=spec.mutation_rate,
+        mutation_decay=spec.mutation_decay,
+        # Each island runs until the master says stop
+        max_generations=10 ** 9,
+        prune=spec.prune,
+        catalog=catalog,
+        verbose=False,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------------
+
+def serve_island(conn: Connection):
+    """Run one island, answering master commands until told to stop.
+
+    Protocol (master -> island):
+        ("start", IslandSpec)           -> ("ready", progress)
+        ("run", n_generations, n_out)   -> ("epoch", best_score, progress, emigrants)
+        ("immigrate", individuals)      -> no reply
+        ("finish",)                     -> ("best", best_score, build_order, progress)
+    """
+    opt: Optional[Optimizer] = None
+    try:
+        while True:
+            msg = conn.recv()
+            cmd = msg[0]
+            if cmd == "start":
+                spec = msg[1]
+                opt = _build_optimizer(spec)
+                opt.start(spec.initial_bo)
+                conn.send(("ready", opt.progress()))
+            elif cmd == "run":
+                _, generations, n_out = msg
+                for _ in range(generations):
+                    opt.step()
+                conn.send(("epoch", opt.current_best()[0], opt.progress(),
+                           opt.emigrants(n_out)))
+            elif cmd == "immigrate":
+                opt.immigrate(msg[1])
+            elif cmd == "finish":
+                score, bo = opt.current_best()
+                conn.send(("best", score, bo, opt.progress()))
+                return
+    except EOFError:
+        return
+    finally:
+        conn.close()
+
+
+def _pipe_worker(conn: Connection):
+    serve_island(conn)
+
+
+def _tcp_worker(address: Tuple[str, int], authkey: bytes):
+    serve_island(Client(address, authkey=authkey))
+
+
+def connect_island(host: str, port: int, authkey: Optional[bytes] = None):
+    """Join a remote island run as a worker (blocks until the run ends).
+
+    Needs the master's key (authkey or BAR_SIM_AUTHKEY).
+    """
+    key = _authkey(authkey)
+    if key is None:
+        raise ValueError(f"Joining an island run needs the master's key: "
+                         f"pass --authkey or set {AUTHKEY_ENV}")
+    serve_island(Client((host, port), authkey=key))
+
+
+# ---------------------------------------------------------------------------
+# Master side
+# ---------------------------------------------------------------------------
+
+@dataclass
+class IslandResult:
+    best_score: float
+    best_bo: BuildOrder
+    island_scores: List[float]
+    history: List[float] = field(default_factory=list)  # best over all islands per epoch
+    evaluations: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def evals_per_sec(self) -> float:
+        return self.evaluations / self.elapsed if self.elapsed else 0.0
+
+
+class IslandOptimizer:
+    """
+    Island-model GA: K Optimizer populations with ring migration.
+
+    transport="pipe" runs every island as a local process. transport="tcp"
+    listens on `address` and spawns `local_islands` workers itself (all K
+    by default); the rest are expected to connect from other machines.
+    TCP with remote islands or on a non-loopback address requires
+    `authkey` (or BAR_SIM_AUTHKEY); otherwise a random per-run key is used.
+    """
+
+    def __init__(self, goal_name: str, map_config: MapConfig,
+                 target_time: int = 300, duration: int = 600, seed: int = 42,
+                 islands: int = 4,
+                 population_size: int = 30,
+                 max_generations: int = 100,
+                 migration_interval: int = 10,
+                 migrants: int = 2,
+                 prune: str = "population",
+                 faction: Optional[str] = None,
+                 transport: str = "pipe",
+                 address: Tuple[str, int] = ("127.0.0.1", 0),
+                 local_islands: Optional[int] = None,
+                 authkey: Optional[bytes] = None,
+                 verbose: bool = True):
+        if transport not in ("pipe", "tcp"):
+            raise ValueError(f"Unknown transport: {transport}. Choose from: ['pipe', 'tcp']")
+        self.islands = max(1, islands)
+        self.local_islands = self.islands if local_islands is None else local_islands
+        key = _authkey(authkey)
+        if transport == "tcp" and key is None:
+            if not _is_loopback(address[0]):
+                raise ValueError(f"Listening on {address[0]} needs an authkey: "
+                                 f"pass --authkey or set {AUTHKEY_ENV}")
+            if self.local_islands < self.islands:
+                raise ValueError("Remote islands need a shared authkey: "
+                                 f"pass --authkey or set {AUTHKEY_ENV}")
+            key = secrets.token_bytes(32)  # only our own workers need it
+        self.goal = make_goal(goal_name, target_time=target_time)
+        self.goal_name = goal_name
+        self.target_time = target_time
+        self.map_config = map_config
+        self.duration = duration
+        self.seed = seed
+        self.population_size = population_size
+        self.max_generations = max_generations
+        self.migration_interval = max(1, migration_interval)
+        self.migrants = migrants
+        self.prune = prune
+        self.faction = faction
+        self.transport = transport
+        self.address = address
+        self.authkey = key
+        self.verbose = verbose
+
+    def island_specs(self, initial_bo: Optional[BuildOrder] = None) -> List[IslandSpec]:
+        """Per-island parameters, derived deterministically from the master seed."""
+        rng = random.Random(self.seed)
+        specs = []
+        for i in range(self.islands):
+            rate, decay = island_schedule(i, self.islands)
+            specs.append(IslandSpec(
+                index=i,
+                seed=rng.randrange(2 ** 31),
+                goal_name=self.goal_name,
+                target_time=self.target_time,
+                map_config=self.map_config,
+                duration=self.duration,
+                population_size=self.population_size,
+                mutation_rate=rate,
+                mutation_decay=decay,
+                prune=self.prune,
+                faction=self.faction,
+                initial_bo=initial_bo,
+            ))
+        return specs
+
+    def optimize(self, initial_bo: Optional[BuildOrder] = None) -> IslandResult:
+        t0 = time.time()
+        conns, procs, listener = self._connect()
+        try:
+            return self._run(conns, initial_bo, t0)
+        finally:
+            for conn in conns:
+                conn.close()
+            for proc in procs:
+                proc.join(timeout=5)
+                if proc.is_alive():
+                    proc.terminate()
+            if listener is not None:
+                listener.close()
+
+    # ------------------------------------------------------------------
+
+    def _connect(self):
+        procs: List[Process] = []
+        if self.transport == "pipe":
+            conns = []
+            for _ in range(self.islands):
+                parent, child = Pipe()
+                proc = Process(target=_pipe_worker, args=(child,), daemon=True)
+                proc.start()
+                child.close()
+                conns.append(parent)
+                procs.append(proc)
+            return conns, procs, None
+
+        listener = Listener(self.address, authkey=self.authkey)
+        host, port = listener.address
+        if self.verbose:
+            remote = self.islands - self.local_islands
+            print(f"Island master listening on {host}:{port}"
+                  + (f" (waiting for {remote} remote islands)" if remote > 0 else ""))
+        for _ in range(min(self.local_islands, self.islands)):
+            proc = Process(target=_tcp_worker, args=((host, port), self.authkey), daemon=True)
+            proc.start()
+            procs.append(proc)
+        # Island order is connection order; specs (and so results) depend
+        # only on that index, not on which machine an island runs on.
+        conns = [listener.accept() for _ in range(self.islands)]
+        return conns, procs, listener
+
+    def _run(self, conns: List[Connection], initial_bo: Optional[BuildOrder],
+             t0: float) -> IslandResult:
+        for conn, spec in zip(conns, self.island_specs(initial_bo)):
+            conn.send(("start", spec))
+        progress = [conn.recv()[1] for conn in conns]
+
+        history = [self._best(p["best_score"] for p in progress)]
+        if self.verbose:
+            print(f"Islands: {self.islands} x pop {self.population_size}, "
+                  f"migrate {self.migrants} every {self.migration_interval} gens")
+            print(f"  Initial best: {history[-1]:.2f}")
+
+        done = 0
+        while done < self.max_generations:
+            n = min(self.migration_interval, self.max_generations - done)
+            for conn in conns:
+                conn.send(("run", n, self.migrants))
+            replies = [conn.recv() for conn in conns]
+            done += n
+
+            bests = [r[1] for r in replies]
+            progress = [r[2] for r in replies]
+            if self.migrants > 0 and len(conns) > 1:
+                for i, conn in enumerate(conns):
+                    conn.send(("immigrate", replies[i - 1][3]))  # ring: i-1 -> i
+
+            history.append(self._best(bests))
+            if self.verbose:
+                evals = sum(p["evaluations"] for p in progress)
+                elapsed = time.time() - t0
+                island_best = " ".join("%.1f" % b for b in bests)
+                print(f"  Gen {done:>4} | best: {history[-1]:>8.2f} | "
+                      f"islands: {island_best} | "
+                      f"{evals / elapsed:.0f} evals/s")
+
+        for conn in conns:
+            conn.send(("finish",))
+        finals = [conn.recv() for conn in conns]
+        scores = [f[1] for f in finals]
+        best_i = max(range(len(finals)), key=lambda i: scores[i]) \
+            if self.goal.higher_is_better else min(range(len(finals)), key=lambda i: scores[i])
+        best_bo = finals[best_i][2]
+        best_bo.name = f"Optimized ({self.goal_name}, islands)"
+
+        result = IslandResult(
+            best_score=scores[best_i],
+            best_bo=best_bo,
+            island_scores=scores,
+            history=history,
+            evaluations=sum(f[3]["evaluations"] for f in finals),
+            elapsed=time.time() - t0,
+        )
+        if self.verbose:
+            print(f"\nDone in {result.elapsed:.1f}s. Best score: {result.best_score:.2f} "
+                  f"(island {best_i}), {result.evaluations} evaluations, "
+                  f"{result.evals_per_sec:.0f} evals/s")
+        return result
+
+    def _best(self, scores) -> float:
+        scores = list(scores)
+        return max(scores) if self.goal.higher_is_better else min(scores)
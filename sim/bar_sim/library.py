@@ -0,0 +1,240 @@
+"""
+BAR Build Order Simulator - Build Order Library
+=================================================
+Precomputed best openings per map and goal, so "what's the best opening
+for this map?" is a lookup instead of a minutes-long GA run.
+
+`cli.py library build` runs the Optimizer for every cached map
+(data/maps) x goal in a process pool. Each run checkpoints under
+data/checkpoints/library/, so an interrupted build picks up where it
+stopped, and maps/goals already in the library are skipped. Winners are
+saved as YAML under data/library/ next to an index.json holding their
+scores; `optimize --from-library` and POST /api/optimize with
+"from_library" answer from it, optionally refined by a short GA seeded
+with the stored build order.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from bar_sim.io import load_build_order, save_build_order
+from bar_sim.models import BuildOrder
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+LIBRARY_DIR = DATA_DIR / "library"
+LIBRARY_CHECKPOINT_DIR = DATA_DIR / "checkpoints" / "library"
+
+# Every make_goal goal
+LIBRARY_GOALS = ("max_metal", "max_energy", "fastest_factory", "fastest_t2",
+                 "max_army", "min_stall", "balanced")
+
+INDEX_VERSION = 1
+
+
+def library_key(map_name: str, goal: str, target_time: int = 300,
+                duration: int = 600, faction: str = "ARMADA") -> str:
+    return f"{faction.lower()}/{map_name}/{goal}@{target_time}/{duration}"
+
+
+@dataclass
+class LibraryEntry:
+    map_name: str
+    goal: str
+    target_time: int
+    duration: int
+    faction: str
+    score: float
+    file: str           # YAML path relative to the library directory
+    generations: int    # GA budget the entry was found with
+    pop_size: int
+    created: float = 0.0
+
+    @property
+    def key(self) -> str:
+        return library_key(self.map_name, self.goal, self.target_time,
+                           self.duration, self.faction)
+
+
+class BuildOrderLibrary:
+    """Index of stored winners; safe to share between threads.
+
+    The index is re-read whenever index.json changes on disk, so a
+    running web server picks up entries from a library build.
+    """
+
+    def __init__(self, root: Path = LIBRARY_DIR):
+        self.root = Path(root)
+        self._entries: Dict[str, LibraryEntry] = {}
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> Path:
+        return self.root / "index.json"
+
+    def _refresh(self):
+        try:
+            st = self.index_path.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            stamp = None
+        if stamp == self._stamp:
+            return
+        entries = {}
+        if stamp is not None:
+            with open(self.index_path) as f:
+                data = json.load(f)
+            for raw in data.get("entries", []):
+                entry = LibraryEntry(**raw)
+                entries[entry.key] = entry
+        self._entries, self._stamp = entries, stamp
+
+    def entries(self) -> List[LibraryEntry]:
+        with self._lock:
+            self._refresh()
+            return sorted(self._entries.values(), key=lambda e: e.key)
+
+    def lookup(self, map_name: str, goal: str, target_time: int = 300,
+               duration: int = 600, faction: str = "ARMADA") -> Optional[LibraryEntry]:
+        with self._lock:
+            self._refresh()
+            return self._entries.get(library_key(map_name, goal, target_time,
+                                                 duration, faction))
+
+    def build_order(self, entry: LibraryEntry) -> BuildOrder:
+        """A fresh copy of the entry's build order."""
+        return load_build_order(str(self.root / entry.file))
+
+    def add(self, entry: LibraryEntry, bo: BuildOrder):
+        """Store `bo` and record it in the index (replacing any entry with the same key)."""
+        path = self.root / entry.file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        save_build_order(bo, str(path))
+        with self._lock:
+            self._refresh()
+            self._entries[entry.key] = entry
+            tmp = self.index_path.with_suffix(".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"version": INDEX_VERSION,
+                           "entries": [asdict(e) for _, e in sorted(self._entries.items())]},
+                          f, indent=1)
+            os.replace(tmp, self.index_path)
+            st = self.index_path.stat()
+            self._stamp = (st.st_mtime_ns, st.st_size)
+
+
+@dataclass(frozen=True)
+class LibraryTask:
+    map_name: str
+    goal: str
+    target_time: int
+    duration: int
+    faction: str
+    generations: int
+    pop_size: int
+    checkpoint: str
+
+    @property
+    def file(self) -> str:
+        return (f"{self.faction.lower()}/{self.map_name}_{self.goal}"
+                f"_t{self.target_time}_d{self.duration}.yaml")
+
+
+def _run_task(task: LibraryTask) -> Tuple[float, BuildOrder]:
+    from bar_sim.econ import get_catalog
+    from bar_sim.map_data import get_map_data, map_data_to_map_config
+    from bar_sim.optimizer import Optimizer, make_goal
+
+    md = get_map_data(task.map_name)
+    if md is None:
+        raise ValueError(f"Map not found: {task.map_name}")
+    opt = Optimizer(
+        goal=make_goal(task.goal, target_time=task.target_time),
+        map_config=map_data_to_map_config(md),
+        duration=task.duration,
+        population_size=task.pop_size,
+        max_generations=task.generations,
+        verbose=False,
+        catalog=get_catalog(task.faction),
+    )
+    best = opt.optimize(checkpoint_path=task.checkpoint, resume=True)
+    best.name = f"Library: {task.map_name} {task.goal}"
+    best.map_name = task.map_name
+    return opt.best_score, best
+
+
+def build_library(maps: Optional[Sequence[str]] = None,
+                  goals: Sequence[str] = LIBRARY_GOALS,
+                  target_time: int = 300,
+                  duration: int = 600,
+                  generations: int = 100,
+                  pop_size: int = 60,
+                  workers: int = 1,
+                  faction: str = "ARMADA",
+                  library: Optional[BuildOrderLibrary] = None,
+                  checkpoint_dir: Path = LIBRARY_CHECKPOINT_DIR,
+                  force: bool = False,
+                  progress: Optional[Callable[[LibraryTask, Optional[LibraryEntry], Optional[Exception]], None]] = None,
+                  ) -> List[LibraryEntry]:
+    """Optimize every map x goal not yet in the library and store the winners.
+
+    maps defaults to every cached map. Entries are written as each run
+    finishes; a failed run is reported through `progress` and left out.
+    Returns the entries added.
+    """
+    from bar_sim.map_data import list_cached_maps
+
+    library = library or BuildOrderLibrary()
+    faction = faction.upper()
+    maps = list(maps) if maps is not None else list_cached_maps()
+    checkpoint_dir = Path(checkpoint_dir)
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+
+    tasks = []
+    for map_name in maps:
+        for goal in goals:
+            if not force and library.lookup(map_name, goal, target_time, duration, faction):
+                continue
+            stem = f"{faction.lower()}_{map_name}_{goal}_t{target_time}_d{duration}"
+            tasks.append(LibraryTask(map_name, goal, target_time, duration, faction,
+                                     generations, pop_size,
+                                     str(checkpoint_dir / f"{stem}.ckpt")))
+
+    added = []
+
+    def finish(task, outcome, error):
+        entry = None
+        if error is None:
+            score, bo = outcome
+            entry = LibraryEntry(task.map_name, task.goal, task.target_time, task.duration,
+                                 task.faction, score, task.file, task.generations,
+                                 task.pop_size, created=time.time())
+            library.add(entry, bo)
+            Path(task.checkpoint).unlink(missing_ok=True)
+            added.append(entry)
+        if progress:
+            progress(task, entry, error)
+
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_task, t): t for t in tasks}
+            for fut in as_completed(futures):
+                try:
+                    outcome, error = fut.result(), None
+                except Exception as e:
+                    outcome, error = None, e
+                finish(futures[fut], outcome, error)
+    else:
+        for task in tasks:
+            try:
+                outcome, error = _run_task(task), None
+            except Exception as e:
+                outcome, error = None, e
+            finish(task, outcome, error)
+    return added
@@ -2,10 +2,17 @@
 BAR Build Order Simulator - Data Models
 ========================================
 All dataclasses for the simulation engine.
+
+The per-run and per-candidate models (BuildAction, BuildTask, Builder,
+Milestone, StallEvent, Snapshot) are slotted: the GA creates and copies
+millions of them. BuildAction, Milestone and Snapshot are also frozen;
+BuildActions are interned through build_action().
 """
 
+from bisect import bisect_right
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from operator import attrgetter
+from typing import Any, List, Dict, FrozenSet, Iterable, Optional, Tuple
 from enum import Enum, auto
 
 
@@ -87,12 +94,36 @@ class BuildActionType(Enum):
     RECLAIM = auto()
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BuildAction:
     unit_key: str
     action_type: BuildActionType = BuildActionType.BUILD_STRUCTURE
     repeat: int = 1
 
+    # Immutable, so copies (including deepcopy of a whole BuildOrder) share it
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return build_action, (self.unit_key, self.action_type, self.repeat)
+
+
+_ACTIONS: Dict[Tuple[str, BuildActionType, int], BuildAction] = {}
+
+
+def build_action(unit_key: str,
+                 action_type: BuildActionType = BuildActionType.BUILD_STRUCTURE,
+                 repeat: int = 1) -> BuildAction:
+    """The shared BuildAction for these values (created on first use)."""
+    key = (unit_key, action_type, repeat)
+    action = _ACTIONS.get(key)
+    if action is None:
+        action = _ACTIONS[key] = BuildAction(unit_key, action_type, repeat)
+    return action
+
 
 @dataclass
 class BuildOrder:
@@ -110,7 +141,7 @@ class BuildOrder:
 # Runtime simulation entities
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True)
 class BuildTask:
     task_id: int
     unit_key: str
@@ -142,7 +173,7 @@ class BuildTask:
         return self.work_done >= self.total_build_work
 
 
-@dataclass
+@dataclass(slots=True)
 class Builder:
     builder_id: str
     build_power: int
@@ -185,7 +216,7 @@ class SimState:
     units: Dict[str, int] = field(default_factory=dict)
 
     builders: Dict[str, Builder] = field(default_factory=dict)
-    active_tasks: List[BuildTask] = field(default_factory=list)
+    active_tasks: Dict[int, BuildTask] = field(default_factory=dict)  # task_id -> task, oldest first
     completed_tasks: List[BuildTask] = field(default_factory=list)
 
     active_converters_t1: int = 0
@@ -203,7 +234,7 @@ class SimState:
 # Simulation results
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Milestone:
     tick: int
     event: str
@@ -212,7 +243,7 @@ class Milestone:
     energy_income: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class StallEvent:
     start_tick: int
     end_tick: int = 0
@@ -220,7 +251,7 @@ class StallEvent:
     severity: float = 0.0
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Snapshot:
     tick: int
     metal_income: float = 0.0
@@ -237,6 +268,85 @@ class Snapshot:
     econ_state: str = "balanced"
 
 
+# Snapshot fields (besides tick) that SnapshotConfig.fields can select
+SNAPSHOT_FIELDS = (
+    "metal_income", "energy_income", "metal_stored", "energy_stored",
+    "metal_expenditure", "energy_expenditure", "build_power",
+    "army_value_metal", "stall_factor", "unit_counts", "army_by_role",
+    "econ_state",
+)
+
+
+@dataclass(frozen=True)
+class SnapshotConfig:
+    """What SimulationEngine records as Snapshots.
+
+    - interval: ticks between snapshots (there is always one at tick 0)
+    - fields: Snapshot fields to fill; the rest keep their defaults.
+      None records every field.
+    - unit_count_deltas: unit_counts holds only the counts that changed
+      since the previous snapshot (0 for units that are gone);
+      expand_unit_counts() rebuilds the totals.
+    - keep_until: score-only mode. Only the latest snapshot at or before
+      this tick is kept; later boundaries still emit "snapshot" events
+      (with no data) so callers can stop runs early, but record nothing.
+    """
+    interval: int = 30
+    fields: Optional[FrozenSet[str]] = None
+    unit_count_deltas: bool = False
+    keep_until: Optional[int] = None
+
+    def __post_init__(self):
+        if self.interval < 1:
+            raise ValueError(f"Snapshot interval must be >= 1, got {self.interval}")
+        if self.fields is not None:
+            object.__setattr__(self, "fields", frozenset(self.fields))
+            unknown = self.fields - set(SNAPSHOT_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown snapshot fields: {sorted(unknown)}")
+
+    @classmethod
+    def score_only(cls, fields: Iterable[str], target_time: Optional[int],
+                   interval: int = 30) -> "SnapshotConfig":
+        """Record just `fields`, keeping only the snapshot a goal reads at
+        target_time (nothing at all when no fields are needed)."""
+        fields = frozenset(fields)
+        if not fields:
+            return cls(interval=interval, fields=fields, keep_until=-1)
+        return cls(interval=interval, fields=fields, keep_until=target_time)
+
+    @property
+    def records_all(self) -> bool:
+        return self.fields is None and not self.unit_count_deltas and self.keep_until is None
+
+
+def expand_unit_counts(snapshots: List[Snapshot]) -> List[Dict[str, int]]:
+    """Absolute unit counts per snapshot from delta-encoded unit_counts."""
+    totals: Dict[str, int] = {}
+    out = []
+    for snap in snapshots:
+        for key, count in snap.unit_counts.items():
+            if count:
+                totals[key] = count
+            else:
+                totals.pop(key, None)
+        out.append(dict(totals))
+    return out
+
+
+@dataclass
+class SimEvent:
+    """Something that happened during a run, as yielded by iter_run()/step().
+
+    kind is "snapshot", "milestone", "stall" or "goal"; data is the matching
+    Snapshot, Milestone, StallEvent or (tick, description) goal completion.
+    Snapshot events past a score-only SnapshotConfig's keep_until carry None.
+    """
+    kind: str
+    tick: int
+    data: Any = None
+
+
 @dataclass
 class SimResult:
     build_order_name: str = ""
@@ -261,3 +371,89 @@ class SimResult:
     army_composition_final: Dict[str, int] = field(default_factory=dict)
     goal_completions: List[Tuple[int, str]] = field(default_factory=list)
     strategy_used: Optional[str] = None
+
+    # Set when the engine ran with a non-default SnapshotConfig
+    snapshot_config: Optional[SnapshotConfig] = None
+
+    # Set when the engine ran with profile=True (bar_sim.profiling.EngineProfile)
+    profile: Optional["EngineProfile"] = None
+
+    # Lazily built lookup tables (see milestone() and series()); rebuilt
+    # when the lists they index grow, and never pickled
+    _milestone_index: Optional[Tuple[int, Dict[str, Milestone]]] = field(
+        default=None, init=False, repr=False, compare=False)
+    _series_cache: Optional[Tuple[tuple, Dict[str, Any]]] = field(
+        default=None, init=False, repr=False, compare=False)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state["_milestone_index"] = state["_series_cache"] = None
+        return state
+
+    # ------------------------------------------------------------------
+    # Time-series accessors
+    # ------------------------------------------------------------------
+
+    def snapshot_at(self, tick: int) -> Optional[Snapshot]:
+        """Latest snapshot at or before `tick` (None before the first)."""
+        i = bisect_right(self.snapshots, tick, key=_snapshot_tick)
+        return self.snapshots[i - 1] if i else None
+
+    def value_at(self, name: str, tick: float) -> float:
+        """Snapshot field `name` linearly interpolated at `tick`.
+
+        Clamped to the first/last snapshot outside the recorded range.
+        """
+        snaps = self.snapshots
+        if not snaps:
+            raise ValueError("Result has no snapshots")
+        i = bisect_right(snaps, tick, key=_snapshot_tick)
+        if i == 0:
+            return getattr(snaps[0], name)
+        a = snaps[i - 1]
+        if i == len(snaps) or a.tick == tick:
+            return getattr(a, name)
+        b = snaps[i]
+        va, vb = getattr(a, name), getattr(b, name)
+        return va + (vb - va) * (tick - a.tick) / (b.tick - a.tick)
+
+    def milestone(self, event: str) -> Optional[Milestone]:
+        """The milestone recorded for `event`, if any."""
+        index = self._milestone_index
+        if index is None or index[0] != len(self.milestones):
+            by_event: Dict[str, Milestone] = {}
+            for m in self.milestones:
+                by_event.setdefault(m.event, m)
+            index = self._milestone_index = (len(self.milestones), by_event)
+        return index[1].get(event)
+
+    def series(self, name: str):
+        """NumPy array of snapshot field `name` ("tick" for the ticks).
+
+        Arrays are built on first use and cached until more snapshots are
+        recorded. Treat them as read-only. Requires NumPy.
+        """
+        snaps = self.snapshots
+        key = (len(snaps), snaps[-1].tick if snaps else None)
+        cache = self._series_cache
+        if cache is None or cache[0] != key:
+            cache = self._series_cache = (key, {})
+        arrays = cache[1]
+        arr = arrays.get(name)
+        if arr is None:
+            if name != "tick" and name not in SNAPSHOT_FIELDS:
+                raise ValueError(f"Unknown snapshot field: {name}")
+            if name in ("unit_counts", "army_by_role"):
+                raise ValueError(f"{name} holds dicts; read it from the snapshots")
+            try:
+                import numpy as np
+            except ImportError as e:
+                raise ImportError(
+                    "SimResult.series() requires NumPy. Install with: pip install numpy"
+                ) from e
+            arr = arrays[name] = np.array([getattr(s, name) for s in snaps])
+            arr.flags.writeable = False
+        return arr
+
+
+_snapshot_tick = attrgetter("tick")
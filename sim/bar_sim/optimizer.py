@@ -9,13 +9,19 @@ tick-based multi-builder simulation engine for much higher fidelity.
 """
 
 import copy
+import math
+import os
+import pickle
 import random
 import time
-from typing import List, Optional, Callable, Tuple
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Callable, Sequence, Tuple
 
-from bar_sim.econ import UNITS
+from bar_sim.econ import UNITS, UnitCatalog
 from bar_sim.models import (
-    BuildOrder, BuildAction, BuildActionType, MapConfig, SimResult, Snapshot,
+    BuildOrder, BuildAction, BuildActionType, MapConfig, SimResult,
+    SnapshotConfig, build_action,
 )
 from bar_sim.engine import SimulationEngine, FACTORY_KEYS, CONSTRUCTOR_KEYS
 
@@ -25,19 +31,66 @@ from bar_sim.engine import SimulationEngine, FACTORY_KEYS, CONSTRUCTOR_KEYS
 # ---------------------------------------------------------------------------
 
 class OptGoal:
-    """An optimization objective with a scoring function."""
+    """An optimization objective with a scoring function.
+
+    Goals may also describe how a *partial* run relates to the final score,
+    which lets the optimizer stop simulations early:
+
+    - bound_fn(partial, tick): optimistic bound on the final score given the
+      run so far, or None if nothing can be proven yet. A candidate whose
+      bound can't beat the current threshold is pruned (scored worst_score).
+    - settled_fn(partial, tick): True once later ticks can no longer change
+      the score, so the rest of the run can be skipped.
+
+    Goals that declare which Snapshot fields they read (snapshot_fields,
+    at target_time) are evaluated with a score-only SnapshotConfig that
+    records nothing else. None means "may read anything".
+    """
 
     def __init__(self, name: str, description: str,
                  score_fn: Callable[[SimResult], float],
-                 higher_is_better: bool = True):
+                 higher_is_better: bool = True,
+                 bound_fn: Optional[Callable[[SimResult, int], Optional[float]]] = None,
+                 settled_fn: Optional[Callable[[SimResult, int], bool]] = None,
+                 snapshot_fields: Optional[Iterable[str]] = None,
+                 target_time: Optional[int] = None):
         self.name = name
         self.description = description
         self.score_fn = score_fn
         self.higher_is_better = higher_is_better
+        self.bound_fn = bound_fn
+        self.settled_fn = settled_fn
+        self.snapshot_fields = frozenset(snapshot_fields) if snapshot_fields is not None else None
+        self.target_time = target_time
+        self._recipe = None  # (factory, args) that rebuilds this goal
+
+    def __reduce__(self):
+        # Scoring functions are closures, so goals pickle as the
+        # make_goal() call that built them (for worker processes)
+        if self._recipe is None:
+            raise pickle.PicklingError(f"Goal {self.name!r} was not built by make_goal()")
+        return self._recipe
 
     def score(self, result: SimResult) -> float:
         return self.score_fn(result)
 
+    @property
+    def snapshot_config(self) -> Optional[SnapshotConfig]:
+        """Score-only SnapshotConfig for this goal (None: record everything)."""
+        if not hasattr(self, "_snapshot_config"):
+            self._snapshot_config = score_only_config([self])
+        return self._snapshot_config
+
+    def bound(self, partial: SimResult, tick: int) -> Optional[float]:
+        return self.bound_fn(partial, tick) if self.bound_fn else None
+
+    def is_settled(self, partial: SimResult, tick: int) -> bool:
+        return bool(self.settled_fn and self.settled_fn(partial, tick))
+
+    @property
+    def can_stop_early(self) -> bool:
+        return self.bound_fn is not None or self.settled_fn is not None
+
     def is_better(self, a: float, b: float) -> bool:
         """Is score `a` better than score `b`?"""
         if self.higher_is_better:
@@ -49,68 +102,103 @@ class OptGoal:
         return float('-inf') if self.higher_is_better else float('inf')
 
 
-def _snap_at(result: SimResult, tick: int) -> Optional[Snapshot]:
-    best = None
-    for s in result.snapshots:
-        if s.tick <= tick:
-            best = s
-        else:
-            break
-    return best
+def score_only_config(goals: Sequence[OptGoal]) -> Optional[SnapshotConfig]:
+    """The leanest SnapshotConfig that still scores every goal exactly.
+
+    None (record everything) if any goal doesn't declare its fields. Goals
+    reading snapshots at different target times keep every snapshot.
+    """
+    if any(g.snapshot_fields is None for g in goals):
+        return None
+    fields = frozenset().union(*(g.snapshot_fields for g in goals))
+    targets = {g.target_time for g in goals if g.snapshot_fields}
+    if len(targets) > 1:
+        return SnapshotConfig(fields=fields)
+    return SnapshotConfig.score_only(fields, next(iter(targets), None))
+
+
+def _snap_value(result: SimResult, tick: int, name: str) -> float:
+    snap = result.snapshot_at(tick)
+    return getattr(snap, name) if snap else 0
 
 
 def make_goal(goal_name: str, target_time: int = 300) -> OptGoal:
     """Create an optimization goal by name."""
+    # Snapshot goals only read the last snapshot at or before target_time
+    past_target = lambda r, t: t >= target_time
     goals = {
         "max_metal": OptGoal(
             name="max_metal",
             description=f"Maximize metal income at {target_time}s",
-            score_fn=lambda r: (_snap_at(r, target_time).metal_income
-                                if _snap_at(r, target_time) else 0),
+            score_fn=lambda r: _snap_value(r, target_time, "metal_income"),
+            settled_fn=past_target,
+            snapshot_fields=("metal_income",),
+            target_time=target_time,
         ),
         "max_energy": OptGoal(
             name="max_energy",
             description=f"Maximize energy income at {target_time}s",
-            score_fn=lambda r: (_snap_at(r, target_time).energy_income
-                                if _snap_at(r, target_time) else 0),
+            score_fn=lambda r: _snap_value(r, target_time, "energy_income"),
+            settled_fn=past_target,
+            snapshot_fields=("energy_income",),
+            target_time=target_time,
         ),
         "fastest_factory": OptGoal(
             name="fastest_factory",
             description="Minimize time to first factory",
             score_fn=lambda r: r.time_to_first_factory or 9999,
             higher_is_better=False,
+            # No factory yet at `t` means the earliest possible one is t+1
+            bound_fn=lambda r, t: r.time_to_first_factory or t + 1,
+            settled_fn=lambda r, t: r.time_to_first_factory is not None,
+            snapshot_fields=(),
         ),
         "fastest_t2": OptGoal(
             name="fastest_t2",
             description="Minimize time to T2 lab",
             score_fn=lambda r: r.time_to_t2_lab or 9999,
             higher_is_better=False,
+            bound_fn=lambda r, t: r.time_to_t2_lab or t + 1,
+            settled_fn=lambda r, t: r.time_to_t2_lab is not None,
+            snapshot_fields=(),
         ),
         "max_army": OptGoal(
             name="max_army",
             description=f"Maximize army metal value at {target_time}s",
-            score_fn=lambda r: (_snap_at(r, target_time).army_value_metal
-                                if _snap_at(r, target_time) else 0),
+            score_fn=lambda r: _snap_value(r, target_time, "army_value_metal"),
+            settled_fn=past_target,
+            snapshot_fields=("army_value_metal",),
+            target_time=target_time,
         ),
         "min_stall": OptGoal(
             name="min_stall",
             description="Minimize total stall seconds",
             score_fn=lambda r: r.total_metal_stall_seconds + r.total_energy_stall_seconds,
             higher_is_better=False,
+            # Stall seconds only accumulate
+            bound_fn=lambda r, t: r.total_metal_stall_seconds + r.total_energy_stall_seconds,
+            snapshot_fields=(),
         ),
         "balanced": OptGoal(
             name="balanced",
             description=f"Balanced score (eco + army - stalls) at {target_time}s",
             score_fn=lambda r: _balanced_score(r, target_time),
+            # Past the target the eco/army terms are fixed and the stall
+            # penalty can only grow, so the current score is an upper bound
+            bound_fn=lambda r, t: _balanced_score(r, target_time) if t >= target_time else None,
+            snapshot_fields=("metal_income", "energy_income", "army_value_metal"),
+            target_time=target_time,
         ),
     }
     if goal_name not in goals:
         raise ValueError(f"Unknown goal: {goal_name}. Choose from: {list(goals.keys())}")
-    return goals[goal_name]
+    goal = goals[goal_name]
+    goal._recipe = (make_goal, (goal_name, target_time))
+    return goal
 
 
 def _balanced_score(result: SimResult, target_time: int) -> float:
-    snap = _snap_at(result, target_time)
+    snap = result.snapshot_at(target_time)
     if not snap:
         return 0
     metal_score = snap.metal_income * 10
@@ -120,6 +208,90 @@ def _balanced_score(result: SimResult, target_time: int) -> float:
     return metal_score + energy_score + army_score - stall_penalty
 
 
+# ---------------------------------------------------------------------------
+# Candidate evaluation with early termination
+# ---------------------------------------------------------------------------
+
+PRUNE_MODES = ("off", "population", "elite")
+
+# Shortest rung StrategyOptimizer's successive halving will simulate
+HALVING_MIN_TICKS = 120
+
+
+@dataclass
+class EvalStats:
+    """Counters for how much simulation early termination saved."""
+    evaluations: int = 0
+    pruned: int = 0        # stopped because the goal bound couldn't beat the threshold
+    settled: int = 0       # stopped because the score could no longer change
+    ticks_simulated: int = 0
+    ticks_budget: int = 0  # ticks a full-length run of every candidate would take
+
+    @property
+    def sim_fraction(self) -> float:
+        return self.ticks_simulated / self.ticks_budget if self.ticks_budget else 1.0
+
+    def as_dict(self) -> dict:
+        return {
+            "evaluations": self.evaluations,
+            "pruned": self.pruned,
+            "settled": self.settled,
+            "sim_fraction": round(self.sim_fraction, 3),
+        }
+
+    def merge(self, other: "EvalStats"):
+        self.evaluations += other.evaluations
+        self.pruned += other.pruned
+        self.settled += other.settled
+        self.ticks_simulated += other.ticks_simulated
+        self.ticks_budget += other.ticks_budget
+
+    def summary(self) -> str:
+        return (f"{self.pruned}/{self.evaluations} pruned, "
+                f"{self.settled} settled early, "
+                f"{self.sim_fraction:.0%} of ticks simulated")
+
+
+def evaluate_candidate(bo: BuildOrder, goal: OptGoal, duration: int,
+                       threshold: Optional[float] = None,
+                       catalog: Optional[UnitCatalog] = None,
+                       stats: Optional[EvalStats] = None,
+                       seed: int = 42) -> float:
+    """Simulate `bo` and score it, stopping as soon as the outcome is known.
+
+    Bounds and settledness are checked at snapshot boundaries. With a
+    threshold, a run whose optimistic bound can't beat it is abandoned and
+    scored goal.worst_score. The bound itself is never worse than the true
+    score, so keeping it would let a pruned child outrank fully simulated
+    ones it is actually worse than.
+    """
+    stats = stats if stats is not None else EvalStats()
+    stats.evaluations += 1
+    stats.ticks_budget += duration
+    engine = SimulationEngine(bo, duration, seed=seed, catalog=catalog,
+                              snapshot_config=goal.snapshot_config)
+    try:
+        if not goal.can_stop_early:
+            return goal.score(engine.run())
+        for event in engine.iter_run():
+            if event.kind != "snapshot":
+                continue
+            partial = engine.result
+            if goal.is_settled(partial, event.tick):
+                stats.settled += 1
+                break
+            if threshold is not None:
+                bound = goal.bound(partial, event.tick)
+                if bound is not None and not goal.is_better(bound, threshold):
+                    stats.pruned += 1
+                    return goal.worst_score
+        return goal.score(engine.finish())
+    except Exception:
+        return goal.worst_score
+    finally:
+        stats.ticks_simulated += engine.state.tick
+
+
 # ---------------------------------------------------------------------------
 # Unit pools & constraints
 # ---------------------------------------------------------------------------
@@ -179,7 +351,7 @@ def enforce_constraints(bo: BuildOrder, map_config: MapConfig) -> BuildOrder:
     """Fix constraint violations in a build order."""
     if not _has_factory(bo):
         pos = min(4, len(bo.commander_queue))
-        bo.commander_queue.insert(pos, BuildAction(unit_key="bot_lab"))
+        bo.commander_queue.insert(pos, build_action(unit_key="bot_lab"))
 
     total_mex = _mex_count(bo)
     if total_mex > map_config.mex_spots:
@@ -219,46 +391,46 @@ def greedy_seed(map_config: MapConfig, duration: int = 600,
     bo = BuildOrder(name="Greedy Seed", map_config=copy.deepcopy(map_config))
     com = bo.commander_queue
 
-    com.append(BuildAction(unit_key="mex"))
-    com.append(BuildAction(unit_key="mex"))
+    com.append(build_action(unit_key="mex"))
+    com.append(build_action(unit_key="mex"))
 
     energy_key = "wind" if map_config.avg_wind >= 7 else "solar"
-    com.append(BuildAction(unit_key=energy_key))
-    com.append(BuildAction(unit_key=energy_key))
-    com.append(BuildAction(unit_key="bot_lab"))
-    com.append(BuildAction(unit_key="mex"))
-    com.append(BuildAction(unit_key=energy_key))
-    com.append(BuildAction(unit_key=energy_key))
-    com.append(BuildAction(unit_key="radar"))
+    com.append(build_action(unit_key=energy_key))
+    com.append(build_action(unit_key=energy_key))
+    com.append(build_action(unit_key="bot_lab"))
+    com.append(build_action(unit_key="mex"))
+    com.append(build_action(unit_key=energy_key))
+    com.append(build_action(unit_key=energy_key))
+    com.append(build_action(unit_key="radar"))
 
     mex_placed = 3
     remaining = max_com_queue - len(com)
     for i in range(remaining):
         if mex_placed < map_config.mex_spots and i % 3 == 0:
-            com.append(BuildAction(unit_key="mex"))
+            com.append(build_action(unit_key="mex"))
             mex_placed += 1
         elif i == remaining - 1:
-            com.append(BuildAction(unit_key="nano"))
+            com.append(build_action(unit_key="nano"))
         else:
-            com.append(BuildAction(unit_key=energy_key))
+            com.append(build_action(unit_key=energy_key))
 
     fac_q = []
-    fac_q.append(BuildAction(unit_key="tick", action_type=BuildActionType.PRODUCE_UNIT))
-    fac_q.append(BuildAction(unit_key="grunt", action_type=BuildActionType.PRODUCE_UNIT))
-    fac_q.append(BuildAction(unit_key="grunt", action_type=BuildActionType.PRODUCE_UNIT))
-    fac_q.append(BuildAction(unit_key="con_bot", action_type=BuildActionType.PRODUCE_UNIT))
+    fac_q.append(build_action(unit_key="tick", action_type=BuildActionType.PRODUCE_UNIT))
+    fac_q.append(build_action(unit_key="grunt", action_type=BuildActionType.PRODUCE_UNIT))
+    fac_q.append(build_action(unit_key="grunt", action_type=BuildActionType.PRODUCE_UNIT))
+    fac_q.append(build_action(unit_key="con_bot", action_type=BuildActionType.PRODUCE_UNIT))
     for _ in range(max_fac_queue - 4):
-        fac_q.append(BuildAction(unit_key="grunt", action_type=BuildActionType.PRODUCE_UNIT))
+        fac_q.append(build_action(unit_key="grunt", action_type=BuildActionType.PRODUCE_UNIT))
     bo.factory_queues["factory_0"] = fac_q
 
     con_q = []
     con_mex = 0
     for i in range(max_con_queue):
         if con_mex < 3 and i % 2 == 0:
-            con_q.append(BuildAction(unit_key="mex"))
+            con_q.append(build_action(unit_key="mex"))
             con_mex += 1
         else:
-            con_q.append(BuildAction(unit_key=energy_key))
+            con_q.append(build_action(unit_key=energy_key))
     bo.constructor_queues["con_1"] = con_q
 
     return bo
@@ -272,27 +444,27 @@ def random_seed(map_config: MapConfig, rng: random.Random,
 
     # Commander: always start mex, mex, then random mix ending with a factory somewhere
     com = bo.commander_queue
-    com.append(BuildAction(unit_key="mex"))
-    com.append(BuildAction(unit_key="mex"))
+    com.append(build_action(unit_key="mex"))
+    com.append(build_action(unit_key="mex"))
 
     factory_placed = False
     for _ in range(rng.randint(8, max_com)):
         roll = rng.random()
         if not factory_placed and roll < 0.15:
-            com.append(BuildAction(unit_key=rng.choice(["bot_lab", "vehicle_plant"])))
+            com.append(build_action(unit_key=rng.choice(["bot_lab", "vehicle_plant"])))
             factory_placed = True
         elif roll < 0.5:
-            com.append(BuildAction(unit_key=energy_key))
+            com.append(build_action(unit_key=energy_key))
         elif roll < 0.7:
-            com.append(BuildAction(unit_key="mex"))
+            com.append(build_action(unit_key="mex"))
         else:
-            com.append(BuildAction(unit_key=rng.choice(COMMANDER_POOL)))
+            com.append(build_action(unit_key=rng.choice(COMMANDER_POOL)))
 
     # Factory queue
     fac_q = []
-    fac_q.append(BuildAction(unit_key="tick", action_type=BuildActionType.PRODUCE_UNIT))
+    fac_q.append(build_action(unit_key="tick", action_type=BuildActionType.PRODUCE_UNIT))
     for _ in range(rng.randint(6, max_fac)):
-        fac_q.append(BuildAction(
+        fac_q.append(build_action(
             unit_key=rng.choice(FACTORY_PRODUCIBLE),
             action_type=BuildActionType.PRODUCE_UNIT))
     bo.factory_queues["factory_0"] = fac_q
@@ -300,7 +472,7 @@ def random_seed(map_config: MapConfig, rng: random.Random,
     # Constructor queue
     con_q = []
     for _ in range(rng.randint(4, max_con)):
-        con_q.append(BuildAction(unit_key=rng.choice(CON_POOL)))
+        con_q.append(build_action(unit_key=rng.choice(CON_POOL)))
     bo.constructor_queues["con_1"] = con_q
 
     return bo
@@ -336,7 +508,7 @@ def _mutate_replace(bo: BuildOrder, rng: random.Random) -> BuildOrder:
     i = rng.randint(0, len(q) - 1)
     old_type = q[i].action_type
     new_key = rng.choice(pool)
-    q[i] = BuildAction(unit_key=new_key, action_type=old_type)
+    q[i] = build_action(unit_key=new_key, action_type=old_type)
     return new
 
 
@@ -355,7 +527,7 @@ def _mutate_insert(bo: BuildOrder, rng: random.Random) -> BuildOrder:
                           for fid in new.factory_queues)
                    else BuildActionType.BUILD_STRUCTURE)
     pos = rng.randint(0, len(q))
-    q.insert(pos, BuildAction(unit_key=new_key, action_type=action_type))
+    q.insert(pos, build_action(unit_key=new_key, action_type=action_type))
     return new
 
 
@@ -475,6 +647,102 @@ def _uniform_queue(q1: List[BuildAction], q2: List[BuildAction],
             q1[i], q2[i] = q2[i], q1[i]
 
 
+CROSSOVERS = [_crossover_one_point, _crossover_uniform]
+
+
+# ---------------------------------------------------------------------------
+# Operator selection
+# ---------------------------------------------------------------------------
+
+OPERATOR_SELECTION = ("uniform", "adaptive")
+
+
+class OperatorSelector:
+    """Picks among GA operators and credits them with their offspring's gain.
+
+    Each offspring's reward is its relative improvement over its better
+    parent (0 if it is no better). Every operator that shaped it (its
+    crossover and each mutation applied) is credited with that reward.
+
+    With adaptive=False, operators are drawn by `weights` (uniformly if
+    None) and the credit only feeds the statistics. With adaptive=True,
+    probability matching is used: operator i is drawn with
+    p_min + (1 - K * p_min) * q_i / sum(q), where q_i is its mean gain per
+    use shrunk toward the pooled mean by `prior` pseudo-uses. Improvements
+    are rare (a few percent of offspring), so without the shrinkage one
+    lucky offspring would hand its operator most of the probability mass.
+    """
+
+    def __init__(self, operators: Sequence[Callable], adaptive: bool = False,
+                 weights: Optional[Sequence[float]] = None,
+                 p_min: float = 0.05, prior: float = 50.0):
+        self.operators = list(operators)
+        self.names = [op.__name__.lstrip("_") for op in self.operators]
+        self.adaptive = adaptive
+        self.weights = list(weights) if weights is not None else None
+        self.p_min = min(p_min, 1.0 / len(self.operators))
+        self.prior = prior
+        k = len(self.operators)
+        self.uses = [0] * k
+        self.successes = [0] * k
+        self.gain = [0.0] * k
+
+    def quality(self) -> List[float]:
+        """Shrunk mean gain per use of each operator."""
+        total_uses = sum(self.uses)
+        pooled = sum(self.gain) / total_uses if total_uses else 0.0
+        return [(g + self.prior * pooled) / (n + self.prior)
+                for g, n in zip(self.gain, self.uses)]
+
+    def probabilities(self) -> List[float]:
+        k = len(self.operators)
+        if self.adaptive and sum(self.gain) > 0:
+            quality = self.quality()
+            total = sum(quality)
+            return [self.p_min + (1 - k * self.p_min) * q / total for q in quality]
+        if self.weights is not None:
+            w = sum(self.weights)
+            return [x / w for x in self.weights]
+        return [1.0 / k] * k
+
+    def pick(self, rng: random.Random) -> int:
+        """Index of the operator to apply next."""
+        if not self.adaptive and self.weights is None:
+            return rng.randrange(len(self.operators))
+        r = rng.random()
+        acc = 0.0
+        for i, p in enumerate(self.probabilities()):
+            acc += p
+            if r < acc:
+                return i
+        return len(self.operators) - 1
+
+    def credit(self, indices: Sequence[int], reward: float):
+        for i in indices:
+            self.uses[i] += 1
+            self.successes[i] += reward > 0
+            self.gain[i] += reward
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            name: {
+                "uses": self.uses[i],
+                "success_rate": round(self.successes[i] / self.uses[i], 3) if self.uses[i] else 0.0,
+                "mean_gain": round(self.gain[i] / self.uses[i], 4) if self.uses[i] else 0.0,
+                "p": round(p, 3),
+            }
+            for i, (name, p) in enumerate(zip(self.names, self.probabilities()))
+        }
+
+    def state_dict(self) -> dict:
+        return {"uses": self.uses, "successes": self.successes, "gain": self.gain}
+
+    def load_state_dict(self, state: dict):
+        self.uses = list(state["uses"])
+        self.successes = list(state["successes"])
+        self.gain = list(state["gain"])
+
+
 # ---------------------------------------------------------------------------
 # Genetic Algorithm
 # ---------------------------------------------------------------------------
@@ -494,6 +762,18 @@ class Optimizer:
     - Elitism (top N survive unchanged)
     - Stagnation detection with catastrophic restart
     - Heuristic-seeded initial population
+    - Early termination of runs that can't beat the population (`prune`:
+      "population" = worst survivor, "elite" = weakest elite, "off")
+    - Optional surrogate pre-screening (surrogate_ratio > 1): breed that
+      many times more offspring and simulate only the best-predicted ones
+      (see surrogate.py; needs NumPy)
+    - Optional robust fitness over `scenarios` (maps x wind seeds),
+      aggregated by mean / worst / cvar and raced per batch (see robust.py)
+    - Optional per-generation telemetry (see telemetry.py)
+    - Operator selection (`operator_selection`): "uniform" draws mutations
+      uniformly and crossovers 70/30 one-point/uniform; "adaptive" shifts
+      both by probability matching on offspring fitness gain. Per-operator
+      success rates are tracked either way (see OperatorSelector).
     """
 
     def __init__(self, goal: OptGoal, map_config: MapConfig,
@@ -510,13 +790,42 @@ class Optimizer:
                  catastrophe_limit: int = 50,
                  hyper_mutation_rate: float = 0.9,
                  verbose: bool = True,
+                 catalog: Optional[UnitCatalog] = None,
+                 prune: str = "population",
+                 surrogate_ratio: float = 0.0,
+                 surrogate_min_samples: int = 40,
+                 # robust mode
+                 scenarios: Optional[Sequence["Scenario"]] = None,
+                 aggregate: str = "mean",
+                 cvar_alpha: float = 0.25,
+                 race: bool = True,
+                 workers: int = 1,
+                 telemetry: Optional["Telemetry"] = None,
+                 operator_selection: str = "uniform",
                  # legacy alias
                  max_iterations: int = 0):
+        if prune not in PRUNE_MODES:
+            raise ValueError(f"Unknown prune mode: {prune}. Choose from: {list(PRUNE_MODES)}")
+        if operator_selection not in OPERATOR_SELECTION:
+            raise ValueError(f"Unknown operator selection: {operator_selection}. "
+                             f"Choose from: {list(OPERATOR_SELECTION)}")
         self.goal = goal
         self.map_config = map_config
         self.duration = duration
+        self.catalog = catalog
+        self.prune = prune
+        self.surrogate_ratio = surrogate_ratio
+        self._surrogate = None
+        if surrogate_ratio > 1:
+            from bar_sim.surrogate import SurrogateModel
+            self._surrogate = SurrogateModel(min_samples=surrogate_min_samples)
         self.rng = random.Random(seed)
         self.verbose = verbose
+        self.telemetry = telemetry
+        adaptive = operator_selection == "adaptive"
+        self.mutation_ops = OperatorSelector(MUTATIONS, adaptive)
+        self.crossover_ops = OperatorSelector(CROSSOVERS, adaptive, weights=(0.7, 0.3))
+        self._lineage: Dict[int, Tuple[List[int], List[int], float]] = {}
 
         self.population_size = population_size
         self.max_generations = max_generations if max_iterations == 0 else max_iterations
@@ -530,25 +839,76 @@ class Optimizer:
         self.hyper_mutation_rate = hyper_mutation_rate
 
         self.history: List[float] = []
+        self.eval_stats = EvalStats()
+        self._robust = None
+        if scenarios:
+            from bar_sim.robust import RobustEvaluator
+            self._robust = RobustEvaluator(goal, scenarios, duration,
+                                           aggregate=aggregate, cvar_alpha=cvar_alpha,
+                                           race=race, workers=workers, catalog=catalog)
+            self.eval_stats = self._robust.eval_stats
+
+        # Run state (see start / step)
+        self.population: List[Individual] = []
+        self.best_score = goal.worst_score
+        self.best_bo: Optional[BuildOrder] = None
+        self.gen_best_score = goal.worst_score
+        self.generation = 0
+        self.mutation_rate = mutation_rate
+        self.stagnation = 0
+        self.catastrophe_count = 0
 
     # ------------------------------------------------------------------
     # Evaluation
     # ------------------------------------------------------------------
 
-    def _evaluate(self, bo: BuildOrder) -> float:
-        try:
-            engine = SimulationEngine(bo, self.duration)
-            result = engine.run()
-            return self.goal.score(result)
-        except Exception:
-            return self.goal.worst_score
+    def _evaluate(self, bo: BuildOrder, threshold: Optional[float] = None) -> float:
+        pruned = self.eval_stats.pruned
+        score = evaluate_candidate(bo, self.goal, self.duration, threshold,
+                                   catalog=self.catalog, stats=self.eval_stats)
+        # Pruned scores are bounds, not real fitness; keep them out of the model
+        if self._surrogate is not None and self.eval_stats.pruned == pruned:
+            self._surrogate.observe(bo, score)
+        return score
+
+    def _evaluate_all(self, bos: List[BuildOrder],
+                      threshold: Optional[float] = None) -> List[float]:
+        """Score a batch of candidates (raced across scenarios in robust mode)."""
+        with self._timing("sim"):
+            if self._robust is None:
+                return [self._evaluate(bo, threshold) for bo in bos]
+            results = self._robust.evaluate_many(bos)
+        if self._surrogate is not None:
+            for bo, (score, complete) in zip(bos, results):
+                if complete:
+                    self._surrogate.observe(bo, score)
+        return [score for score, _ in results]
+
+    def _prune_threshold(self, pop: List[Individual]) -> Optional[float]:
+        """Score a new child must be able to beat (pop sorted best-first).
+
+        Pruned and failed runs score worst_score; they're skipped so one of
+        them at the bottom doesn't switch pruning off for a generation.
+        """
+        if self.prune == "population":
+            scored = [score for score, _ in pop if math.isfinite(score)]
+            return scored[-1] if scored else None
+        if self.prune == "elite" and self.elitism_count > 0:
+            score = pop[self.elitism_count - 1][0]
+            return score if math.isfinite(score) else None
+        return None
 
     # ------------------------------------------------------------------
     # Population initialization
     # ------------------------------------------------------------------
 
     def _init_population(self, initial_bo: Optional[BuildOrder]) -> List[Individual]:
-        pop: List[Individual] = []
+        with self._timing("operator"):
+            bos = self._seed_population(initial_bo)
+        return list(zip(self._evaluate_all(bos), bos))
+
+    def _seed_population(self, initial_bo: Optional[BuildOrder]) -> List[BuildOrder]:
+        bos: List[BuildOrder] = []
 
         # Heuristic seeds (1/3 of population)
         n_heuristic = self.population_size // 3
@@ -558,171 +918,375 @@ class Optimizer:
             for _ in range(self.rng.randint(0, 3)):
                 mut = self.rng.choice(MUTATIONS)
                 bo = mut(bo, self.rng)
-            bo = enforce_constraints(bo, self.map_config)
-            score = self._evaluate(bo)
-            pop.append((score, bo))
+            bos.append(enforce_constraints(bo, self.map_config))
 
         # If user provided an initial BO, seed several variants
         if initial_bo is not None:
             bo = copy.deepcopy(initial_bo)
-            bo = enforce_constraints(bo, self.map_config)
-            score = self._evaluate(bo)
-            pop.append((score, bo))
+            bos.append(enforce_constraints(bo, self.map_config))
             # Mutated variants of the provided BO
             for _ in range(min(5, self.population_size // 6)):
                 variant = copy.deepcopy(initial_bo)
                 for _ in range(self.rng.randint(1, 4)):
                     mut = self.rng.choice(MUTATIONS)
                     variant = mut(variant, self.rng)
-                variant = enforce_constraints(variant, self.map_config)
-                score = self._evaluate(variant)
-                pop.append((score, variant))
+                bos.append(enforce_constraints(variant, self.map_config))
 
         # Fill remaining with random seeds
-        while len(pop) < self.population_size:
+        while len(bos) < self.population_size:
             bo = random_seed(self.map_config, self.rng)
-            bo = enforce_constraints(bo, self.map_config)
-            score = self._evaluate(bo)
-            pop.append((score, bo))
+            bos.append(enforce_constraints(bo, self.map_config))
 
-        return pop[:self.population_size]
+        return bos[:self.population_size]
 
     # ------------------------------------------------------------------
     # Selection
     # ------------------------------------------------------------------
 
-    def _tournament_select(self, pop: List[Individual]) -> BuildOrder:
-        """Pick tournament_size individuals, return the best one's BO."""
+    def _tournament_select(self, pop: List[Individual]) -> Individual:
+        """Pick tournament_size individuals, return a copy of the best one."""
         candidates = self.rng.sample(pop, min(self.tournament_size, len(pop)))
         if self.goal.higher_is_better:
             best = max(candidates, key=lambda x: x[0])
         else:
             best = min(candidates, key=lambda x: x[0])
-        return copy.deepcopy(best[1])
+        return best[0], copy.deepcopy(best[1])
 
     # ------------------------------------------------------------------
     # Main loop
     # ------------------------------------------------------------------
 
-    def optimize(self, initial_bo: Optional[BuildOrder] = None) -> BuildOrder:
-        """Run the genetic algorithm. Returns the best build order found."""
-        t0 = time.time()
-
-        if self.verbose:
-            print(f"Initializing population ({self.population_size})...")
+    def optimize(self, initial_bo: Optional[BuildOrder] = None,
+                 progress_callback: Optional[Callable[[dict], Optional[bool]]] = None,
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_every: int = 10,
+                 resume: bool = False,
+                 ) -> BuildOrder:
+        """Run the genetic algorithm. Returns the best build order found.
+
+        progress_callback, if given, receives a progress dict after the
+        initial population and after every generation; returning True
+        stops the run early.
+
+        With checkpoint_path, the run state is saved there after the
+        initial population, every `checkpoint_every` generations and at the
+        end. resume=True continues from that checkpoint if it exists
+        (initial_bo is then ignored).
+        """
+        from bar_sim.checkpoint import load_checkpoint, save_checkpoint
 
-        pop = self._init_population(initial_bo)
-        best_score, best_bo = self._best_of(pop)
-        self.history.append(best_score)
+        t0 = time.time()
+        if resume and checkpoint_path and os.path.exists(checkpoint_path):
+            self.load_state_dict(load_checkpoint(checkpoint_path))
+            if self.telemetry is not None:
+                self.telemetry.begin(self.eval_stats.evaluations)
+            if self.verbose:
+                print(f"Resumed from {checkpoint_path} at generation {self.generation}")
+        else:
+            if self.telemetry is not None:
+                self.telemetry.begin()
+            self.start(initial_bo)
+            if checkpoint_path:
+                save_checkpoint(self.state_dict(), checkpoint_path)
+        stopped = self._report(progress_callback)
 
         if self.verbose:
-            print(f"  Initial best: {best_score:.2f}")
+            print(f"  Initial best: {self.best_score:.2f}")
             print(f"\nRunning GA ({self.max_generations} generations, "
                   f"pop={self.population_size}, "
                   f"elite={self.elitism_count}, "
-                  f"tourn={self.tournament_size})...\n")
-
-        mutation_rate = self.base_mutation_rate
-        stagnation = 0
-        catastrophe_count = 0
-
-        for gen in range(self.max_generations):
-            # Sort population
-            if self.goal.higher_is_better:
-                pop.sort(key=lambda x: x[0], reverse=True)
-            else:
-                pop.sort(key=lambda x: x[0])
-
-            gen_best_score = pop[0][0]
-
-            # Track improvement
-            if self.goal.is_better(gen_best_score, best_score):
-                best_score = gen_best_score
-                best_bo = copy.deepcopy(pop[0][1])
-                stagnation = 0
-            else:
-                stagnation += 1
-
-            self.history.append(best_score)
-
-            # Progress reporting
-            if self.verbose and (gen + 1) % 10 == 0:
+                  f"tourn={self.tournament_size}, "
+                  f"prune={self.prune})...\n")
+
+        while not stopped and self.generation < self.max_generations:
+            self.step()
+            if checkpoint_path and self.generation % max(1, checkpoint_every) == 0:
+                save_checkpoint(self.state_dict(), checkpoint_path)
+            if self.verbose and self.generation % 10 == 0:
                 elapsed = time.time() - t0
-                print(f"  Gen {gen+1:>4} | best: {best_score:>8.2f} | "
-                      f"gen_best: {gen_best_score:>8.2f} | "
-                      f"mut: {mutation_rate:.3f} | "
-                      f"stag: {stagnation:>2} | "
+                print(f"  Gen {self.generation:>4} | best: {self.best_score:>8.2f} | "
+                      f"gen_best: {self.gen_best_score:>8.2f} | "
+                      f"mut: {self.mutation_rate:.3f} | "
+                      f"stag: {self.stagnation:>2} | "
+                      f"pruned: {self.eval_stats.pruned:>5} | "
+                      f"sim: {self.eval_stats.sim_fraction:>4.0%} | "
+                      f"{self._surrogate_line()}"
                       f"{elapsed:.1f}s")
+            stopped = self._report(progress_callback)
 
-            # --- Stagnation handling ---
-            if stagnation >= self.catastrophe_limit:
-                # Catastrophic restart: keep only the global best,
-                # regenerate everything else
-                catastrophe_count += 1
-                if self.verbose:
-                    print(f"  *** Catastrophe #{catastrophe_count} at gen {gen+1} "
-                          f"(stagnation={stagnation}) ***")
-                pop = self._init_population(best_bo)
-                mutation_rate = self.base_mutation_rate
-                stagnation = 0
-                continue
-
-            elif stagnation >= self.stagnation_limit:
-                # Hyper-mutation phase
-                mutation_rate = self.hyper_mutation_rate
-            else:
-                # Normal decay
-                mutation_rate = max(0.05, mutation_rate * self.mutation_decay)
-
-            # --- Build next generation ---
-            new_pop: List[Individual] = []
-
-            # Elitism: carry over top N unchanged
-            for i in range(self.elitism_count):
-                new_pop.append(pop[i])
-
-            # Fill rest via selection + crossover + mutation
-            while len(new_pop) < self.population_size:
-                parent1 = self._tournament_select(pop)
-                parent2 = self._tournament_select(pop)
-
-                # Crossover
-                if self.rng.random() < self.crossover_rate:
-                    if self.rng.random() < 0.7:
-                        child1, child2 = _crossover_one_point(parent1, parent2, self.rng)
-                    else:
-                        child1, child2 = _crossover_uniform(parent1, parent2, self.rng)
-                else:
-                    child1, child2 = parent1, parent2
-
-                # Mutation
-                for child in (child1, child2):
-                    if len(new_pop) >= self.population_size:
-                        break
-
-                    if self.rng.random() < mutation_rate:
-                        # Apply 1-3 mutations depending on rate
-                        n_muts = 1 if mutation_rate < 0.6 else self.rng.randint(1, 3)
-                        for _ in range(n_muts):
-                            mut = self.rng.choice(MUTATIONS)
-                            child = mut(child, self.rng)
-
-                    child = enforce_constraints(child, self.map_config)
-                    score = self._evaluate(child)
-                    new_pop.append((score, child))
-
-            pop = new_pop[:self.population_size]
+        if checkpoint_path:
+            save_checkpoint(self.state_dict(), checkpoint_path)
 
         # Final sort and return
         elapsed = time.time() - t0
         if self.verbose:
-            print(f"\nDone in {elapsed:.1f}s. Best score: {best_score:.2f}")
-            if catastrophe_count:
-                print(f"  Catastrophic restarts: {catastrophe_count}")
-
+            print(f"\nDone in {elapsed:.1f}s. Best score: {self.best_score:.2f}")
+            if self.catastrophe_count:
+                print(f"  Catastrophic restarts: {self.catastrophe_count}")
+            print(f"  Evaluations: {self.eval_stats.summary()}")
+            print("  Operators:   " + ", ".join(
+                f"{name} {st['success_rate']:.0%} (p={st['p']:.2f})"
+                for name, st in self.operator_stats().items()))
+            if self._surrogate is not None:
+                st = self._surrogate.stats()
+                print(f"  Surrogate: {st['sims_saved']} simulations saved, "
+                      f"rank correlation {st['surrogate_rho']}")
+            if self._robust is not None:
+                st = self._robust.stats()
+                print(f"  Robust: {st['candidates']} candidates x {st['scenarios']} scenarios "
+                      f"({self._robust.aggregate}), {st['raced_out']} raced out, "
+                      f"{st['race_fraction']:.0%} of scenario runs")
+        if self._robust is not None:
+            self._robust.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+
+        best_bo = copy.deepcopy(self.best_bo)
         best_bo.name = f"Optimized ({self.goal.name})"
         return best_bo
 
+    # ------------------------------------------------------------------
+    # Stepwise API (used by optimize() and the island model)
+    # ------------------------------------------------------------------
+
+    def start(self, initial_bo: Optional[BuildOrder] = None):
+        """Create and score the initial population."""
+        if self.verbose:
+            print(f"Initializing population ({self.population_size})...")
+
+        self.population = self._init_population(initial_bo)
+        self.best_score, self.best_bo = self._best_of(self.population)
+        self.gen_best_score = self.best_score
+        self.history.append(self.best_score)
+        self.generation = 0
+        self.mutation_rate = self.base_mutation_rate
+        self.stagnation = 0
+        self.catastrophe_count = 0
+
+    def step(self):
+        """Advance the population by one generation."""
+        pop = self.population
+        gen = self.generation
+        self.generation += 1
+
+        # Sort population
+        self._sort(pop)
+        self.gen_best_score = pop[0][0]
+
+        # Track improvement
+        if self.goal.is_better(self.gen_best_score, self.best_score):
+            self.best_score = self.gen_best_score
+            self.best_bo = copy.deepcopy(pop[0][1])
+            self.stagnation = 0
+        else:
+            self.stagnation += 1
+
+        self.history.append(self.best_score)
+
+        # --- Stagnation handling ---
+        if self.stagnation >= self.catastrophe_limit:
+            # Catastrophic restart: keep only the global best,
+            # regenerate everything else
+            self.catastrophe_count += 1
+            if self.verbose:
+                print(f"  *** Catastrophe #{self.catastrophe_count} at gen {gen+1} "
+                      f"(stagnation={self.stagnation}) ***")
+            self.population = self._init_population(self.best_bo)
+            self.mutation_rate = self.base_mutation_rate
+            self.stagnation = 0
+            return
+
+        elif self.stagnation >= self.stagnation_limit:
+            # Hyper-mutation phase
+            self.mutation_rate = self.hyper_mutation_rate
+        else:
+            # Normal decay
+            self.mutation_rate = max(0.05, self.mutation_rate * self.mutation_decay)
+        mutation_rate = self.mutation_rate
+
+        # --- Build next generation ---
+        threshold = self._prune_threshold(pop)
+
+        # Elitism: carry over top N unchanged
+        new_pop: List[Individual] = list(pop[:self.elitism_count])
+
+        n_children = self.population_size - len(new_pop)
+        with self._timing("operator"):
+            if self._surrogate is not None and self._surrogate.ready:
+                # Breed extra offspring and only simulate the most promising
+                bred = self._breed(pop, mutation_rate,
+                                   math.ceil(n_children * self.surrogate_ratio))
+                children = self._surrogate.screen(bred, n_children,
+                                                  self.goal.higher_is_better)
+            else:
+                children = self._breed(pop, mutation_rate, n_children)
+
+        scores = self._evaluate_all(children, threshold)
+        self._credit_operators(children, scores)
+        new_pop.extend(zip(scores, children))
+
+        self.population = new_pop[:self.population_size]
+
+    def _breed(self, pop: List[Individual], mutation_rate: float, n: int) -> List[BuildOrder]:
+        """Produce n offspring via selection + crossover + mutation."""
+        children: List[BuildOrder] = []
+        self._lineage = {}
+        while len(children) < n:
+            score1, parent1 = self._tournament_select(pop)
+            score2, parent2 = self._tournament_select(pop)
+
+            # Crossover
+            if self.rng.random() < self.crossover_rate:
+                xo = [self.crossover_ops.pick(self.rng)]
+                child1, child2 = self.crossover_ops.operators[xo[0]](parent1, parent2, self.rng)
+                better = score1 if self.goal.is_better(score1, score2) else score2
+                refs = (better, better)
+            else:
+                xo = []
+                child1, child2 = parent1, parent2
+                refs = (score1, score2)
+
+            # Mutation
+            for child, ref in zip((child1, child2), refs):
+                if len(children) >= n:
+                    break
+
+                muts = []
+                if self.rng.random() < mutation_rate:
+                    # Apply 1-3 mutations depending on rate
+                    n_muts = 1 if mutation_rate < 0.6 else self.rng.randint(1, 3)
+                    for _ in range(n_muts):
+                        muts.append(self.mutation_ops.pick(self.rng))
+                        child = self.mutation_ops.operators[muts[-1]](child, self.rng)
+
+                child = enforce_constraints(child, self.map_config)
+                self._lineage[id(child)] = (xo, muts, ref)
+                children.append(child)
+        return children
+
+    def _credit_operators(self, children: List[BuildOrder], scores: List[float]):
+        """Reward the operators behind each child with its relative gain."""
+        sign = 1 if self.goal.higher_is_better else -1
+        for child, score in zip(children, scores):
+            xo, muts, ref = self._lineage.get(id(child), ((), (), None))
+            if ref is None or not (xo or muts):
+                continue
+            gain = sign * (score - ref) / max(abs(ref), 1e-9)
+            reward = gain if math.isfinite(gain) and gain > 0 else 0.0
+            self.crossover_ops.credit(xo, reward)
+            self.mutation_ops.credit(muts, reward)
+        self._lineage = {}
+
+    def operator_stats(self) -> Dict[str, dict]:
+        """Uses, success rate, mean relative gain and current probability per operator."""
+        return {**self.crossover_ops.stats(), **self.mutation_ops.stats()}
+
+    def state_dict(self) -> dict:
+        """Everything needed to continue this run exactly where it stopped."""
+        return {
+            "goal": self.goal.name,
+            "population_size": self.population_size,
+            "population": self.population,
+            "best_score": self.best_score,
+            "best_bo": self.best_bo,
+            "gen_best_score": self.gen_best_score,
+            "generation": self.generation,
+            "mutation_rate": self.mutation_rate,
+            "stagnation": self.stagnation,
+            "catastrophe_count": self.catastrophe_count,
+            "history": self.history,
+            "eval_stats": self.eval_stats,
+            "rng": self.rng.getstate(),
+            "operators": (self.crossover_ops.state_dict(), self.mutation_ops.state_dict()),
+            "surrogate": self._surrogate,
+            "robust": (self._robust.candidates, self._robust.raced_out)
+                      if self._robust is not None else None,
+        }
+
+    def load_state_dict(self, state: dict):
+        """Restore a run saved by state_dict() (see checkpoint.py)."""
+        if state["goal"] != self.goal.name:
+            raise ValueError(f"Checkpoint is for goal {state['goal']!r}, "
+                             f"not {self.goal.name!r}")
+        self.population = state["population"]
+        self.best_score = state["best_score"]
+        self.best_bo = state["best_bo"]
+        self.gen_best_score = state["gen_best_score"]
+        self.generation = state["generation"]
+        self.mutation_rate = state["mutation_rate"]
+        self.stagnation = state["stagnation"]
+        self.catastrophe_count = state["catastrophe_count"]
+        self.history = state["history"]
+        self.eval_stats = state["eval_stats"]
+        self.rng.setstate(state["rng"])
+        if state.get("operators") is not None:
+            self.crossover_ops.load_state_dict(state["operators"][0])
+            self.mutation_ops.load_state_dict(state["operators"][1])
+        if self._surrogate is not None and state["surrogate"] is not None:
+            self._surrogate = state["surrogate"]
+        if self._robust is not None:
+            self._robust.eval_stats = self.eval_stats
+            if state["robust"] is not None:
+                self._robust.candidates, self._robust.raced_out = state["robust"]
+
+    def progress(self) -> dict:
+        """Snapshot of the run state for progress reporting."""
+        info = {
+            "generation": self.generation,
+            "best_score": self.best_score,
+            "gen_best": self.gen_best_score,
+            "mutation_rate": self.mutation_rate,
+            "stagnation": self.stagnation,
+            "total_generations": self.max_generations,
+            **self.eval_stats.as_dict(),
+        }
+        if self._surrogate is not None:
+            info.update(self._surrogate.stats())
+        if self._robust is not None:
+            info.update(self._robust.stats())
+        return info
+
+    def _report(self, progress_callback) -> bool:
+        """Emit telemetry and progress; True if the callback asks to stop."""
+        info = self.progress()
+        if self.telemetry is not None:
+            from bar_sim.telemetry import queue_edit_distance, queue_genotype
+            info["telemetry"] = self.telemetry.record(
+                self.generation, self.eval_stats, self.best_score,
+                genotypes=[queue_genotype(bo) for _, bo in self.population],
+                distance=queue_edit_distance,
+                population_size=self.population_size,
+                mutation_rate=round(self.mutation_rate, 4),
+                stagnation=self.stagnation,
+                operators=self.operator_stats(),
+            )
+        return bool(progress_callback and progress_callback(info))
+
+    def current_best(self) -> Individual:
+        """Best individual so far, including the not-yet-ranked latest generation."""
+        if not self.population:
+            return self.best_score, self.best_bo
+        score, bo = self._best_of(self.population)
+        if self.goal.is_better(score, self.best_score):
+            return score, bo
+        return self.best_score, copy.deepcopy(self.best_bo)
+
+    def emigrants(self, n: int) -> List[Individual]:
+        """Copies of the n best individuals, for migration to another island."""
+        self._sort(self.population)
+        return [(score, copy.deepcopy(bo)) for score, bo in self.population[:n]]
+
+    def immigrate(self, individuals: List[Individual]):
+        """Replace the worst members of the population with migrants."""
+        if not individuals:
+            return
+        self._sort(self.population)
+        keep = max(0, len(self.population) - len(individuals))
+        self.population = self.population[:keep] + list(individuals)
+        for score, bo in individuals:
+            if self.goal.is_better(score, self.best_score):
+                self.best_score, self.best_bo = score, copy.deepcopy(bo)
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -734,17 +1298,57 @@ class Optimizer:
             best = min(pop, key=lambda x: x[0])
         return best[0], copy.deepcopy(best[1])
 
+    def _timing(self, bucket: str):
+        return self.telemetry.timing(bucket) if self.telemetry is not None else nullcontext()
+
+    def _surrogate_line(self) -> str:
+        if self._surrogate is None:
+            return ""
+        rho = self._surrogate.stats()["surrogate_rho"]
+        return f"rho: {rho if rho is not None else '-':>6} | "
+
+    def _sort(self, pop: List[Individual]):
+        """Sort in place, best first."""
+        pop.sort(key=lambda x: x[0], reverse=self.goal.higher_is_better)
+
 
 # ---------------------------------------------------------------------------
 # Strategy Optimizer
 # ---------------------------------------------------------------------------
 
+# StrategyConfig fields the Python engine actually reads (strategy.py opening
+# generation, production.py and econ_ctrl.py). posture, t2_timing,
+# econ_army_balance and attack_strategy only drive the Lua widget, so configs
+# differing only in those simulate identically.
+SIM_STRATEGY_FIELDS = ("opening_mex_count", "energy_strategy", "unit_composition",
+                       "role", "emergency_mode")
+
+STRATEGY_BACKENDS = ("ga", "exhaustive", "halving")
+
+
+def strategy_sim_key(config) -> tuple:
+    """Canonical key of a StrategyConfig as far as the simulation is concerned."""
+    return tuple(getattr(config, f) for f in SIM_STRATEGY_FIELDS)
+
+
 class StrategyOptimizer:
     """
-    Genetic Algorithm optimizer for StrategyConfig parameters.
+    Search over StrategyConfig parameters.
+
+    Instead of evolving build queues, searches strategy configs and lets the
+    dynamic decision system generate the build orders. Backends:
+
+    - "ga": tournament GA on the flattened genome (the original search)
+    - "exhaustive": simulate every distinct config once (192 of them)
+    - "halving": successive halving over the same configs, using simulated
+      duration as the budget (1/eta of the configs survive each rung)
 
-    Instead of evolving build queues, evolves strategy configs and lets the
-    dynamic decision system generate the build orders.
+    All backends deduplicate through a cache keyed on the fields the
+    simulation reads, so genomes that collapse to the same config (or only
+    differ in widget-only fields) are simulated once.
+
+    With a Telemetry, a record is emitted per GA generation / halving rung
+    (once for exhaustive), including the cache hit rate.
 
     Genome: StrategyConfig flattened to a vector of enum indices + integers.
     """
@@ -753,15 +1357,29 @@ class StrategyOptimizer:
                  duration: int = 600, seed: int = 42,
                  population_size: int = 40,
                  max_generations: int = 80,
-                 verbose: bool = True):
+                 verbose: bool = True,
+                 catalog: Optional[UnitCatalog] = None,
+                 backend: str = "ga",
+                 eta: int = 3,
+                 telemetry: Optional["Telemetry"] = None):
+        if backend not in STRATEGY_BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}. "
+                             f"Choose from: {list(STRATEGY_BACKENDS)}")
         self.goal = goal
         self.map_config = map_config
         self.duration = duration
+        self.catalog = catalog
         self.rng = random.Random(seed)
         self.verbose = verbose
         self.population_size = population_size
         self.max_generations = max_generations
+        self.backend = backend
+        self.eta = max(2, eta)
         self.history: List[float] = []
+        self.eval_stats = EvalStats()
+        self._cache: Dict[tuple, float] = {}
+        self.cache_hits = 0
+        self.telemetry = telemetry
 
     def _config_to_genome(self, config) -> List[int]:
         """Flatten StrategyConfig to integer vector."""
@@ -786,12 +1404,6 @@ class StrategyOptimizer:
             StrategyConfig, EnergyStrategy, UnitComposition, Posture, T2Timing,
             Role, AttackStrategy, EmergencyMode,
         )
-        enums = [
-            list(EnergyStrategy),
-            list(UnitComposition),
-            list(Posture),
-            list(T2Timing),
-        ]
         return StrategyConfig(
             opening_mex_count=max(1, min(4, genome[0])),
             energy_strategy=list(EnergyStrategy)[genome[1] % len(EnergyStrategy)],
@@ -803,20 +1415,61 @@ class StrategyOptimizer:
             attack_strategy=list(AttackStrategy)[genome[7] % len(AttackStrategy)],
         )
 
-    def _evaluate(self, config) -> float:
-        try:
-            bo = BuildOrder(
-                name="StratOpt",
-                map_config=copy.deepcopy(self.map_config),
-                strategy_config=config,
-            )
-            engine = SimulationEngine(bo, self.duration)
-            result = engine.run()
-            return self.goal.score(result)
-        except Exception:
-            return self.goal.worst_score
+    @staticmethod
+    def candidate_configs() -> list:
+        """Every config the simulation can tell apart.
+
+        Widget-only fields keep their defaults; emergency mode is not part
+        of the search.
+        """
+        from itertools import product
+        from bar_sim.strategy import StrategyConfig, EnergyStrategy, UnitComposition, Role
+        return [
+            StrategyConfig(opening_mex_count=mex, energy_strategy=energy,
+                           unit_composition=comp, role=role)
+            for mex, energy, comp, role in product(
+                range(1, 5), EnergyStrategy, UnitComposition, Role)
+        ]
+
+    def _evaluate(self, config, duration: Optional[int] = None) -> float:
+        duration = duration or self.duration
+        key = (strategy_sim_key(config), duration)
+        if key in self._cache:
+            self.cache_hits += 1
+            return self._cache[key]
+        bo = BuildOrder(
+            name="StratOpt",
+            map_config=copy.deepcopy(self.map_config),
+            strategy_config=config,
+        )
+        with self._timing("sim"):
+            score = evaluate_candidate(bo, self.goal, duration,
+                                       catalog=self.catalog, stats=self.eval_stats)
+        self._cache[key] = score
+        return score
+
+    def _timing(self, bucket: str):
+        return self.telemetry.timing(bucket) if self.telemetry is not None else nullcontext()
+
+    def _record(self, generation: int, best_score: float,
+                genomes: Optional[List[List[int]]] = None, **extra):
+        if self.telemetry is None:
+            return
+        from bar_sim.telemetry import hamming_distance
+        self.telemetry.record(
+            generation, self.eval_stats, best_score,
+            genotypes=[tuple(g) for g in genomes] if genomes is not None else None,
+            distance=hamming_distance,
+            cache_hits=self.cache_hits,
+            cache_lookups=self.cache_hits + len(self._cache),
+            backend=self.backend, **extra)
 
     def _mutate_genome(self, genome: List[int]) -> List[int]:
+        from bar_sim.strategy import (
+            EnergyStrategy, UnitComposition, Posture, T2Timing, Role, AttackStrategy,
+        )
+        sizes = {1: len(EnergyStrategy), 2: len(UnitComposition), 3: len(Posture),
+                 4: len(T2Timing), 6: len(Role), 7: len(AttackStrategy)}
         g = list(genome)
         idx = self.rng.randint(0, len(g) - 1)
         if idx == 0:
@@ -824,7 +1477,7 @@ class StrategyOptimizer:
         elif idx == 5:
             g[idx] = max(0, min(100, g[idx] + self.rng.randint(-15, 15)))
         else:
-            g[idx] = self.rng.randint(0, 10)  # will be clamped by modulo
+            g[idx] = self.rng.randrange(sizes[idx])
         return g
 
     def _crossover_genomes(self, g1: List[int], g2: List[int]) -> List[int]:
@@ -834,11 +1487,61 @@ class StrategyOptimizer:
         return child
 
     def optimize(self) -> "StrategyConfig":
-        """Run the strategy GA. Returns the best StrategyConfig found."""
-        from bar_sim.strategy import StrategyConfig
-
+        """Run the configured search. Returns the best StrategyConfig found."""
         t0 = time.time()
+        if self.telemetry is not None:
+            self.telemetry.begin()
+        if self.backend == "exhaustive":
+            best_score, best_config = self._search_exhaustive()
+        elif self.backend == "halving":
+            best_score, best_config = self._search_halving()
+        else:
+            best_score, best_config = self._search_ga(t0)
+
+        if self.verbose:
+            elapsed = time.time() - t0
+            print(f"\nDone in {elapsed:.1f}s. Best: {best_score:.2f}")
+            print(f"  Config: {best_config.summary()}")
+            print(f"  Simulations: {self.eval_stats.evaluations} "
+                  f"({self.cache_hits} duplicate configs served from cache)")
+            print(f"  Evaluations: {self.eval_stats.summary()}")
+        if self.telemetry is not None:
+            self.telemetry.close()
+        return best_config
 
+    def _search_exhaustive(self):
+        best = None
+        for config in self.candidate_configs():
+            score = self._evaluate(config)
+            if best is None or self.goal.is_better(score, best[0]):
+                best = (score, config)
+            self.history.append(best[0])
+        self._record(0, best[0])
+        if self.verbose:
+            print(f"  Exhaustive: {len(self._cache)} configs")
+        return best
+
+    def _search_halving(self):
+        """Successive halving with simulated ticks as the budget."""
+        configs = self.candidate_configs()
+        rungs = 1
+        while self.duration // self.eta ** rungs >= HALVING_MIN_TICKS:
+            rungs += 1
+        budgets = [self.duration // self.eta ** k for k in reversed(range(rungs))]
+
+        for rung, budget in enumerate(budgets):
+            scored = [(self._evaluate(c, budget), c) for c in configs]
+            scored.sort(key=lambda x: x[0], reverse=self.goal.higher_is_better)
+            self.history.append(scored[0][0])
+            self._record(rung, scored[0][0], budget=budget, configs=len(configs))
+            if self.verbose:
+                print(f"  Rung {budget:>5}s: {len(configs):>4} configs | "
+                      f"best: {scored[0][0]:>8.2f}")
+            if budget == budgets[-1]:
+                return scored[0]
+            configs = [c for _, c in scored[:max(1, math.ceil(len(scored) / self.eta))]]
+
+    def _search_ga(self, t0: float):
         # Init population
         pop = []
         for _ in range(self.population_size):
@@ -861,6 +1564,7 @@ class StrategyOptimizer:
         else:
             pop.sort(key=lambda x: x[0])
         best_score, best_genome = pop[0][0], list(pop[0][1])
+        self._record(0, best_score, [g for _, g in pop])
 
         if self.verbose:
             print(f"  Initial best: {best_score:.2f}")
@@ -881,11 +1585,11 @@ class StrategyOptimizer:
                 else:
                     p2 = min(t, key=lambda x: x[0])[1]
 
-                child = self._crossover_genomes(p1, p2)
-                if self.rng.random() < 0.5:
-                    child = self._mutate_genome(child)
-
-                config = self._genome_to_config(child)
+                with self._timing("operator"):
+                    child = self._crossover_genomes(p1, p2)
+                    if self.rng.random() < 0.5:
+                        child = self._mutate_genome(child)
+                    config = self._genome_to_config(child)
                 score = self._evaluate(config)
                 new_pop.append((score, child))
 
@@ -900,27 +1604,28 @@ class StrategyOptimizer:
                 best_genome = list(pop[0][1])
 
             self.history.append(best_score)
+            self._record(gen + 1, best_score, [g for _, g in pop])
 
             if self.verbose and (gen + 1) % 10 == 0:
                 elapsed = time.time() - t0
-                print(f"  Gen {gen+1:>4} | best: {best_score:>8.2f} | {elapsed:.1f}s")
+                print(f"  Gen {gen+1:>4} | best: {best_score:>8.2f} | "
+                      f"sims: {self.eval_stats.evaluations:>5} | {elapsed:.1f}s")
 
-        best_config = self._genome_to_config(best_genome)
-        if self.verbose:
-            elapsed = time.time() - t0
-            print(f"\nDone in {elapsed:.1f}s. Best: {best_score:.2f}")
-            print(f"  Config: {best_config.summary()}")
-        return best_config
+        return best_score, self._genome_to_config(best_genome)
 
 
 # Strategy-mode goals for make_goal
 def make_strategy_goal(goal_name: str, target_time: int = 300) -> OptGoal:
     """Create an optimization goal suitable for StrategyOptimizer."""
+    past_target = lambda r, t: t >= target_time
     goals = {
         "best_composition": OptGoal(
             name="best_composition",
             description=f"Maximize army value * role diversity at {target_time}s",
             score_fn=lambda r: _composition_score(r, target_time),
+            settled_fn=past_target,
+            snapshot_fields=("army_value_metal", "army_by_role"),
+            target_time=target_time,
         ),
         "fastest_goal": OptGoal(
             name="fastest_goal",
@@ -928,24 +1633,29 @@ def make_strategy_goal(goal_name: str, target_time: int = 300) -> OptGoal:
             score_fn=lambda r: (r.goal_completions[0][0]
                                 if r.goal_completions else 9999),
             higher_is_better=False,
+            snapshot_fields=(),
         ),
         "max_eco_strat": OptGoal(
             name="max_eco_strat",
             description=f"Maximize metal income at {target_time}s via strategy",
-            score_fn=lambda r: (_snap_at(r, target_time).metal_income
-                                if _snap_at(r, target_time) else 0),
+            score_fn=lambda r: _snap_value(r, target_time, "metal_income"),
+            settled_fn=past_target,
+            snapshot_fields=("metal_income",),
+            target_time=target_time,
         ),
     }
     if goal_name not in goals:
         raise ValueError(f"Unknown strategy goal: {goal_name}. "
                          f"Choose from: {list(goals.keys())}")
-    return goals[goal_name]
+    goal = goals[goal_name]
+    goal._recipe = (make_strategy_goal, (goal_name, target_time))
+    return goal
 
 
 def _composition_score(result: SimResult, target_time: int) -> float:
     """Score: army_value * (1 + diversity_bonus).
     Diversity = number of distinct roles present / max roles."""
-    snap = _snap_at(result, target_time)
+    snap = result.snapshot_at(target_time)
     if not snap:
         return 0
     army_value = snap.army_value_metal
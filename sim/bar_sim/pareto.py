@@ -0,0 +1,319 @@
+"""
+BAR Build Order Simulator - Multi-Objective (Pareto) Optimizer
+================================================================
+NSGA-II over several OptGoals at once (e.g. fastest factory vs. metal at
+T vs. stall seconds) instead of hand-weighting them into one number the
+way the "balanced" goal does.
+
+Every candidate is simulated once per scenario and all objectives are read
+from that same SimResult, so extra objectives cost no extra simulations.
+Offspring are scored a generation at a time, in a process pool when
+workers > 1, optionally over robust.py scenarios (each objective is
+aggregated separately).
+
+The result is the first non-dominated front; save_front() writes one
+build order YAML per trade-off point.
+"""
+
+import copy
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from bar_sim.econ import UnitCatalog
+from bar_sim.engine import SimulationEngine
+from bar_sim.models import BuildOrder, MapConfig
+from bar_sim.optimizer import (
+    MUTATIONS, EvalStats, OptGoal, _crossover_one_point, _crossover_uniform,
+    enforce_constraints, greedy_seed, random_seed, score_only_config,
+)
+
+# One score per goal, in goal order
+Objectives = Tuple[float, ...]
+ParetoPoint = Tuple[Objectives, BuildOrder]
+
+
+def evaluate_objectives(bo: BuildOrder, goals: Sequence[OptGoal], duration: int,
+                        catalog: Optional[UnitCatalog] = None,
+                        stats: Optional[EvalStats] = None,
+                        seed: int = 42) -> Objectives:
+    """Simulate `bo` once and score it on every goal.
+
+    The run stops early once every goal is settled.
+    """
+    stats = stats if stats is not None else EvalStats()
+    stats.evaluations += 1
+    stats.ticks_budget += duration
+    engine = SimulationEngine(bo, duration, seed=seed, catalog=catalog,
+                              snapshot_config=score_only_config(goals))
+    try:
+        if all(g.settled_fn for g in goals):
+            for event in engine.iter_run():
+                if event.kind == "snapshot" and all(
+                        g.is_settled(engine.result, event.tick) for g in goals):
+                    stats.settled += 1
+                    break
+            result = engine.finish()
+        else:
+            result = engine.run()
+        return tuple(g.score(result) for g in goals)
+    except Exception:
+        return tuple(g.worst_score for g in goals)
+    finally:
+        stats.ticks_simulated += engine.state.tick
+
+
+def _score(bo: BuildOrder, goals: Sequence[OptGoal], duration: int,
+           catalog: Optional[UnitCatalog], scenarios, aggregate: str,
+           cvar_alpha: float) -> Tuple[Objectives, EvalStats]:
+    stats = EvalStats()
+    if not scenarios:
+        return evaluate_objectives(bo, goals, duration, catalog, stats), stats
+    from bar_sim.robust import aggregate_scores
+    runs = [evaluate_objectives(replace(bo, map_config=s.map_config), goals, duration,
+                                catalog, stats, seed=s.seed)
+            for s in scenarios]
+    return tuple(aggregate_scores([r[k] for r in runs], g, aggregate, cvar_alpha)
+                 for k, g in enumerate(goals)), stats
+
+
+# ---------------------------------------------------------------------------
+# Non-dominated sorting
+# ---------------------------------------------------------------------------
+
+def dominates(a: Objectives, b: Objectives, goals: Sequence[OptGoal]) -> bool:
+    """a is at least as good as b on every goal and better on one."""
+    strictly = False
+    for x, y, g in zip(a, b, goals):
+        if g.is_better(y, x):
+            return False
+        if g.is_better(x, y):
+            strictly = True
+    return strictly
+
+
+def non_dominated_sort(points: Sequence[Objectives],
+                       goals: Sequence[OptGoal]) -> List[List[int]]:
+    """Deb's fast non-dominated sort. Returns fronts of indices, best first."""
+    n = len(points)
+    dominated_by: List[List[int]] = [[] for _ in range(n)]
+    counts = [0] * n
+    for i in range(n):
+        for j in range(i + 1, n):
+            if dominates(points[i], points[j], goals):
+                dominated_by[i].append(j)
+                counts[j] += 1
+            elif dominates(points[j], points[i], goals):
+                dominated_by[j].append(i)
+                counts[i] += 1
+    fronts = [[i for i in range(n) if counts[i] == 0]]
+    while fronts[-1]:
+        nxt = []
+        for i in fronts[-1]:
+            for j in dominated_by[i]:
+                counts[j] -= 1
+                if counts[j] == 0:
+                    nxt.append(j)
+        fronts.append(nxt)
+    return fronts[:-1]
+
+
+def crowding_distance(points: Sequence[Objectives], front: Sequence[int]) -> Dict[int, float]:
+    """NSGA-II crowding distance of each member of `front`."""
+    dist = {i: 0.0 for i in front}
+    if len(front) <= 2:
+        return {i: math.inf for i in front}
+    for k in range(len(points[front[0]])):
+        ordered = sorted(front, key=lambda i: points[i][k])
+        lo, hi = points[ordered[0]][k], points[ordered[-1]][k]
+        dist[ordered[0]] = dist[ordered[-1]] = math.inf
+        span = hi - lo
+        if span == 0 or not math.isfinite(span):
+            continue
+        for a, i, b in zip(ordered, ordered[1:], ordered[2:]):
+            dist[i] += (points[b][k] - points[a][k]) / span
+    return dist
+
+
+# ---------------------------------------------------------------------------
+# NSGA-II
+# ---------------------------------------------------------------------------
+
+class ParetoOptimizer:
+    """
+    NSGA-II build order optimizer over several goals.
+
+    Uses the single-objective GA's seeds, mutations and crossovers;
+    selection is binary tournament on (front rank, crowding distance) and
+    survival is elitist over parents + offspring.
+    """
+
+    def __init__(self, goals: Sequence[OptGoal], map_config: MapConfig,
+                 duration: int = 600, seed: int = 42,
+                 population_size: int = 60,
+                 max_generations: int = 100,
+                 mutation_rate: float = 0.4,
+                 crossover_rate: float = 0.7,
+                 scenarios=None,
+                 aggregate: str = "mean",
+                 cvar_alpha: float = 0.25,
+                 workers: int = 1,
+                 catalog: Optional[UnitCatalog] = None,
+                 verbose: bool = True):
+        if len(goals) < 2:
+            raise ValueError("ParetoOptimizer needs at least two goals")
+        self.goals = list(goals)
+        self.map_config = map_config
+        self.duration = duration
+        self.rng = random.Random(seed)
+        self.population_size = population_size
+        self.max_generations = max_generations
+        self.mutation_rate = mutation_rate
+        self.crossover_rate = crossover_rate
+        self.scenarios = list(scenarios) if scenarios else None
+        self.aggregate = aggregate
+        self.cvar_alpha = cvar_alpha
+        self.workers = max(1, workers)
+        self.catalog = catalog
+        self.verbose = verbose
+
+        self.history: List[int] = []  # size of the first front per generation
+        self.eval_stats = EvalStats()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def optimize(self, initial_bo: Optional[BuildOrder] = None) -> List[ParetoPoint]:
+        """Run NSGA-II. Returns the final non-dominated front."""
+        t0 = time.time()
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            pop = self._init_population(initial_bo)
+            for gen in range(self.max_generations):
+                points = [p for p, _ in pop]
+                rank, crowd = self._rank(points)
+                children = self._breed(pop, rank, crowd)
+                pop = self._survivors(pop + list(zip(self._evaluate_all(children), children)))
+
+                if self.verbose and (gen + 1) % 10 == 0:
+                    print(f"  Gen {gen+1:>4} | front: {self.history[-1]:>3} | "
+                          f"sims: {self.eval_stats.evaluations:>6} | "
+                          f"{time.time() - t0:.1f}s")
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+        front = self.front(pop)
+        if self.verbose:
+            print(f"\nDone in {time.time() - t0:.1f}s. Front: {len(front)} build orders")
+            print(f"  Evaluations: {self.eval_stats.summary()}")
+        return front
+
+    def front(self, pop: Sequence[ParetoPoint]) -> List[ParetoPoint]:
+        """Distinct non-dominated members of `pop`, best first on the first goal."""
+        points = [p for p, _ in pop]
+        seen = set()
+        front = []
+        for i in non_dominated_sort(points, self.goals)[0]:
+            if points[i] not in seen:
+                seen.add(points[i])
+                front.append((points[i], copy.deepcopy(pop[i][1])))
+        front.sort(key=lambda x: x[0][0], reverse=self.goals[0].higher_is_better)
+        return front
+
+    # ------------------------------------------------------------------
+
+    def _evaluate_all(self, bos: Sequence[BuildOrder]) -> List[Objectives]:
+        args = (self.goals, self.duration, self.catalog, self.scenarios,
+                self.aggregate, self.cvar_alpha)
+        if self._pool is None:
+            results = [_score(bo, *args) for bo in bos]
+        else:
+            results = [f.result() for f in [self._pool.submit(_score, bo, *args) for bo in bos]]
+        for _, st in results:
+            self.eval_stats.merge(st)
+        return [objectives for objectives, _ in results]
+
+    def _init_population(self, initial_bo: Optional[BuildOrder]) -> List[ParetoPoint]:
+        bos: List[BuildOrder] = []
+        if initial_bo is not None:
+            bos.append(enforce_constraints(copy.deepcopy(initial_bo), self.map_config))
+        for _ in range(self.population_size // 3):
+            bo = greedy_seed(self.map_config, self.duration)
+            for _ in range(self.rng.randint(0, 3)):
+                bo = self.rng.choice(MUTATIONS)(bo, self.rng)
+            bos.append(enforce_constraints(bo, self.map_config))
+        while len(bos) < self.population_size:
+            bos.append(enforce_constraints(random_seed(self.map_config, self.rng),
+                                           self.map_config))
+        bos = bos[:self.population_size]
+        return list(zip(self._evaluate_all(bos), bos))
+
+    def _rank(self, points: Sequence[Objectives]):
+        rank: Dict[int, int] = {}
+        crowd: Dict[int, float] = {}
+        for r, front in enumerate(non_dominated_sort(points, self.goals)):
+            for i in front:
+                rank[i] = r
+            crowd.update(crowding_distance(points, front))
+        return rank, crowd
+
+    def _select(self, pop: Sequence[ParetoPoint], rank, crowd) -> BuildOrder:
+        a, b = self.rng.randrange(len(pop)), self.rng.randrange(len(pop))
+        if (rank[b], -crowd[b]) < (rank[a], -crowd[a]):
+            a = b
+        return copy.deepcopy(pop[a][1])
+
+    def _breed(self, pop: Sequence[ParetoPoint], rank, crowd) -> List[BuildOrder]:
+        children: List[BuildOrder] = []
+        while len(children) < self.population_size:
+            p1 = self._select(pop, rank, crowd)
+            p2 = self._select(pop, rank, crowd)
+            if self.rng.random() < self.crossover_rate:
+                crossover = (_crossover_one_point if self.rng.random() < 0.7
+                             else _crossover_uniform)
+                p1, p2 = crossover(p1, p2, self.rng)
+            for child in (p1, p2):
+                if len(children) >= self.population_size:
+                    break
+                if self.rng.random() < self.mutation_rate:
+                    child = self.rng.choice(MUTATIONS)(child, self.rng)
+                children.append(enforce_constraints(child, self.map_config))
+        return children
+
+    def _survivors(self, combined: List[ParetoPoint]) -> List[ParetoPoint]:
+        """Elitist NSGA-II survival: whole fronts, then the least crowded."""
+        points = [p for p, _ in combined]
+        fronts = non_dominated_sort(points, self.goals)
+        self.history.append(len(fronts[0]))
+        keep: List[int] = []
+        for front in fronts:
+            if len(keep) + len(front) <= self.population_size:
+                keep.extend(front)
+                continue
+            crowd = crowding_distance(points, front)
+            front = sorted(front, key=lambda i: crowd[i], reverse=True)
+            keep.extend(front[:self.population_size - len(keep)])
+            break
+        return [combined[i] for i in keep]
+
+
+def save_front(front: Sequence[ParetoPoint], goals: Sequence[OptGoal],
+               directory: str, prefix: str = "pareto") -> List[str]:
+    """Save each front member as `<prefix>_NN.yaml` in `directory`."""
+    from bar_sim.io import save_build_order
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for n, (objectives, bo) in enumerate(front, 1):
+        scores = ", ".join(f"{g.name}={v:.2f}" for g, v in zip(goals, objectives))
+        bo = copy.deepcopy(bo)
+        bo.name = f"Pareto #{n}"
+        bo.description = f"Pareto front member ({scores})"
+        path = os.path.join(directory, f"{prefix}_{n:02d}.yaml")
+        save_build_order(bo, path)
+        paths.append(path)
+    return paths
@@ -6,9 +6,9 @@ Mirrors engine_totallylegal_prod.lua QueueProduction logic.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
-from bar_sim.models import BuildAction, BuildActionType
+from bar_sim.models import BuildAction, BuildActionType, build_action
 from bar_sim.strategy import (
     StrategyConfig, UnitComposition, UnitRole, Role, EmergencyMode,
     UNIT_ROLE_MAP, COMPOSITIONS, FACTORY_BUILDLISTS,
@@ -49,9 +49,10 @@ class ArmyComposition:
 # Factory production selection
 # ---------------------------------------------------------------------------
 
-def cheapest_combat_unit(factory_type: str) -> Optional[str]:
+def cheapest_combat_unit(factory_type: str, units: Optional[Mapping] = None) -> Optional[str]:
     """Find the cheapest non-constructor, non-utility unit a factory can build."""
-    from bar_sim.econ import UNITS as ECON_UNITS
+    if units is None:
+        from bar_sim.econ import UNITS as units
 
     buildlist = FACTORY_BUILDLISTS.get(factory_type, [])
     best_key = None
@@ -60,7 +61,7 @@ def cheapest_combat_unit(factory_type: str) -> Optional[str]:
     for key in buildlist:
         role = UNIT_ROLE_MAP.get(key)
         if role and role not in (UnitRole.CONSTRUCTOR, UnitRole.UTILITY):
-            unit = ECON_UNITS.get(key)
+            unit = units.get(key)
             cost = unit.metal_cost if unit else float("inf")
             if cost < best_cost:
                 best_cost = cost
@@ -69,12 +70,14 @@ def cheapest_combat_unit(factory_type: str) -> Optional[str]:
     return best_key
 
 
-def _find_best_unit_for_role(buildlist: List[str], target_role: UnitRole) -> Optional[str]:
+def _find_best_unit_for_role(buildlist: List[str], target_role: UnitRole,
+                             units: Optional[Mapping] = None) -> Optional[str]:
     """Find the most expensive unit matching target_role in a factory's buildlist.
 
     Mirrors Lua FindBestUnit: picks highest metal cost match.
     """
-    from bar_sim.econ import UNITS as ECON_UNITS
+    if units is None:
+        from bar_sim.econ import UNITS as units
 
     best_key = None
     best_cost = -1.0
@@ -82,7 +85,7 @@ def _find_best_unit_for_role(buildlist: List[str], target_role: UnitRole) -> Opt
     for key in buildlist:
         role = UNIT_ROLE_MAP.get(key)
         if role == target_role:
-            unit = ECON_UNITS.get(key)
+            unit = units.get(key)
             cost = unit.metal_cost if unit else 0
             if cost > best_cost:
                 best_cost = cost
@@ -96,6 +99,7 @@ def choose_factory_production(
     army: ArmyComposition,
     factory_type: str,
     prod_override: Optional[str] = None,
+    units: Optional[Mapping] = None,
 ) -> Optional[BuildAction]:
     """Choose what a factory should produce next.
 
@@ -104,6 +108,7 @@ def choose_factory_production(
         army: Current army composition.
         factory_type: Key of the factory (e.g. "bot_lab").
         prod_override: If set, force-produce this unit_key (from goal system).
+        units: Unit table (e.g. a UnitCatalog); defaults to econ.UNITS.
 
     Returns:
         BuildAction or None if nothing to produce.
@@ -114,13 +119,13 @@ def choose_factory_production(
 
     # Goal override: produce specific unit if factory can build it
     if prod_override and prod_override in buildlist:
-        return BuildAction(unit_key=prod_override, action_type=BuildActionType.PRODUCE_UNIT)
+        return build_action(unit_key=prod_override, action_type=BuildActionType.PRODUCE_UNIT)
 
     # Emergency: mobilization -> flood cheapest combat unit
     if config.emergency_mode == EmergencyMode.MOBILIZATION:
-        key = cheapest_combat_unit(factory_type)
+        key = cheapest_combat_unit(factory_type, units)
         if key:
-            return BuildAction(unit_key=key, action_type=BuildActionType.PRODUCE_UNIT)
+            return build_action(unit_key=key, action_type=BuildActionType.PRODUCE_UNIT)
         return None
 
     # Get composition weights
@@ -142,14 +147,14 @@ def choose_factory_production(
 
         if deficit > best_deficit:
             # Check if factory can build this role
-            unit_key = _find_best_unit_for_role(buildlist, unit_role)
+            unit_key = _find_best_unit_for_role(buildlist, unit_role, units)
             if unit_key:
                 best_deficit = deficit
                 best_role = unit_role
 
     if best_role:
-        unit_key = _find_best_unit_for_role(buildlist, best_role)
+        unit_key = _find_best_unit_for_role(buildlist, best_role, units)
         if unit_key:
-            return BuildAction(unit_key=unit_key, action_type=BuildActionType.PRODUCE_UNIT)
+            return build_action(unit_key=unit_key, action_type=BuildActionType.PRODUCE_UNIT)
 
     return None
@@ -8,7 +8,7 @@ import copy
 from typing import Optional
 
 from bar_sim.econ import UNITS
-from bar_sim.models import BuildOrder, BuildAction, BuildActionType, MapConfig
+from bar_sim.models import BuildOrder, BuildActionType, MapConfig, build_action
 from bar_sim.engine import SimulationEngine
 from bar_sim.format import print_full_report, print_milestones, print_timeline, print_snapshots
 from bar_sim.compare import compare_and_print
@@ -126,7 +126,7 @@ class BuildOrderREPL(cmd.Cmd):
         action_type = (BuildActionType.PRODUCE_UNIT
                        if queue_name.startswith("fac")
                        else BuildActionType.BUILD_STRUCTURE)
-        action = BuildAction(unit_key=unit_key, action_type=action_type)
+        action = build_action(unit_key=unit_key, action_type=action_type)
 
         if pos is not None and 0 <= pos <= len(queue):
             queue.insert(pos, action)
@@ -0,0 +1,201 @@
+"""
+BAR Build Order Simulator - Robust (Multi-Scenario) Evaluation
+=================================================================
+Scores build orders over a set of scenarios (map config x wind seed)
+instead of the single map / seed 42 run, so the optimizer can't overfit
+one wind trace.
+
+A candidate's fitness is an aggregate of its per-scenario scores:
+
+    mean    average over all scenarios
+    worst   the single worst scenario
+    cvar    mean of the worst `cvar_alpha` fraction of scenarios
+
+Batches of candidates are raced (successive halving over scenarios):
+everyone is scored on the first few scenarios, the best 1/eta go on to
+twice as many, and so on until the survivors have seen them all. A
+candidate dropped early is never ranked above one that outlasted it.
+
+With workers > 1 the candidate x scenario matrix is evaluated in a
+process pool.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from bar_sim.econ import UnitCatalog
+from bar_sim.models import BuildOrder, MapConfig
+from bar_sim.optimizer import EvalStats, OptGoal, evaluate_candidate
+
+AGGREGATES = ("mean", "worst", "cvar")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    map_config: MapConfig
+    seed: int = 42
+    name: str = ""
+
+
+def make_scenarios(map_configs: Sequence[MapConfig], seeds: Iterable[int],
+                   names: Optional[Sequence[str]] = None) -> List[Scenario]:
+    """Every (map, seed) combination, seeds varying fastest."""
+    seeds = list(seeds)
+    names = list(names) if names else [f"map{i}" for i in range(len(map_configs))]
+    return [Scenario(mc, seed, f"{name}/s{seed}")
+            for mc, name in zip(map_configs, names) for seed in seeds]
+
+
+def aggregate_scores(scores: Sequence[float], goal: OptGoal,
+                     how: str = "mean", cvar_alpha: float = 0.25) -> float:
+    """Combine per-scenario scores into one fitness value."""
+    if how == "mean":
+        return sum(scores) / len(scores)
+    worst_first = sorted(scores, reverse=not goal.higher_is_better)
+    if how == "worst":
+        return worst_first[0]
+    if how == "cvar":
+        k = max(1, math.ceil(cvar_alpha * len(scores)))
+        return sum(worst_first[:k]) / k
+    raise ValueError(f"Unknown aggregate: {how}. Choose from: {list(AGGREGATES)}")
+
+
+def _run_scenarios(bo: BuildOrder, goal: OptGoal, duration: int,
+                   catalog: Optional[UnitCatalog],
+                   scenarios: Sequence[Scenario]) -> Tuple[List[float], EvalStats]:
+    stats = EvalStats()
+    scores = [
+        evaluate_candidate(replace(bo, map_config=s.map_config), goal, duration,
+                           catalog=catalog, stats=stats, seed=s.seed)
+        for s in scenarios
+    ]
+    return scores, stats
+
+
+class RobustEvaluator:
+    """
+    Scores candidates across scenarios with racing and optional parallelism.
+
+    `min_scenarios` is the first racing rung; race=False scores every
+    candidate on every scenario. Goals and catalogs are sent to worker
+    processes by recipe, so the goal must come from make_goal().
+    """
+
+    def __init__(self, goal: OptGoal, scenarios: Sequence[Scenario],
+                 duration: int = 600,
+                 aggregate: str = "mean",
+                 cvar_alpha: float = 0.25,
+                 race: bool = True,
+                 min_scenarios: int = 2,
+                 eta: int = 2,
+                 workers: int = 1,
+                 catalog: Optional[UnitCatalog] = None):
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate: {aggregate}. Choose from: {list(AGGREGATES)}")
+        if not scenarios:
+            raise ValueError("RobustEvaluator needs at least one scenario")
+        self.goal = goal
+        self.scenarios = list(scenarios)
+        self.duration = duration
+        self.aggregate = aggregate
+        self.cvar_alpha = cvar_alpha
+        self.race = race
+        self.min_scenarios = max(1, min_scenarios)
+        self.eta = max(2, eta)
+        self.workers = max(1, workers)
+        self.catalog = catalog
+        self.eval_stats = EvalStats()
+        self.candidates = 0
+        self.raced_out = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    # ------------------------------------------------------------------
+
+    def evaluate(self, bo: BuildOrder) -> float:
+        return self.evaluate_many([bo])[0][0]
+
+    def evaluate_many(self, bos: Sequence[BuildOrder]) -> List[Tuple[float, bool]]:
+        """Race `bos` over the scenarios.
+
+        Returns (fitness, complete) per candidate; complete is False for
+        candidates dropped before seeing every scenario.
+        """
+        n_total = len(self.scenarios)
+        scores: List[List[float]] = [[] for _ in bos]
+        alive = list(range(len(bos)))
+        dropped: List[List[int]] = []  # per rung, in rung order
+        seen = 0
+        rung = n_total if not self.race else min(self.min_scenarios, n_total)
+
+        while True:
+            self._run(bos, alive, scores, self.scenarios[seen:rung])
+            seen = rung
+            if seen >= n_total:
+                break
+            estimates = {i: self._fitness(scores[i]) for i in alive}
+            alive.sort(key=lambda i: estimates[i], reverse=self.goal.higher_is_better)
+            keep = max(1, math.ceil(len(alive) / self.eta))
+            dropped.append(alive[keep:])
+            alive = alive[:keep]
+            rung = min(n_total, seen * self.eta)
+
+        fitness = [self._fitness(s) for s in scores]
+        # Cap each rung's dropouts at the weakest candidate that outlasted them
+        survivors = list(alive)
+        for out in reversed(dropped):
+            cap = min((fitness[i] for i in survivors),
+                      key=lambda f: f if self.goal.higher_is_better else -f)
+            for i in out:
+                if self.goal.is_better(fitness[i], cap):
+                    fitness[i] = cap
+            survivors.extend(out)
+
+        self.candidates += len(bos)
+        self.raced_out += len(bos) - len(alive)
+        complete = set(alive)
+        return [(fitness[i], i in complete) for i in range(len(bos))]
+
+    def scenario_scores(self, bo: BuildOrder) -> List[float]:
+        """Per-scenario scores of one build order (no racing)."""
+        return _run_scenarios(bo, self.goal, self.duration, self.catalog, self.scenarios)[0]
+
+    def stats(self) -> dict:
+        runs = self.eval_stats.evaluations
+        full = self.candidates * len(self.scenarios)
+        return {
+            "scenarios": len(self.scenarios),
+            "candidates": self.candidates,
+            "scenario_runs": runs,
+            "raced_out": self.raced_out,
+            "race_fraction": round(runs / full, 3) if full else 1.0,
+        }
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    # ------------------------------------------------------------------
+
+    def _fitness(self, scores: Sequence[float]) -> float:
+        return aggregate_scores(scores, self.goal, self.aggregate, self.cvar_alpha)
+
+    def _run(self, bos: Sequence[BuildOrder], idx: List[int],
+             scores: List[List[float]], scenarios: Sequence[Scenario]):
+        if not scenarios or not idx:
+            return
+        if self.workers == 1 or len(idx) == 1:
+            results = [_run_scenarios(bos[i], self.goal, self.duration, self.catalog, scenarios)
+                       for i in idx]
+        else:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            futures = [self._pool.submit(_run_scenarios, bos[i], self.goal,
+                                         self.duration, self.catalog, scenarios)
+                       for i in idx]
+            results = [f.result() for f in futures]
+        for i, (s, st) in zip(idx, results):
+            scores[i].extend(s)
+            self.eval_stats.merge(st)
@@ -25,13 +25,70 @@ function fmtRate(v) { return v >= 1000 ? v.toFixed(0) : v.toFixed(1); }
 
 async function api(path, opts = {}) {
     const res = await fetch(`/api${path}`, {
-        headers: { 'Content-Type': 'application/json' },
         ...opts,
+        headers: { 'Content-Type': 'application/json', ...(opts.headers || {}) },
     });
     if (!res.ok) throw new Error(`API error: ${res.status}`);
     return res.json();
 }
 
+// ============================================================
+// Columnar result decoding (see bar_sim/columnar.py)
+// ============================================================
+
+const COLUMNAR_ACCEPT = { Accept: 'application/vnd.bar-sim.columnar+json' };
+
+function deltaDecode(deltas) {
+    let total = 0;
+    return deltas.map(d => (total += d));
+}
+
+// Expand a columnar document back into the row-shaped result the charts use.
+function decodeResult(doc) {
+    if (!doc || doc.format !== 'bar-sim-columnar') return doc;
+    const keys = doc.unit_keys;
+    const snap = doc.snapshots;
+    const counts = Object.entries(snap.unit_counts).map(([idx, col]) => [keys[idx], col]);
+    const snapshots = deltaDecode(snap.tick).map((tick, i) => {
+        const unit_counts = {};
+        for (const [key, col] of counts) if (col[i]) unit_counts[key] = col[i];
+        return {
+            tick,
+            metal_income: snap.metal_income[i],
+            energy_income: snap.energy_income[i],
+            metal_stored: snap.metal_stored[i],
+            energy_stored: snap.energy_stored[i],
+            metal_expenditure: snap.metal_expenditure[i],
+            energy_expenditure: snap.energy_expenditure[i],
+            build_power: snap.build_power[i],
+            army_value_metal: snap.army_value_metal[i],
+            stall_factor: snap.stall_factor[i],
+            unit_counts,
+        };
+    });
+    const log = doc.completion_log;
+    const completion_log = deltaDecode(log.tick).map((tick, i) => ({
+        tick, unit_key: keys[log.unit[i]], builder_id: doc.builder_ids[log.builder[i]],
+    }));
+    const ms = doc.milestones;
+    const milestones = ms.tick.map((tick, i) => ({
+        tick, event: ms.event[i], description: ms.description[i],
+        metal_income: ms.metal_income[i], energy_income: ms.energy_income[i],
+    }));
+    const st = doc.stall_events;
+    const stall_events = st.start_tick.map((start_tick, i) => ({
+        start_tick, end_tick: st.end_tick[i], resource: st.resource[i], severity: st.severity[i],
+    }));
+    return {
+        build_order_name: doc.build_order_name,
+        total_ticks: doc.total_ticks,
+        ...doc.summary,
+        snapshots, completion_log, milestones, stall_events,
+        army_composition_final: doc.army_composition_final,
+        goal_completions: doc.goal_completions,
+    };
+}
+
 // ============================================================
 // Chart helpers
 // ============================================================
@@ -171,10 +228,11 @@ document.getElementById('sim-run-btn').addEventListener('click', async () => {
 
     document.getElementById('sim-run-btn').disabled = true;
     try {
-        const result = await api('/simulate', {
+        const result = decodeResult(await api('/simulate', {
             method: 'POST',
+            headers: COLUMNAR_ACCEPT,
             body: JSON.stringify({ filename, duration }),
-        });
+        }));
         renderSimResults(result);
         document.getElementById('sim-results').classList.remove('hidden');
     } finally {
@@ -440,10 +498,11 @@ document.getElementById('ed-load-btn').addEventListener('click', async () => {
 // Simulate from editor
 document.getElementById('ed-sim-btn').addEventListener('click', async () => {
     const bo = getEditorBuildOrder();
-    const result = await api('/simulate', {
+    const result = decodeResult(await api('/simulate', {
         method: 'POST',
+        headers: COLUMNAR_ACCEPT,
         body: JSON.stringify({ build_order: bo, duration: 600 }),
-    });
+    }));
     // Switch to simulate tab and render
     document.querySelectorAll('.tab').forEach(t => t.classList.remove('active'));
     document.querySelectorAll('.tab-content').forEach(t => t.classList.remove('active'));
@@ -504,9 +563,10 @@ document.getElementById('cmp-run-btn').addEventListener('click', async () => {
     try {
         const data = await api('/compare', {
             method: 'POST',
+            headers: COLUMNAR_ACCEPT,
             body: JSON.stringify({ filenames: [fileA, fileB], duration }),
         });
-        renderCompare(data.results);
+        renderCompare(data.results.map(decodeResult));
         document.getElementById('cmp-results').classList.remove('hidden');
     } finally {
         document.getElementById('cmp-run-btn').disabled = false;
@@ -614,6 +674,7 @@ document.getElementById('opt-run-btn').addEventListener('click', async () => {
             mex_spots: parseInt(document.getElementById('opt-mex-spots').value),
         },
         start_from: document.getElementById('opt-start-from').value || null,
+        result_format: 'columnar',
     };
 
     document.getElementById('opt-run-btn').disabled = true;
@@ -670,7 +731,8 @@ function handleOptProgress(data, fitnessData) {
     document.getElementById('opt-progress-bar').style.width = pct + '%';
     document.getElementById('opt-progress-text').textContent =
         `Gen ${data.generation}/${data.total_generations} | Best: ${data.best_score} | ` +
-        `Gen best: ${data.gen_best} | Mutation: ${data.mutation_rate} | Stagnation: ${data.stagnation}`;
+        `Gen best: ${data.gen_best} | Mutation: ${data.mutation_rate} | Stagnation: ${data.stagnation} | ` +
+        `Pruned: ${data.pruned}/${data.evaluations} | Simulated: ${Math.round(data.sim_fraction * 100)}%`;
 
     fitnessData.push(data.best_score);
 
@@ -695,6 +757,7 @@ function handleOptProgress(data, fitnessData) {
 }
 
 function handleOptComplete(data) {
+    data.result = decodeResult(data.result);
     optimizeResult = data;
     document.getElementById('opt-result').classList.remove('hidden');
 
@@ -11,7 +11,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Dict, List, Optional
 
-from bar_sim.models import BuildAction, BuildActionType
+from bar_sim.models import BuildAction, BuildActionType, build_action
 
 
 # ---------------------------------------------------------------------------
@@ -238,29 +238,29 @@ def generate_opening(config: StrategyConfig) -> List[BuildAction]:
 
     # 1. Opening mexes
     for _ in range(config.opening_mex_count):
-        actions.append(BuildAction(unit_key="mex", action_type=BuildActionType.BUILD_STRUCTURE))
+        actions.append(build_action(unit_key="mex", action_type=BuildActionType.BUILD_STRUCTURE))
 
     # 2. Energy (based on strategy)
     es = config.energy_strategy
     if es == EnergyStrategy.AUTO or es == EnergyStrategy.WIND_ONLY:
-        actions.append(BuildAction(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
-        actions.append(BuildAction(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
+        actions.append(build_action(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
+        actions.append(build_action(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
     elif es == EnergyStrategy.SOLAR_ONLY:
-        actions.append(BuildAction(unit_key="solar", action_type=BuildActionType.BUILD_STRUCTURE))
+        actions.append(build_action(unit_key="solar", action_type=BuildActionType.BUILD_STRUCTURE))
     elif es == EnergyStrategy.MIXED:
-        actions.append(BuildAction(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
-        actions.append(BuildAction(unit_key="solar", action_type=BuildActionType.BUILD_STRUCTURE))
+        actions.append(build_action(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
+        actions.append(build_action(unit_key="solar", action_type=BuildActionType.BUILD_STRUCTURE))
 
     # 3. Factory
     factory_key = _factory_key_for_composition(config.unit_composition)
-    actions.append(BuildAction(unit_key=factory_key, action_type=BuildActionType.BUILD_STRUCTURE))
+    actions.append(build_action(unit_key=factory_key, action_type=BuildActionType.BUILD_STRUCTURE))
 
     # 4. Post-factory energy
-    actions.append(BuildAction(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
-    actions.append(BuildAction(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
+    actions.append(build_action(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
+    actions.append(build_action(unit_key="wind", action_type=BuildActionType.BUILD_STRUCTURE))
 
     # 5. Extra mex
-    actions.append(BuildAction(unit_key="mex", action_type=BuildActionType.BUILD_STRUCTURE))
+    actions.append(build_action(unit_key="mex", action_type=BuildActionType.BUILD_STRUCTURE))
 
     return actions
 
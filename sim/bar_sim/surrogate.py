@@ -0,0 +1,205 @@
+"""
+BAR Build Order Simulator - Surrogate Fitness Model
+=====================================================
+Cheap stand-in for SimulationEngine used to pre-screen GA offspring.
+
+A ridge regression over queue-position features is trained online from
+every (build order, score) pair the optimizer has really simulated. Each
+generation the optimizer breeds several times more children than it needs,
+ranks them with the surrogate and only simulates the most promising ones.
+
+Requires NumPy (pip install numpy); the optimizer works without it as long
+as the surrogate is not enabled.
+"""
+
+import math
+from collections import deque
+from typing import Dict, List, Sequence
+
+from bar_sim.models import BuildOrder
+
+# Commander queue positions with their own one-hot features; later
+# positions only contribute to the position-weighted counts
+HEAD_POSITIONS = 8
+
+
+def _require_numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "The surrogate model requires NumPy. Install with: pip install numpy"
+        ) from e
+    return np
+
+
+def _vocabulary() -> List[str]:
+    from bar_sim.optimizer import COMMANDER_POOL, FACTORY_PRODUCIBLE, CON_POOL
+    return sorted(set(COMMANDER_POOL) | set(FACTORY_PRODUCIBLE) | set(CON_POOL))
+
+
+class BuildOrderFeatures:
+    """Fixed-length numeric encoding of a build order's queues."""
+
+    def __init__(self):
+        self.vocab = _vocabulary()
+        self.index = {key: i for i, key in enumerate(self.vocab)}
+        v = len(self.vocab)
+        # head one-hots | commander counts | commander weighted | factory
+        # counts | con counts | misc
+        self.size = HEAD_POSITIONS * v + 4 * v + 3
+
+    def encode(self, bo: BuildOrder) -> List[float]:
+        v = len(self.vocab)
+        x = [0.0] * self.size
+        counts = HEAD_POSITIONS * v
+        weighted = counts + v
+        factory = weighted + v
+        con = factory + v
+        misc = con + v
+
+        for pos, action in enumerate(bo.commander_queue):
+            i = self.index.get(action.unit_key)
+            if i is None:
+                continue
+            if pos < HEAD_POSITIONS:
+                x[pos * v + i] = 1.0
+            x[counts + i] += 1.0
+            x[weighted + i] += 1.0 / (1.0 + pos)
+        for q in bo.factory_queues.values():
+            for action in q:
+                i = self.index.get(action.unit_key)
+                if i is not None:
+                    x[factory + i] += 1.0
+        for q in bo.constructor_queues.values():
+            for action in q:
+                i = self.index.get(action.unit_key)
+                if i is not None:
+                    x[con + i] += 1.0
+        x[misc] = len(bo.commander_queue)
+        x[misc + 1] = sum(len(q) for q in bo.factory_queues.values())
+        x[misc + 2] = len(bo.constructor_queues)
+        return x
+
+
+def spearman(a: Sequence[float], b: Sequence[float]) -> float:
+    """Spearman rank correlation (average ranks for ties)."""
+    np = _require_numpy()
+    if len(a) < 3:
+        return float("nan")
+
+    def ranks(values):
+        values = np.asarray(values, dtype=float)
+        order = values.argsort(kind="mergesort")
+        r = np.empty(len(values))
+        r[order] = np.arange(len(values), dtype=float)
+        # average ranks over ties
+        for v in np.unique(values):
+            mask = values == v
+            if mask.sum() > 1:
+                r[mask] = r[mask].mean()
+        return r
+
+    ra, rb = ranks(a), ranks(b)
+    if ra.std() == 0 or rb.std() == 0:
+        return float("nan")
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+class SurrogateModel:
+    """Online ridge-regression surrogate for GA fitness.
+
+    observe() adds a really-simulated (build order, score) pair; screen()
+    ranks bred offspring and returns the best `keep`. The model is refit
+    lazily at most once per screen() call.
+    """
+
+    def __init__(self, alpha: float = 1.0, min_samples: int = 40,
+                 max_samples: int = 2000, window: int = 500):
+        self.np = _require_numpy()
+        self.features = BuildOrderFeatures()
+        self.alpha = alpha
+        self.min_samples = min_samples
+        self._X: deque = deque(maxlen=max_samples)
+        self._y: deque = deque(maxlen=max_samples)
+        self._dirty = False
+        self._coef = None
+        self._mean = None
+        self._scale = None
+        self._y_mean = 0.0
+
+        # Quality / savings tracking
+        self._pending: Dict[int, float] = {}  # id(bo) -> prediction
+        self._pairs: deque = deque(maxlen=window)  # (predicted, actual)
+        self.bred = 0
+        self.screened_out = 0
+
+    def __getstate__(self):
+        # Modules don't pickle (checkpoints); re-import NumPy on load
+        state = self.__dict__.copy()
+        del state["np"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.np = _require_numpy()
+
+    @property
+    def ready(self) -> bool:
+        return len(self._y) >= self.min_samples
+
+    def observe(self, bo: BuildOrder, score: float):
+        if not math.isfinite(score):
+            return
+        pred = self._pending.pop(id(bo), None)
+        if pred is not None:
+            self._pairs.append((pred, score))
+        self._X.append(self.features.encode(bo))
+        self._y.append(score)
+        self._dirty = True
+
+    def fit(self):
+        np = self.np
+        X = np.asarray(self._X, dtype=float)
+        y = np.asarray(self._y, dtype=float)
+        self._mean = X.mean(axis=0)
+        self._scale = X.std(axis=0)
+        self._scale[self._scale == 0] = 1.0
+        Z = (X - self._mean) / self._scale
+        self._y_mean = y.mean()
+        A = Z.T @ Z + self.alpha * np.eye(Z.shape[1])
+        self._coef = np.linalg.solve(A, Z.T @ (y - self._y_mean))
+        self._dirty = False
+
+    def predict(self, bos: Sequence[BuildOrder]):
+        np = self.np
+        if self._dirty or self._coef is None:
+            self.fit()
+        X = np.asarray([self.features.encode(bo) for bo in bos], dtype=float)
+        return ((X - self._mean) / self._scale) @ self._coef + self._y_mean
+
+    def screen(self, bos: List[BuildOrder], keep: int,
+               higher_is_better: bool = True) -> List[BuildOrder]:
+        """Return the `keep` offspring the surrogate rates best."""
+        preds = self.predict(bos)
+        order = sorted(range(len(bos)), key=lambda i: preds[i], reverse=higher_is_better)
+        chosen = [bos[i] for i in order[:keep]]
+        self._pending = {id(bos[i]): float(preds[i]) for i in order[:keep]}
+        self.bred += len(bos)
+        self.screened_out += max(0, len(bos) - keep)
+        return chosen
+
+    def correlation(self) -> float:
+        """Spearman correlation of predictions vs. real scores (recent window)."""
+        if not self._pairs:
+            return float("nan")
+        pred, actual = zip(*self._pairs)
+        return spearman(pred, actual)
+
+    def stats(self) -> dict:
+        rho = self.correlation()
+        return {
+            "surrogate_samples": len(self._y),
+            "surrogate_rho": None if math.isnan(rho) else round(rho, 3),
+            "sims_saved": self.screened_out,
+        }
@@ -0,0 +1,357 @@
+"""
+BAR Build Order Simulator - Parameter Sweeps
+==============================================
+Runs a build order over a grid (or Latin hypercube) of MapConfig and
+StrategyConfig values and writes one row per cell to a CSV or Parquet
+file (`cli.py sweep`).
+
+Parameters are given as `name=spec`:
+
+    avg_wind=4:20:5          5 evenly spaced values (LHS: the range 4-20)
+    avg_wind=4:20            a range, for Latin hypercube sampling only
+    mex_value=1.5,2,3        explicit values (LHS: sampled as choices)
+    energy_strategy=*        every value of a StrategyConfig enum
+
+Any StrategyConfig parameter puts the build order in strategy mode.
+
+Every cell has a stable index, so a sweep can be split across machines
+(shard i/n runs the cells with index % n == i, each into its own file)
+and resumed: cells already in the output file are skipped. CSV rows are
+flushed as they finish; Parquet rows are written in row groups and the
+file is finalized on close. Cells that resolve to the same simulation
+(e.g. LHS rounding two samples to the same integers) are run once.
+"""
+
+import copy
+import csv
+import itertools
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, fields, replace
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from bar_sim.cache import canonical_hash
+from bar_sim.engine import SimulationEngine
+from bar_sim.ensemble import METRICS
+from bar_sim.models import BuildOrder, MapConfig, SimResult, SnapshotConfig
+from bar_sim.strategy import StrategyConfig
+
+# Sweepable fields: name -> type
+MAP_PARAMS = {f.name: f.type for f in fields(MapConfig)}
+STRATEGY_PARAMS = {f.name: f.type for f in fields(StrategyConfig)
+                   if f.type in (int, float, bool) or
+                   (isinstance(f.type, type) and issubclass(f.type, Enum))}
+
+# Extra result columns besides the ensemble metrics
+EXTRA_METRICS = ("peak_metal_income", "peak_energy_income")
+
+# Parquet rows buffered per row group
+ROW_GROUP = 64
+
+
+@dataclass(frozen=True)
+class Param:
+    """One swept field: explicit values and/or a numeric range."""
+    name: str
+    values: Tuple[Any, ...] = ()
+    low: Optional[float] = None
+    high: Optional[float] = None
+
+    @property
+    def kind(self) -> type:
+        return MAP_PARAMS.get(self.name) or STRATEGY_PARAMS[self.name]
+
+
+def _coerce(kind: type, text: str):
+    if isinstance(kind, type) and issubclass(kind, Enum):
+        return kind(text)
+    if kind is bool:
+        if text.lower() in ("1", "true", "yes", "on"):
+            return True
+        if text.lower() in ("0", "false", "no", "off"):
+            return False
+        raise ValueError(f"Not a boolean: {text!r}")
+    return kind(float(text)) if kind is int else kind(text)
+
+
+def parse_param(spec: str) -> Param:
+    """Parse `name=lo:hi[:n]`, `name=a,b,c` or `name=*` (see module doc)."""
+    name, sep, value = spec.partition("=")
+    name, value = name.strip(), value.strip()
+    if not sep or not value:
+        raise ValueError(f"Expected name=values, got {spec!r}")
+    if name not in MAP_PARAMS and name not in STRATEGY_PARAMS:
+        raise ValueError(f"Unknown sweep parameter: {name}. Choose from: "
+                         f"{sorted(MAP_PARAMS) + sorted(STRATEGY_PARAMS)}")
+    kind = MAP_PARAMS.get(name) or STRATEGY_PARAMS[name]
+    if value == "*":
+        if kind is bool:
+            return Param(name, (False, True))
+        if not issubclass(kind, Enum):
+            raise ValueError(f"{name}=* needs an enum or boolean field")
+        return Param(name, tuple(kind))
+    if ":" in value:
+        if kind not in (int, float):
+            raise ValueError(f"{name} is not numeric; list its values instead")
+        parts = value.split(":")
+        if len(parts) not in (2, 3):
+            raise ValueError(f"Expected lo:hi or lo:hi:n, got {value!r}")
+        low, high = float(parts[0]), float(parts[1])
+        values: Tuple[Any, ...] = ()
+        if len(parts) == 3:
+            n = int(parts[2])
+            if n < 1:
+                raise ValueError(f"{name}: need at least one value")
+            step = (high - low) / (n - 1) if n > 1 else 0.0
+            values = tuple(dict.fromkeys(_coerce(kind, str(low + i * step)) for i in range(n)))
+        return Param(name, values, low, high)
+    return Param(name, tuple(_coerce(kind, v.strip()) for v in value.split(",")))
+
+
+def grid_cells(params: Sequence[Param]) -> List[Dict[str, Any]]:
+    """Every combination of the parameters' values, last parameter fastest."""
+    for p in params:
+        if not p.values:
+            raise ValueError(f"{p.name}: a grid needs values (lo:hi:n or a list)")
+    return [dict(zip((p.name for p in params), combo))
+            for combo in itertools.product(*(p.values for p in params))]
+
+
+def lhs_cells(params: Sequence[Param], samples: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Latin hypercube: each parameter's range (or value list) is split
+    into `samples` strata and every stratum is used exactly once."""
+    rng = random.Random(seed)
+    columns = []
+    for p in params:
+        strata = list(range(samples))
+        rng.shuffle(strata)
+        points = [(s + rng.random()) / samples for s in strata]
+        if p.low is not None:
+            span = p.high - p.low
+            if p.kind is int:
+                col = [min(int(p.high), int(p.low + u * (span + 1))) for u in points]
+            else:
+                col = [p.low + u * span for u in points]
+        else:
+            col = [p.values[min(len(p.values) - 1, int(u * len(p.values)))] for u in points]
+        columns.append(col)
+    return [dict(zip((p.name for p in params), row)) for row in zip(*columns)]
+
+
+def cell_build_order(base: BuildOrder, cell: Dict[str, Any]) -> BuildOrder:
+    """`base` with the cell's MapConfig / StrategyConfig values applied."""
+    bo = copy.deepcopy(base)
+    map_values = {k: v for k, v in cell.items() if k in MAP_PARAMS}
+    strategy_values = {k: v for k, v in cell.items() if k not in MAP_PARAMS}
+    if map_values:
+        bo.map_config = replace(bo.map_config, **map_values)
+    if strategy_values:
+        bo.strategy_config = replace(bo.strategy_config or StrategyConfig(), **strategy_values)
+    return bo
+
+
+def _column_value(value):
+    return value.value if isinstance(value, Enum) else value
+
+
+def _result_row(result: SimResult, at: int) -> Dict[str, Optional[float]]:
+    row = {name: fn(result, at) for name, _, fn in METRICS}
+    for name in EXTRA_METRICS:
+        row[name] = getattr(result, name)
+    return row
+
+
+def _run_cell(bo: BuildOrder, duration: int, seed: int, at: int) -> Dict[str, Optional[float]]:
+    config = SnapshotConfig.score_only(
+        ("metal_income", "energy_income", "army_value_metal"), at)
+    try:
+        result = SimulationEngine(bo, duration, seed=seed, snapshot_config=config).run()
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    return _result_row(result, at)
+
+
+# ---------------------------------------------------------------------------
+# Output sinks
+# ---------------------------------------------------------------------------
+
+def completed_cells(path) -> set:
+    """Cell indexes already present in a sweep output file."""
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        return set()
+    if path.suffix == ".parquet":
+        import pyarrow.parquet as pq
+        return set(pq.read_table(path, columns=["cell"]).column("cell").to_pylist())
+    with open(path, newline="") as f:
+        return {int(row["cell"]) for row in csv.DictReader(f)}
+
+
+class _CsvSink:
+    def __init__(self, path: Path, columns: List[str]):
+        exists = path.exists() and path.stat().st_size > 0
+        if exists:
+            with open(path, newline="") as f:
+                header = next(csv.reader(f), [])
+            if header != columns:
+                raise ValueError(f"{path} has different columns; use a new output file")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "a", newline="")
+        self._writer = csv.DictWriter(self._file, columns)
+        if not exists:
+            self._writer.writeheader()
+
+    def write(self, row: dict):
+        self._writer.writerow(row)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetSink:
+    def __init__(self, path: Path, columns: List[str], params: Sequence[Param]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "Parquet output requires pyarrow. Install with: pip install pyarrow"
+            ) from e
+        self._pa = pa
+        types = {p.name: (pa.float64() if p.kind is float else pa.int64() if p.kind is int
+                          else pa.bool_() if p.kind is bool else pa.string())
+                 for p in params}
+        self.schema = pa.schema([(c, pa.int64() if c == "cell" else
+                                  pa.string() if c == "error" else types.get(c, pa.float64()))
+                                 for c in columns])
+        self.path = path
+        self._tmp = path.with_name(path.name + ".tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        existing = pq.read_table(path) if path.exists() else None
+        if existing is not None and existing.column_names != columns:
+            raise ValueError(f"{path} has different columns; use a new output file")
+        self._writer = pq.ParquetWriter(self._tmp, self.schema)
+        if existing is not None:
+            self._writer.write_table(existing.cast(self.schema))
+        self._rows: List[dict] = []
+
+    def write(self, row: dict):
+        self._rows.append(row)
+        if len(self._rows) >= ROW_GROUP:
+            self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._writer.write_table(self._pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self):
+        self._flush()
+        self._writer.close()
+        os.replace(self._tmp, self.path)
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+@dataclass
+class SweepSummary:
+    cells: int = 0         # cells in this shard
+    skipped: int = 0       # already in the output file
+    simulated: int = 0
+    cache_hits: int = 0    # cells answered by an identical earlier cell
+    errors: int = 0
+    rows: List[dict] = field(default_factory=list)  # rows written by this run
+
+
+def sweep_columns(params: Sequence[Param]) -> List[str]:
+    return (["cell"] + [p.name for p in params] + [name for name, _, _ in METRICS]
+            + list(EXTRA_METRICS) + ["error"])
+
+
+def run_sweep(base: BuildOrder, params: Sequence[Param],
+              cells: Sequence[Dict[str, Any]],
+              output: Optional[str] = None,
+              duration: int = 600, at: int = 300, seed: int = 42,
+              workers: int = 1,
+              shard: Tuple[int, int] = (0, 1),
+              resume: bool = True,
+              progress: Optional[Callable[[int, int], None]] = None) -> SweepSummary:
+    """Simulate this shard's cells and stream one row per cell to `output`
+    (.csv or .parquet; None keeps rows in memory only)."""
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError(f"Shard index must be in 0..{count - 1}, got {index}")
+    path = Path(output) if output else None
+    if path is not None and path.suffix not in (".csv", ".parquet"):
+        raise ValueError("Sweep output must be a .csv or .parquet file")
+    if path is not None and not resume and path.exists():
+        path.unlink()
+
+    todo = [i for i in range(len(cells)) if i % count == index]
+    summary = SweepSummary(cells=len(todo))
+    if path is not None and resume:
+        done = completed_cells(path)
+        summary.skipped = sum(1 for i in todo if i in done)
+        todo = [i for i in todo if i not in done]
+
+    # Identical simulations (same build order, duration, seed) run once
+    jobs: Dict[str, BuildOrder] = {}
+    keys = []
+    for i in todo:
+        bo = cell_build_order(base, cells[i])
+        key = canonical_hash(asdict(bo), duration, seed, at)
+        keys.append(key)
+        jobs.setdefault(key, bo)
+    summary.cache_hits = len(todo) - len(jobs)
+
+    columns = sweep_columns(params)
+    sink = None
+    if path is not None:
+        sink = (_ParquetSink(path, columns, params) if path.suffix == ".parquet"
+                else _CsvSink(path, columns))
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 and len(jobs) > 1 else None
+    try:
+        results = _iter_results(jobs, duration, seed, at, pool, workers)
+        cache: Dict[str, dict] = {}
+        for n, (i, key) in enumerate(zip(todo, keys), 1):
+            while key not in cache:
+                done_key, metrics = next(results)
+                cache[done_key] = metrics
+                summary.simulated += 1
+            row = {"cell": i, **{p.name: _column_value(cells[i][p.name]) for p in params},
+                   **cache[key]}
+            row.setdefault("error", None)
+            summary.errors += row["error"] is not None
+            summary.rows.append(row)
+            if sink is not None:
+                sink.write(row)
+            if progress:
+                progress(n, len(todo))
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        if sink is not None:
+            sink.close()
+    return summary
+
+
+def _iter_results(jobs: Dict[str, BuildOrder], duration: int, seed: int, at: int,
+                  pool: Optional[ProcessPoolExecutor],
+                  workers: int) -> Iterator[Tuple[str, dict]]:
+    """(key, metrics) per job, in job order."""
+    keys = list(jobs)
+    if pool is None:
+        for key in keys:
+            yield key, _run_cell(jobs[key], duration, seed, at)
+        return
+    bos = [jobs[k] for k in keys]
+    n = len(bos)
+    chunksize = max(1, n // (workers * 8))
+    yield from zip(keys, pool.map(_run_cell, bos, [duration] * n, [seed] * n, [at] * n,
+                                  chunksize=chunksize))
@@ -0,0 +1,173 @@
+"""
+BAR Build Order Simulator - Optimizer Telemetry
+=================================================
+Structured per-generation metrics for Optimizer and StrategyOptimizer,
+for tuning population size and worker count from data rather than from
+the progress lines.
+
+A Telemetry object accumulates wall time spent simulating vs. breeding
+(selection, crossover, mutation, constraint repair, surrogate screening)
+and turns each generation into a flat record:
+
+- evaluations, evaluations/sec (since the previous record and overall)
+- sim_seconds / operator_seconds and the simulated share of the two
+- pruned / settled counts and sim_fraction from EvalStats
+- cache hits and hit rate (StrategyOptimizer's config cache)
+- genotype diversity: mean pairwise distance over a sample of pairs
+  (queue edit distance for build orders) and the unique genotype share
+
+Records are returned to the caller (the web API forwards them in its SSE
+`progress` events) and, given a path, appended to it as JSON lines.
+"""
+
+import json
+import random
+import time
+from contextlib import contextmanager
+from itertools import combinations
+from pathlib import Path
+from typing import Callable, Hashable, List, Optional, Sequence, Union
+
+from bar_sim.models import BuildOrder
+
+# Pairs sampled for the diversity estimate (all pairs below this)
+DIVERSITY_PAIRS = 200
+
+
+def queue_genotype(bo: BuildOrder) -> tuple:
+    """Hashable genotype of a build order: its queues as unit key tuples."""
+    return (
+        ("commander", tuple(a.unit_key for a in bo.commander_queue)),
+        *sorted((fid, tuple(a.unit_key for a in q)) for fid, q in bo.factory_queues.items()),
+        *sorted((cid, tuple(a.unit_key for a in q)) for cid, q in bo.constructor_queues.items()),
+    )
+
+
+def _edit_distance(a: Sequence, b: Sequence) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    prev = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        cur = [i]
+        for j, y in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (x != y)))
+        prev = cur
+    return prev[-1]
+
+
+def queue_edit_distance(a: tuple, b: tuple) -> int:
+    """Summed Levenshtein distance between same-named queues of two genotypes."""
+    qa, qb = dict(a), dict(b)
+    return sum(_edit_distance(qa.get(name, ()), qb.get(name, ()))
+               for name in qa.keys() | qb.keys())
+
+
+def hamming_distance(a: Sequence, b: Sequence) -> int:
+    return sum(x != y for x, y in zip(a, b)) + abs(len(a) - len(b))
+
+
+def population_diversity(genotypes: Sequence[Hashable],
+                         distance: Callable[[Hashable, Hashable], float],
+                         max_pairs: int = DIVERSITY_PAIRS,
+                         seed: int = 0) -> dict:
+    """Mean pairwise distance (over at most max_pairs pairs) and unique share.
+
+    Sampling uses its own RNG so measuring never perturbs the search.
+    """
+    n = len(genotypes)
+    if n < 2:
+        return {"diversity": 0.0, "unique_fraction": 1.0 if n else 0.0}
+    if n * (n - 1) // 2 <= max_pairs:
+        pairs = list(combinations(range(n), 2))
+    else:
+        rng = random.Random(seed)
+        pairs = [tuple(rng.sample(range(n), 2)) for _ in range(max_pairs)]
+    mean = sum(distance(genotypes[i], genotypes[j]) for i, j in pairs) / len(pairs)
+    return {"diversity": round(mean, 3),
+            "unique_fraction": round(len(set(genotypes)) / n, 3)}
+
+
+class Telemetry:
+    """Per-run timing accumulator and record emitter."""
+
+    def __init__(self, path: Optional[Union[str, Path]] = None,
+                 run_id: Optional[str] = None,
+                 diversity_pairs: int = DIVERSITY_PAIRS):
+        self.path = Path(path) if path else None
+        self.run_id = run_id
+        self.diversity_pairs = diversity_pairs
+        self.sim_seconds = 0.0
+        self.operator_seconds = 0.0
+        self.records: List[dict] = []
+        self._file = None
+        self.begin()
+
+    def begin(self, evaluations: int = 0):
+        """Start the rate clocks (call again after restoring a checkpoint)."""
+        now = time.perf_counter()
+        self._t0 = now
+        self._eval0 = evaluations
+        self._last = (now, evaluations)
+
+    @contextmanager
+    def timing(self, bucket: str):
+        """Add the block's wall time to "sim" or "operator"."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - t0
+            if bucket == "sim":
+                self.sim_seconds += elapsed
+            else:
+                self.operator_seconds += elapsed
+
+    def record(self, generation: int, eval_stats, best_score: float,
+               genotypes: Optional[Sequence[Hashable]] = None,
+               distance: Optional[Callable[[Hashable, Hashable], float]] = None,
+               cache_hits: Optional[int] = None,
+               cache_lookups: Optional[int] = None,
+               **extra) -> dict:
+        """Build, store and (with a path) write one generation's record."""
+        now = time.perf_counter()
+        evaluations = eval_stats.evaluations
+        last_t, last_evals = self._last
+        self._last = (now, evaluations)
+        busy = self.sim_seconds + self.operator_seconds
+        rec = {
+            "time": round(time.time(), 3),
+            "elapsed": round(now - self._t0, 3),
+            "generation": generation,
+            "best_score": round(best_score, 4),
+            "evaluations": evaluations,
+            "evals_per_sec": round((evaluations - last_evals) / max(now - last_t, 1e-9), 2),
+            "evals_per_sec_total": round((evaluations - self._eval0)
+                                         / max(now - self._t0, 1e-9), 2),
+            "sim_seconds": round(self.sim_seconds, 3),
+            "operator_seconds": round(self.operator_seconds, 3),
+            "sim_share": round(self.sim_seconds / busy, 3) if busy else None,
+            **eval_stats.as_dict(),
+        }
+        if self.run_id:
+            rec["run"] = self.run_id
+        if cache_lookups is not None:
+            rec["cache_hits"] = cache_hits
+            rec["cache_hit_rate"] = round(cache_hits / cache_lookups, 3) if cache_lookups else 0.0
+        if genotypes is not None and distance is not None:
+            rec.update(population_diversity(genotypes, distance, self.diversity_pairs,
+                                            seed=generation))
+        rec.update(extra)
+
+        self.records.append(rec)
+        if self.path is not None:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, "a")
+            self._file.write(json.dumps(rec) + "\n")
+            self._file.flush()
+        return rec
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
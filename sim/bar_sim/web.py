@@ -8,32 +8,46 @@ Usage:
     python cli.py web [--port 8080]
 """
 
-import copy
 import json
 import queue
+import re
 import threading
+import time
+import uuid
 from dataclasses import asdict
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
 from bar_sim.models import (
-    BuildOrder, BuildAction, BuildActionType, MapConfig, SimResult,
+    BuildOrder, BuildActionType, MapConfig, SimResult, build_action,
+    Milestone, SimEvent, Snapshot, StallEvent,
 )
 from bar_sim.engine import SimulationEngine
-from bar_sim.io import load_build_order, save_build_order
-from bar_sim.econ import UNITS, set_faction
-from bar_sim.optimizer import Optimizer, make_goal
+from bar_sim.cache import ResultCache
+from bar_sim.columnar import (
+    MEDIA_TYPES, encode_payload, encode_result, format_available,
+    negotiate_format, result_to_columnar,
+)
+from bar_sim.io import (
+    clear_build_order_cache, index_build_orders, load_build_order, save_build_order,
+)
+from bar_sim.econ import get_catalog, get_faction
+from bar_sim.checkpoint import load_checkpoint
+from bar_sim.library import BuildOrderLibrary
+from bar_sim.optimizer import OPERATOR_SELECTION, PRUNE_MODES, Optimizer, make_goal
+from bar_sim.telemetry import Telemetry
 
 # Paths
 STATIC_DIR = Path(__file__).parent / "static"
 DATA_DIR = Path(__file__).parent.parent / "data"
 BUILD_ORDERS_DIR = DATA_DIR / "build_orders"
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
 
 app = FastAPI(title="BAR Build Order Simulator")
 
@@ -67,12 +81,18 @@ class SimulateRequest(BaseModel):
     duration: int = 600
     engine: str = "python"  # "python" or "headless"
     map_name: Optional[str] = None  # auto-resolve MapConfig from map data
+    faction: Optional[str] = None  # defaults to the server faction
+
+
+class StreamSimulateRequest(SimulateRequest):
+    stop_on: Optional[str] = None  # milestone event that ends the run early
 
 
 class CompareRequest(BaseModel):
     build_orders: list[BuildOrderIn] = []
     filenames: list[str] = []
     duration: int = 600
+    faction: Optional[str] = None
 
 
 class OptimizeRequest(BaseModel):
@@ -83,6 +103,14 @@ class OptimizeRequest(BaseModel):
     generations: int = 100
     pop_size: int = 60
     start_from: Optional[str] = None
+    result_format: str = "json"  # "json" or "columnar" for the complete event
+    faction: Optional[str] = None
+    prune: str = "population"  # "off", "population" or "elite"
+    operator_selection: str = "uniform"  # or "adaptive"
+    job_id: Optional[str] = None  # resume this job's checkpoint if it exists
+    map_name: Optional[str] = None  # overrides map_config with the map's data
+    from_library: bool = False  # answer from the precomputed library (needs map_name)
+    refine_generations: int = 0  # with from_library, refine the entry with a short GA
 
 
 class SaveRequest(BaseModel):
@@ -98,6 +126,21 @@ class FactionRequest(BaseModel):
 # Helpers
 # ---------------------------------------------------------------------------
 
+FACTIONS = ("ARMADA", "CORTEX")
+
+# Faction used when a request doesn't name one. /api/faction changes only
+# this default; every request resolves its own read-only UnitCatalog, so
+# ARMADA and CORTEX simulations can run side by side.
+_default_faction: Optional[str] = None
+
+
+def _resolve_faction(faction: Optional[str]) -> str:
+    faction = (faction or _default_faction or get_faction()).upper()
+    if faction not in FACTIONS:
+        raise HTTPException(400, "Faction must be armada or cortex")
+    return faction
+
+
 def _bo_from_input(bo_in: BuildOrderIn) -> BuildOrder:
     """Convert Pydantic model to internal BuildOrder."""
     mc = MapConfig(
@@ -111,48 +154,51 @@ def _bo_from_input(bo_in: BuildOrderIn) -> BuildOrder:
     )
     bo = BuildOrder(name=bo_in.name, description=bo_in.description, map_config=mc)
     for key in bo_in.commander_queue:
-        bo.commander_queue.append(BuildAction(unit_key=key))
+        bo.commander_queue.append(build_action(unit_key=key))
     for fid, keys in bo_in.factory_queues.items():
         bo.factory_queues[fid] = [
-            BuildAction(unit_key=k, action_type=BuildActionType.PRODUCE_UNIT)
+            build_action(unit_key=k, action_type=BuildActionType.PRODUCE_UNIT)
             for k in keys
         ]
     for cid, keys in bo_in.constructor_queues.items():
         bo.constructor_queues[cid] = [
-            BuildAction(unit_key=k) for k in keys
+            build_action(unit_key=k) for k in keys
         ]
     return bo
 
 
+def _milestone_to_dict(m: Milestone) -> dict:
+    return {"tick": m.tick, "event": m.event, "description": m.description,
+            "metal_income": m.metal_income, "energy_income": m.energy_income}
+
+
+def _stall_to_dict(s: StallEvent) -> dict:
+    return {"start_tick": s.start_tick, "end_tick": s.end_tick,
+            "resource": s.resource, "severity": s.severity}
+
+
+def _snapshot_to_dict(s: Snapshot) -> dict:
+    return {"tick": s.tick, "metal_income": s.metal_income,
+            "energy_income": s.energy_income, "metal_stored": s.metal_stored,
+            "energy_stored": s.energy_stored,
+            "metal_expenditure": s.metal_expenditure,
+            "energy_expenditure": s.energy_expenditure,
+            "build_power": s.build_power, "army_value_metal": s.army_value_metal,
+            "stall_factor": s.stall_factor, "unit_counts": s.unit_counts}
+
+
 def _result_to_dict(result: SimResult) -> dict:
     """Convert SimResult to JSON-serializable dict."""
     return {
         "build_order_name": result.build_order_name,
         "total_ticks": result.total_ticks,
-        "milestones": [
-            {"tick": m.tick, "event": m.event, "description": m.description,
-             "metal_income": m.metal_income, "energy_income": m.energy_income}
-            for m in result.milestones
-        ],
-        "stall_events": [
-            {"start_tick": s.start_tick, "end_tick": s.end_tick,
-             "resource": s.resource, "severity": s.severity}
-            for s in result.stall_events
-        ],
+        "milestones": [_milestone_to_dict(m) for m in result.milestones],
+        "stall_events": [_stall_to_dict(s) for s in result.stall_events],
         "completion_log": [
             {"tick": t, "unit_key": u, "builder_id": b}
             for t, u, b in result.completion_log
         ],
-        "snapshots": [
-            {"tick": s.tick, "metal_income": s.metal_income,
-             "energy_income": s.energy_income, "metal_stored": s.metal_stored,
-             "energy_stored": s.energy_stored,
-             "metal_expenditure": s.metal_expenditure,
-             "energy_expenditure": s.energy_expenditure,
-             "build_power": s.build_power, "army_value_metal": s.army_value_metal,
-             "stall_factor": s.stall_factor, "unit_counts": s.unit_counts}
-            for s in result.snapshots
-        ],
+        "snapshots": [_snapshot_to_dict(s) for s in result.snapshots],
         "time_to_first_factory": result.time_to_first_factory,
         "time_to_first_constructor": result.time_to_first_constructor,
         "time_to_first_nano": result.time_to_first_nano,
@@ -165,6 +211,64 @@ def _result_to_dict(result: SimResult) -> dict:
     }
 
 
+def _negotiate(request: Request, allowed=tuple(MEDIA_TYPES)) -> str:
+    """Resolve the response format from the Accept header (406 if unsupported)."""
+    fmt = negotiate_format(request.headers.get("accept"),
+                           supported=[f for f in allowed if format_available(f)])
+    if fmt is None:
+        raise HTTPException(406, f"Acceptable formats: "
+                                 f"{', '.join(MEDIA_TYPES[f] for f in allowed)}")
+    return fmt
+
+
+def _result_payload(result: SimResult, fmt: str) -> Tuple[bytes, str]:
+    """Encode a result for the negotiated format: (body, media_type)."""
+    if fmt == "json":
+        return encode_payload(_result_to_dict(result), "json"), MEDIA_TYPES["json"]
+    return encode_result(result, fmt), MEDIA_TYPES[fmt]
+
+
+# ---------------------------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------------------------
+
+# Deterministic endpoints answer repeated requests from here. Keys cover the
+# canonical request, the negotiated format, the resolved faction and the mtime
+# of any file the response was derived from; /api/save and map scans clear it
+# (which also retires every ETag handed out so far).
+_response_cache = ResultCache(max_entries=256)
+_library = BuildOrderLibrary()
+
+
+def _file_stamp(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _cached_response(request: Request, key_parts: tuple,
+                     compute: Callable[[], Tuple[bytes, str]]) -> Response:
+    """Serve from the response cache with ETag / If-None-Match support."""
+    key = _response_cache.key(request.url.path, *key_parts)
+    etag = f'"{key[:32]}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [t.strip() for t in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers=headers)
+
+    cached = _response_cache.get(key)
+    if cached is None:
+        cached = compute()
+        _response_cache.put(key, cached)
+        headers["X-Cache"] = "miss"
+    else:
+        headers["X-Cache"] = "hit"
+    body, media_type = cached
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
 def _bo_to_dict(bo: BuildOrder) -> dict:
     """Convert BuildOrder to JSON-serializable dict for the editor."""
     return {
@@ -196,11 +300,12 @@ def _bo_to_dict(bo: BuildOrder) -> dict:
 # ---------------------------------------------------------------------------
 
 @app.get("/api/units")
-def api_units():
-    """Return unit catalog for current faction."""
+def api_units(faction: Optional[str] = None):
+    """Return unit catalog for the given (or default) faction."""
     from bar_sim.optimizer import COMMANDER_POOL, FACTORY_PRODUCIBLE, CON_POOL
+    catalog = get_catalog(_resolve_faction(faction))
     result = {}
-    for key, u in sorted(UNITS.items()):
+    for key, u in sorted(catalog.items()):
         result[key] = {
             "name": u.name,
             "metal_cost": u.metal_cost,
@@ -214,6 +319,7 @@ def api_units():
             "notes": u.notes,
         }
     return {
+        "faction": catalog.faction,
         "units": result,
         "pools": {
             "commander": COMMANDER_POOL,
@@ -225,37 +331,40 @@ def api_units():
 
 @app.get("/api/build-orders")
 def api_build_orders():
-    """List saved YAML files."""
-    files = []
-    if BUILD_ORDERS_DIR.exists():
-        for f in sorted(BUILD_ORDERS_DIR.glob("*.yaml")):
-            files.append({"filename": f.name, "stem": f.stem})
-    return {"build_orders": files}
+    """List saved YAML files with their name, map and queue sizes."""
+    return {"build_orders": index_build_orders(BUILD_ORDERS_DIR)}
 
 
 @app.get("/api/build-orders/{filename}")
-def api_build_order_detail(filename: str):
+def api_build_order_detail(filename: str, request: Request):
     """Load a specific build order."""
     filepath = BUILD_ORDERS_DIR / filename
     if not filepath.exists():
         raise HTTPException(404, f"Build order not found: {filename}")
-    bo = load_build_order(str(filepath))
-    return _bo_to_dict(bo)
 
+    def compute():
+        bo = load_build_order(str(filepath))
+        return encode_payload(_bo_to_dict(bo), "json"), MEDIA_TYPES["json"]
 
-@app.post("/api/simulate")
-def api_simulate(req: SimulateRequest):
-    """Run simulation and return result."""
+    return _cached_response(request, (filename, _file_stamp(filepath)), compute)
+
+
+def _check_simulate_request(req: SimulateRequest):
     if req.filename:
         filepath = BUILD_ORDERS_DIR / req.filename
         if not filepath.exists():
             raise HTTPException(404, f"Build order not found: {req.filename}")
-        bo = load_build_order(str(filepath))
-    elif req.build_order:
-        bo = _bo_from_input(req.build_order)
-    else:
+    elif not req.build_order:
         raise HTTPException(400, "Provide either build_order or filename")
 
+
+def _simulate_build_order(req: SimulateRequest) -> BuildOrder:
+    """Load the build order a simulate request refers to."""
+    if req.filename:
+        bo = load_build_order(str(BUILD_ORDERS_DIR / req.filename))
+    else:
+        bo = _bo_from_input(req.build_order)
+
     # Auto-resolve map config from map name
     if req.map_name:
         try:
@@ -266,38 +375,115 @@ def api_simulate(req: SimulateRequest):
                 bo.map_name = req.map_name
         except Exception:
             pass
+    return bo
+
+
+def _event_to_dict(event: SimEvent) -> dict:
+    if event.kind == "snapshot":
+        return _snapshot_to_dict(event.data)
+    if event.kind == "milestone":
+        return _milestone_to_dict(event.data)
+    if event.kind == "stall":
+        return _stall_to_dict(event.data)
+    tick, description = event.data
+    return {"tick": tick, "description": description}
+
+
+@app.post("/api/simulate")
+def api_simulate(req: SimulateRequest, request: Request):
+    """Run simulation and return result (format negotiated via Accept)."""
+    fmt = _negotiate(request)
+    faction = _resolve_faction(req.faction)
+    _check_simulate_request(req)
+
+    def compute():
+        bo = _simulate_build_order(req)
 
+        if req.engine == "headless":
+            from bar_sim.headless import HeadlessEngine
+            try:
+                headless = HeadlessEngine(map_name=req.map_name or "delta_siege_dry_v5.7.1")
+                result = headless.run(bo, req.duration, faction=faction)
+            except (FileNotFoundError, RuntimeError) as e:
+                raise HTTPException(500, f"Headless engine error: {e}")
+        else:
+            engine = SimulationEngine(bo, req.duration, catalog=get_catalog(faction))
+            result = engine.run()
+        return _result_payload(result, fmt)
+
+    # The headless engine runs the real game and is not reproducible
     if req.engine == "headless":
-        from bar_sim.headless import HeadlessEngine
+        body, media_type = compute()
+        return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+
+    stamp = _file_stamp(BUILD_ORDERS_DIR / req.filename) if req.filename else None
+    return _cached_response(request, (req.model_dump(exclude={"faction"}), faction, fmt, stamp), compute)
+
+
+@app.post("/api/simulate/stream")
+def api_simulate_stream(req: StreamSimulateRequest):
+    """Run a simulation and stream its events over SSE as they happen.
+
+    Emits snapshot / milestone / stall / goal events, then a "complete"
+    event with the result summary (snapshots are not repeated). The run
+    stops early at the `stop_on` milestone or when the client disconnects.
+    """
+    if req.engine != "python":
+        raise HTTPException(400, "Streaming is only supported for the python engine")
+    faction = _resolve_faction(req.faction)
+    _check_simulate_request(req)
+    bo = _simulate_build_order(req)
+    engine = SimulationEngine(bo, req.duration, catalog=get_catalog(faction),
+                              keep_snapshots=False)
+
+    def event_stream():
+        events = engine.iter_run()
         try:
-            headless = HeadlessEngine(map_name=req.map_name or "delta_siege_dry_v5.7.1")
-            result = headless.run(bo, req.duration)
-        except (FileNotFoundError, RuntimeError) as e:
-            raise HTTPException(500, f"Headless engine error: {e}")
-    else:
-        engine = SimulationEngine(bo, req.duration)
-        result = engine.run()
-    return _result_to_dict(result)
+            for event in events:
+                yield f"event: {event.kind}\ndata: {json.dumps(_event_to_dict(event))}\n\n"
+                if (req.stop_on and event.kind == "milestone"
+                        and event.data.event == req.stop_on):
+                    break
+        finally:
+            events.close()
+        summary = _result_to_dict(engine.finish())
+        del summary["snapshots"]
+        yield f"event: complete\ndata: {json.dumps(summary)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/api/compare")
-def api_compare(req: CompareRequest):
+def api_compare(req: CompareRequest, request: Request):
     """Simulate multiple BOs and return all results."""
-    results = []
+    fmt = _negotiate(request, allowed=("json", "columnar", "msgpack"))
+    to_dict = _result_to_dict if fmt == "json" else result_to_columnar
+    faction = _resolve_faction(req.faction)
 
-    for bo_in in req.build_orders:
-        bo = _bo_from_input(bo_in)
-        engine = SimulationEngine(bo, req.duration)
-        results.append(_result_to_dict(engine.run()))
+    def compute():
+        catalog = get_catalog(faction)
+        results = []
 
-    for fname in req.filenames:
-        filepath = BUILD_ORDERS_DIR / fname
-        if filepath.exists():
-            bo = load_build_order(str(filepath))
-            engine = SimulationEngine(bo, req.duration)
-            results.append(_result_to_dict(engine.run()))
+        for bo_in in req.build_orders:
+            bo = _bo_from_input(bo_in)
+            engine = SimulationEngine(bo, req.duration, catalog=catalog)
+            results.append(to_dict(engine.run()))
+
+        for fname in req.filenames:
+            filepath = BUILD_ORDERS_DIR / fname
+            if filepath.exists():
+                bo = load_build_order(str(filepath))
+                engine = SimulationEngine(bo, req.duration, catalog=catalog)
+                results.append(to_dict(engine.run()))
+
+        return encode_payload({"results": results}, fmt), MEDIA_TYPES[fmt]
 
-    return {"results": results}
+    stamps = [_file_stamp(BUILD_ORDERS_DIR / f) for f in req.filenames]
+    return _cached_response(request, (req.model_dump(exclude={"faction"}), faction, fmt, stamps), compute)
 
 
 @app.post("/api/save")
@@ -309,17 +495,17 @@ def api_save(req: SaveRequest):
         filename += ".yaml"
     filepath = BUILD_ORDERS_DIR / filename
     save_build_order(bo, str(filepath))
+    _response_cache.clear()
     return {"saved": filename}
 
 
 @app.post("/api/faction")
 def api_faction(req: FactionRequest):
-    """Switch faction."""
-    faction = req.faction.upper()
-    if faction not in ("ARMADA", "CORTEX"):
-        raise HTTPException(400, "Faction must be armada or cortex")
-    set_faction(faction)
-    return {"faction": faction, "unit_count": len(UNITS)}
+    """Switch the default faction for requests that don't name one."""
+    global _default_faction
+    faction = _resolve_faction(req.faction)
+    _default_faction = faction
+    return {"faction": faction, "unit_count": len(get_catalog(faction))}
 
 
 # ---------------------------------------------------------------------------
@@ -342,8 +528,15 @@ def api_maps():
 
 
 @app.get("/api/maps/{name}")
-def api_map_detail(name: str):
+def api_map_detail(name: str, request: Request):
     """Get detailed map data (from cache + static parse)."""
+    def compute():
+        return encode_payload(_map_detail(name), "json"), MEDIA_TYPES["json"]
+
+    return _cached_response(request, (name,), compute)
+
+
+def _map_detail(name: str) -> dict:
     from bar_sim.map_data import get_map_data, map_data_to_map_config
     md = get_map_data(name)
     if not md:
@@ -386,6 +579,8 @@ def api_map_scan(name: str):
         from bar_sim.headless import HeadlessEngine
         he = HeadlessEngine()
         md = he.scan_map(name)
+        _response_cache.clear()
+        clear_build_order_cache()  # map_name files resolve against the new scan
         return {
             "status": "ok",
             "name": md.name,
@@ -401,16 +596,101 @@ def api_map_scan(name: str):
         raise HTTPException(500, str(e))
 
 
+_JOB_ID = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+_running_jobs = set()
+_running_jobs_lock = threading.Lock()
+
+# Checkpoints of jobs that never finished are kept this long for resuming
+CHECKPOINT_MAX_AGE = 7 * 24 * 3600
+
+
+def _prune_checkpoints(max_age: float = CHECKPOINT_MAX_AGE):
+    """Delete abandoned job checkpoints older than max_age seconds."""
+    if not CHECKPOINT_DIR.exists():
+        return
+    cutoff = time.time() - max_age
+    with _running_jobs_lock:
+        running = set(_running_jobs)
+    for path in CHECKPOINT_DIR.glob("*.ckpt"):
+        try:
+            if path.stem not in running and path.stat().st_mtime < cutoff:
+                path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _claim_job(job_id: Optional[str], goal_name: str) -> Tuple[str, Path, bool]:
+    """Reserve a job id; returns (job_id, checkpoint path, resuming)."""
+    _prune_checkpoints()
+    job_id = job_id or uuid.uuid4().hex[:12]
+    if not _JOB_ID.match(job_id):
+        raise HTTPException(400, "job_id may only contain letters, digits, '-' and '_'")
+    checkpoint = CHECKPOINT_DIR / f"{job_id}.ckpt"
+    resuming = checkpoint.exists()
+    if resuming and load_checkpoint(checkpoint)["goal"] != goal_name:
+        raise HTTPException(409, f"Job {job_id} was started with a different goal")
+    with _running_jobs_lock:
+        if job_id in _running_jobs:
+            raise HTTPException(409, f"Job {job_id} is already running")
+        _running_jobs.add(job_id)
+    return job_id, checkpoint, resuming
+
+
+def _sse_response(progress_queue: queue.Queue) -> StreamingResponse:
+    """Stream (event, data) pairs from the queue until "complete"."""
+    def event_stream():
+        while True:
+            try:
+                event_type, data = progress_queue.get(timeout=60)
+                yield f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+                if event_type == "complete":
+                    break
+            except queue.Empty:
+                yield f"event: ping\ndata: {{}}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/api/optimize")
 def api_optimize(req: OptimizeRequest):
-    """Start GA optimization with SSE streaming."""
-    mc = MapConfig(
-        avg_wind=req.map_config.avg_wind,
-        mex_value=req.map_config.mex_value,
-        mex_spots=req.map_config.mex_spots,
-        has_geo=req.map_config.has_geo,
-    )
+    """Start GA optimization with SSE streaming.
+
+    Every run checkpoints under data/checkpoints/<job_id>.ckpt. The first
+    event reports the job id; posting the same request with that job_id
+    continues the run from its last checkpoint. The checkpoint is deleted
+    once the run completes; unfinished ones expire after CHECKPOINT_MAX_AGE.
+    Each progress event carries a "telemetry" record (see telemetry.py).
+
+    With from_library and a stored entry for map_name/goal, the stream is
+    a single complete event carrying the entry ("library"), unless
+    refine_generations asks for a short GA seeded with it. Without an
+    entry the full GA runs and the job event reports "library": null.
+    """
+    if req.map_name:
+        from bar_sim.map_data import get_map_data, map_data_to_map_config
+        md = get_map_data(req.map_name)
+        if not md:
+            raise HTTPException(404, f"Map not found: {req.map_name}")
+        mc = map_data_to_map_config(md)
+    else:
+        mc = MapConfig(
+            avg_wind=req.map_config.avg_wind,
+            mex_value=req.map_config.mex_value,
+            mex_spots=req.map_config.mex_spots,
+            has_geo=req.map_config.has_geo,
+        )
     goal = make_goal(req.goal, target_time=req.target_time)
+    faction = _resolve_faction(req.faction)
+    catalog = get_catalog(faction)
+    if req.prune not in PRUNE_MODES:
+        raise HTTPException(400, f"prune must be one of {', '.join(PRUNE_MODES)}")
+    if req.operator_selection not in OPERATOR_SELECTION:
+        raise HTTPException(400, "operator_selection must be one of "
+                                 f"{', '.join(OPERATOR_SELECTION)}")
 
     initial_bo = None
     if req.start_from:
@@ -419,146 +699,88 @@ def api_optimize(req: OptimizeRequest):
             initial_bo = load_build_order(str(filepath))
             initial_bo.map_config = mc
 
+    to_dict = result_to_columnar if req.result_format == "columnar" else _result_to_dict
+    generations = req.generations
+    job_info = {}
+    if req.from_library:
+        if not req.map_name:
+            raise HTTPException(400, "from_library needs map_name")
+        entry = _library.lookup(req.map_name, req.goal, req.target_time, req.duration, faction)
+        job_info["library"] = asdict(entry) if entry else None
+        if entry:
+            initial_bo = _library.build_order(entry)
+            initial_bo.map_config = mc
+            if req.refine_generations <= 0:
+                result = SimulationEngine(initial_bo, req.duration, catalog=catalog).run()
+                answer = queue.Queue()
+                answer.put(("complete", {
+                    "job_id": None,
+                    **job_info,
+                    "build_order": _bo_to_dict(initial_bo),
+                    "result": to_dict(result),
+                    "history": [],
+                }))
+                return _sse_response(answer)
+            generations = req.refine_generations
+
+    job_id, checkpoint, resuming = _claim_job(req.job_id, goal.name)
     progress_queue = queue.Queue()
+    progress_queue.put(("job", {"job_id": job_id, "resumed": resuming, **job_info}))
     cancel_event = threading.Event()
 
     def run_optimizer():
+        try:
+            optimize_job()
+        finally:
+            with _running_jobs_lock:
+                _running_jobs.discard(job_id)
+
+    def optimize_job():
         opt = Optimizer(
             goal=goal,
             map_config=mc,
             duration=req.duration,
             population_size=req.pop_size,
-            max_generations=req.generations,
+            max_generations=generations,
             verbose=False,
+            catalog=catalog,
+            prune=req.prune,
+            telemetry=Telemetry(run_id=job_id),
+            operator_selection=req.operator_selection,
         )
 
-        # Monkey-patch to capture progress
-        original_optimize = opt.optimize.__func__
-
-        # We'll run a simplified version that reports progress
-        import copy as _copy
-        import time as _time
-        import random as _random
-
-        from bar_sim.optimizer import (
-            greedy_seed, random_seed, enforce_constraints, MUTATIONS,
-            _crossover_one_point, _crossover_uniform,
-        )
-
-        # Init population
-        pop = opt._init_population(initial_bo)
-        best_score, best_bo = opt._best_of(pop)
-        opt.history.append(best_score)
-
-        progress_queue.put(("progress", {
-            "generation": 0,
-            "best_score": best_score,
-            "gen_best": best_score,
-            "mutation_rate": opt.base_mutation_rate,
-            "stagnation": 0,
-            "total_generations": opt.max_generations,
-        }))
-
-        mutation_rate = opt.base_mutation_rate
-        stagnation = 0
-
-        for gen in range(opt.max_generations):
-            if cancel_event.is_set():
-                break
-
-            if opt.goal.higher_is_better:
-                pop.sort(key=lambda x: x[0], reverse=True)
-            else:
-                pop.sort(key=lambda x: x[0])
-
-            gen_best_score = pop[0][0]
-
-            if opt.goal.is_better(gen_best_score, best_score):
-                best_score = gen_best_score
-                best_bo = _copy.deepcopy(pop[0][1])
-                stagnation = 0
-            else:
-                stagnation += 1
-
-            opt.history.append(best_score)
-
-            # Report progress
+        def on_progress(info: dict) -> bool:
             progress_queue.put(("progress", {
-                "generation": gen + 1,
-                "best_score": round(best_score, 2),
-                "gen_best": round(gen_best_score, 2),
-                "mutation_rate": round(mutation_rate, 3),
-                "stagnation": stagnation,
-                "total_generations": opt.max_generations,
+                **info,
+                "best_score": round(info["best_score"], 2),
+                "gen_best": round(info["gen_best"], 2),
+                "mutation_rate": round(info["mutation_rate"], 3),
             }))
+            return cancel_event.is_set()
 
-            # Stagnation handling
-            if stagnation >= opt.catastrophe_limit:
-                pop = opt._init_population(best_bo)
-                mutation_rate = opt.base_mutation_rate
-                stagnation = 0
-                continue
-            elif stagnation >= opt.stagnation_limit:
-                mutation_rate = opt.hyper_mutation_rate
-            else:
-                mutation_rate = max(0.05, mutation_rate * opt.mutation_decay)
-
-            # Build next generation
-            new_pop = list(pop[:opt.elitism_count])
-            while len(new_pop) < opt.population_size:
-                p1 = opt._tournament_select(pop)
-                p2 = opt._tournament_select(pop)
-                if opt.rng.random() < opt.crossover_rate:
-                    if opt.rng.random() < 0.7:
-                        c1, c2 = _crossover_one_point(p1, p2, opt.rng)
-                    else:
-                        c1, c2 = _crossover_uniform(p1, p2, opt.rng)
-                else:
-                    c1, c2 = p1, p2
-
-                for child in (c1, c2):
-                    if len(new_pop) >= opt.population_size:
-                        break
-                    if opt.rng.random() < mutation_rate:
-                        n_muts = 1 if mutation_rate < 0.6 else opt.rng.randint(1, 3)
-                        for _ in range(n_muts):
-                            mut = opt.rng.choice(MUTATIONS)
-                            child = mut(child, opt.rng)
-                    child = enforce_constraints(child, opt.map_config)
-                    score = opt._evaluate(child)
-                    new_pop.append((score, child))
-
-            pop = new_pop[:opt.population_size]
+        best_bo = opt.optimize(initial_bo, progress_callback=on_progress,
+                               checkpoint_path=str(checkpoint), resume=True)
+        if not cancel_event.is_set():
+            # Finished runs have nothing left to resume
+            checkpoint.unlink(missing_ok=True)
 
         # Final result
         best_bo.name = f"Optimized ({opt.goal.name})"
-        engine = SimulationEngine(best_bo, req.duration)
+        engine = SimulationEngine(best_bo, req.duration, catalog=catalog)
         final_result = engine.run()
 
         progress_queue.put(("complete", {
+            "job_id": job_id,
+            **job_info,
             "build_order": _bo_to_dict(best_bo),
-            "result": _result_to_dict(final_result),
+            "result": to_dict(final_result),
             "history": [round(h, 2) for h in opt.history],
         }))
 
     thread = threading.Thread(target=run_optimizer, daemon=True)
     thread.start()
 
-    def event_stream():
-        while True:
-            try:
-                event_type, data = progress_queue.get(timeout=60)
-                yield f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
-                if event_type == "complete":
-                    break
-            except queue.Empty:
-                yield f"event: ping\ndata: {{}}\n\n"
-
-    return StreamingResponse(
-        event_stream(),
-        media_type="text/event-stream",
-        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
-    )
+    return _sse_response(progress_queue)
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,66 @@
+"""
+BAR Build Order Simulator - Wind Traces
+=========================================
+Precomputed per-tick wind speed, shared by every run with the same wind
+parameters and seed.
+
+Wind used to be drawn tick by tick from the engine's RNG, so any other
+random draw added to the engine would shift every later wind value.
+Traces come from their own RNG instead: candidates evaluated with the
+same map and seed see identical wind (common random numbers), and a run
+only indexes a tuple per tick.
+
+Traces are built once per process and cached; they are a few KB, so
+worker processes rebuild their own rather than sharing memory.
+"""
+
+import math
+import random
+import threading
+from typing import Dict, Tuple
+
+# Distinct (avg_wind, wind_variance, seed) traces kept per process
+MAX_TRACES = 64
+
+_traces: Dict[Tuple[float, float, int], Tuple[float, ...]] = {}
+_traces_lock = threading.Lock()
+
+
+def generate_wind_trace(avg_wind: float, wind_variance: float, seed: int,
+                        ticks: int) -> Tuple[float, ...]:
+    """Wind speed for ticks 1..ticks (index tick - 1), clamped to 0-25.
+
+    A slow sine around avg_wind plus uniform noise of +-30% of the variance.
+    """
+    rng = random.Random(seed)
+    spread = wind_variance * 0.3
+    trace = []
+    for tick in range(1, ticks + 1):
+        base = avg_wind + wind_variance * math.sin(tick * 0.05)
+        noise = rng.uniform(-spread, spread)
+        trace.append(max(0, min(25, base + noise)))
+    return tuple(trace)
+
+
+def wind_trace(avg_wind: float, wind_variance: float, seed: int,
+               ticks: int) -> Tuple[float, ...]:
+    """Shared, read-only trace covering at least `ticks` ticks.
+
+    A longer cached trace is returned as is: every trace for a key is a
+    prefix of the longer ones.
+    """
+    key = (avg_wind, wind_variance, seed)
+    trace = _traces.get(key)
+    if trace is None or len(trace) < ticks:
+        with _traces_lock:
+            trace = _traces.get(key)
+            if trace is None or len(trace) < ticks:
+                trace = generate_wind_trace(avg_wind, wind_variance, seed, ticks)
+                if key not in _traces and len(_traces) >= MAX_TRACES:
+                    del _traces[next(iter(_traces))]
+                _traces[key] = trace
+    return trace
+
+
+def clear_cache():
+    _traces.clear()
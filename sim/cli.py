@@ -2,10 +2,26 @@
 BAR Build Order Simulator - CLI Entry Point
 =============================================
 Usage:
-    python cli.py simulate <file> [--duration 600] [--export-json out.json]
+    python cli.py simulate <file> [--duration 600] [--export-json out.json] [--export-result out.json]
+    python cli.py simulate <file> --profile [--profile-out stacks.folded]
+    python cli.py simulate <file> --snapshot-interval 10
+    python cli.py simulate <file> --ensemble 32 [--workers 4]
     python cli.py compare <file1> <file2> [...]
     python cli.py interactive
     python cli.py optimize --goal max_metal [--target-time 300] [--export-json out.json]
+    python cli.py optimize --goal max_metal --islands 4 [--listen 127.0.0.1:7100]
+    python cli.py optimize --goal max_metal --checkpoint run.ckpt [--resume]
+    python cli.py optimize --goal max_metal --telemetry run.jsonl
+    python cli.py optimize --goal balanced --maps a,b --seeds 1,2,3 [--aggregate cvar] [--workers 4]
+    python cli.py optimize --goal max_metal --map delta_siege_dry --from-library [--refine 10]
+    python cli.py library build [--maps a,b] [--goals max_metal,balanced] [--workers 4]
+    python cli.py library list
+    python cli.py pareto --goals fastest_factory,max_metal,min_stall [--output-dir DIR]
+    python cli.py sweep --param avg_wind=4:20:9 --param energy_strategy=* --output sweep.csv
+    python cli.py sweep --param mex_value=1:4 --param opening_mex_count=1:4 --lhs 200 \
+                        --shard 0/4 --workers 8 --output part0.parquet
+    python cli.py island-worker --connect host:7100 --authkey SECRET
+    python cli.py bench [--only engine,optimizer] [--output report.json] [--save-baseline]
 """
 
 import argparse
@@ -13,10 +29,11 @@ import sys
 
 from bar_sim.io import load_build_order
 from bar_sim.engine import SimulationEngine
+from bar_sim.econ import get_catalog
 from bar_sim.format import print_full_report
 from bar_sim.compare import compare_and_print
 from bar_sim.optimizer import Optimizer, make_goal
-from bar_sim.models import MapConfig
+from bar_sim.models import MapConfig, SnapshotConfig
 
 
 def _resolve_map_config(map_name: str) -> MapConfig:
@@ -53,12 +70,25 @@ def cmd_simulate(args):
             bo.strategy_config = StrategyConfig()
             print("[strategy] Auto-enabled strategy mode for goals")
 
+    if args.ensemble:
+        if getattr(args, "engine", "python") != "python":
+            print("Error: --ensemble needs the python engine")
+            sys.exit(1)
+        from bar_sim.ensemble import run_ensemble
+        from bar_sim.format import print_ensemble
+        ens = run_ensemble(bo, runs=args.ensemble, duration=args.duration,
+                           workers=args.workers)
+        print_full_report(ens.base)
+        print_ensemble(ens)
+        return
+
     if getattr(args, "engine", "python") == "headless":
         from bar_sim.headless import HeadlessEngine
         engine = HeadlessEngine(map_name=args.map or "delta_siege_dry_v5.7.1")
         result = engine.run(bo, args.duration, faction=args.faction)
     else:
-        engine = SimulationEngine(bo, args.duration)
+        engine = SimulationEngine(bo, args.duration, profile=args.profile,
+                                  snapshot_config=SnapshotConfig(interval=args.snapshot_interval))
 
         # Add CLI goals to engine's goal queue (if strategy mode)
         if args.goal and engine._strategy_mode and engine._goal_queue:
@@ -77,11 +107,25 @@ def cmd_simulate(args):
         result = engine.run()
     print_full_report(result)
 
+    if result.profile is not None:
+        from bar_sim.format import print_profile
+        print_profile(result)
+        if args.profile_out:
+            with open(args.profile_out, "w") as f:
+                f.write(result.profile.folded())
+            print(f"\nWrote folded stacks to {args.profile_out} "
+                  f"(flamegraph.pl / inferno / speedscope)")
+
     if args.export_json:
         from bar_sim.io import export_build_order_json
         export_build_order_json(bo, args.export_json)
         print(f"\nExported JSON to {args.export_json}")
 
+    if args.export_result:
+        from bar_sim.io import save_result
+        save_result(result, args.export_result)
+        print(f"\nExported result to {args.export_result}")
+
 
 def cmd_compare(args):
     results = []
@@ -181,24 +225,122 @@ def cmd_map(args):
                 print(f"    -> FAILED: {e}")
 
 
-def cmd_optimize(args):
-    from pathlib import Path
+def cmd_library(args):
+    """Handle library build|list subcommands."""
+    from bar_sim.library import LIBRARY_GOALS, BuildOrderLibrary, build_library
+
+    if args.library_action == "list":
+        entries = BuildOrderLibrary().entries()
+        print(f"Library entries: {len(entries)}")
+        print(f"{'Faction':<8} {'Map':<28} {'Goal':<16} {'Target':>6} {'Dur':>5} {'Score':>10} {'GA':>10}")
+        print("-" * 88)
+        for e in entries:
+            print(f"{e.faction.lower():<8} {e.map_name[:27]:<28} {e.goal:<16} {e.target_time:>6} "
+                  f"{e.duration:>5} {e.score:>10.2f} {f'{e.pop_size}x{e.generations}':>10}")
+        return
+
+    maps = args.maps.split(",") if args.maps else None
+    goals = args.goals.split(",") if args.goals else LIBRARY_GOALS
+    unknown = [g for g in goals if g not in LIBRARY_GOALS]
+    if unknown:
+        sys.exit(f"Unknown goal(s): {', '.join(unknown)}. Choose from: {', '.join(LIBRARY_GOALS)}")
+
+    print("=" * 60)
+    print("  BAR BUILD ORDER LIBRARY")
+    print("=" * 60)
+    print(f"  Maps:        {', '.join(maps) if maps else 'all cached'}")
+    print(f"  Goals:       {', '.join(goals)}")
+    print(f"  Target:      {args.target_time}s, duration {args.duration}s")
+    print(f"  GA:          pop={args.pop_size}, generations={args.generations}, "
+          f"workers={args.workers}")
+    print("=" * 60)
 
+    def progress(task, entry, error):
+        if error is not None:
+            print(f"  [failed] {task.map_name}/{task.goal}: {error}")
+        else:
+            print(f"  [stored] {entry.key}: {entry.score:.2f}")
+
+    added = build_library(maps, goals, target_time=args.target_time, duration=args.duration,
+                          generations=args.generations, pop_size=args.pop_size,
+                          workers=args.workers, faction=args.faction, force=args.force,
+                          progress=progress)
+    print(f"\n{len(added)} entries added")
+
+
+def _map_config_from_args(args):
+    """MapConfig and display label from --map or the manual map flags."""
     # If --map is specified, auto-resolve MapConfig from map data
-    map_label = "defaults"
     if args.map:
-        mc = _resolve_map_config(args.map)
-        map_label = args.map
-    else:
-        mc = MapConfig(
-            avg_wind=args.wind,
-            mex_value=args.mex_value,
-            mex_spots=args.mex_spots,
-            has_geo=args.has_geo,
-        )
+        return _resolve_map_config(args.map), args.map
+    return MapConfig(
+        avg_wind=args.wind,
+        mex_value=args.mex_value,
+        mex_spots=args.mex_spots,
+        has_geo=args.has_geo,
+    ), "defaults"
+
+
+def _add_map_args(p):
+    p.add_argument("--wind", type=float, default=12.0,
+                   help="Average wind speed (default: 12.0)")
+    p.add_argument("--mex-value", type=float, default=2.0,
+                   help="Metal extractor value (default: 2.0)")
+    p.add_argument("--mex-spots", type=int, default=6,
+                   help="Available mex spots (default: 6)")
+    p.add_argument("--has-geo", action="store_true",
+                   help="Map has geothermal vent")
+    p.add_argument("--map", default=None,
+                   help="Map name (overrides manual wind/mex/tidal args)")
+
+
+def cmd_optimize(args):
+    from pathlib import Path
+
+    mc, map_label = _map_config_from_args(args)
 
     goal = make_goal(args.goal, target_time=args.target_time)
 
+    # Library mode: answer from the precomputed library, optionally refined
+    library_bo = None
+    if args.from_library:
+        if not args.map:
+            sys.exit("--from-library needs --map NAME")
+        if args.start_from or args.maps or args.seeds:
+            sys.exit("--from-library can't be combined with --start-from/--maps/--seeds")
+        from bar_sim.library import BuildOrderLibrary
+        library = BuildOrderLibrary()
+        entry = library.lookup(args.map, args.goal, args.target_time, args.duration,
+                               args.faction.upper())
+        if entry:
+            print(f"[library] {entry.key}: score {entry.score:.2f} "
+                  f"(pop={entry.pop_size}, generations={entry.generations})")
+            library_bo = library.build_order(entry)
+            library_bo.map_config = mc
+            if args.refine:
+                args.generations = args.refine
+        else:
+            print(f"[library] No entry for {args.map}/{args.goal}, running the full GA")
+
+    # Robust mode: score over every map x wind seed combination
+    scenarios = None
+    if args.resume and not args.checkpoint:
+        sys.exit("--resume needs --checkpoint PATH")
+    if args.checkpoint and args.islands > 1:
+        sys.exit("--checkpoint can't be combined with --islands")
+    if args.telemetry and args.islands > 1:
+        sys.exit("--telemetry can't be combined with --islands")
+    if args.operators != "uniform" and args.islands > 1:
+        sys.exit("--operators adaptive can't be combined with --islands")
+    if args.maps or args.seeds:
+        from bar_sim.robust import make_scenarios
+        if args.islands > 1:
+            sys.exit("--maps/--seeds can't be combined with --islands")
+        map_names = args.maps.split(",") if args.maps else [map_label]
+        configs = [_resolve_map_config(m) for m in map_names] if args.maps else [mc]
+        seeds = [int(x) for x in args.seeds.split(",")] if args.seeds else [42]
+        scenarios = make_scenarios(configs, seeds, map_names)
+
     print("=" * 60)
     print("  BAR BUILD ORDER OPTIMIZER")
     print("=" * 60)
@@ -207,8 +349,14 @@ def cmd_optimize(args):
     print(f"  Wind:        avg={mc.avg_wind}, variance={mc.wind_variance}")
     print(f"  Mex:         {mc.mex_spots} spots x {mc.mex_value} M/s")
     print(f"  Geo:         {'yes' if mc.has_geo else 'no'}")
-    print(f"  GA:          pop={args.pop_size}, generations={args.generations}")
+    if library_bo and not args.refine:
+        print("  GA:          none (library answer)")
+    else:
+        print(f"  GA:          pop={args.pop_size}, generations={args.generations}")
     print(f"  Duration:    {args.duration}s")
+    if scenarios:
+        print(f"  Robust:      {len(scenarios)} scenarios, {args.aggregate}"
+              f"{'' if args.no_race else ', raced'}, workers={args.workers}")
     print("=" * 60)
     print()
 
@@ -218,16 +366,65 @@ def cmd_optimize(args):
         initial_bo = load_build_order(args.start_from)
         initial_bo.map_config = mc
         print(f"Starting from: {initial_bo.name}")
-
-    opt = Optimizer(
-        goal=goal,
-        map_config=mc,
-        duration=args.duration,
-        population_size=args.pop_size,
-        max_generations=args.generations,
-        verbose=True,
-    )
-    best = opt.optimize(initial_bo)
+    elif library_bo:
+        initial_bo = library_bo
+
+    opt = None
+    if library_bo and not args.refine:
+        best = library_bo
+    elif args.islands > 1:
+        from bar_sim.islands import IslandOptimizer
+        if args.authkey and not args.listen:
+            sys.exit("--authkey needs --listen")
+        host, port = _parse_address(args.listen) if args.listen else ("127.0.0.1", 0)
+        try:
+            opt = IslandOptimizer(
+                goal_name=args.goal,
+                map_config=mc,
+                target_time=args.target_time,
+                duration=args.duration,
+                islands=args.islands,
+                population_size=args.pop_size,
+                max_generations=args.generations,
+                migration_interval=args.migration_interval,
+                migrants=args.migrants,
+                prune=args.prune,
+                faction=args.faction.upper(),
+                transport="tcp" if args.listen else "pipe",
+                address=(host, port),
+                local_islands=args.local_islands,
+                authkey=args.authkey.encode() if args.authkey else None,
+            )
+        except ValueError as e:
+            sys.exit(str(e))
+        best = opt.optimize(initial_bo).best_bo
+    else:
+        telemetry = None
+        if args.telemetry:
+            from bar_sim.telemetry import Telemetry
+            telemetry = Telemetry(args.telemetry, run_id=args.goal)
+        opt = Optimizer(
+            goal=goal,
+            map_config=mc,
+            duration=args.duration,
+            population_size=args.pop_size,
+            max_generations=args.generations,
+            verbose=True,
+            prune=args.prune,
+            surrogate_ratio=args.surrogate,
+            scenarios=scenarios,
+            aggregate=args.aggregate,
+            cvar_alpha=args.cvar_alpha,
+            race=not args.no_race,
+            workers=args.workers,
+            telemetry=telemetry,
+            operator_selection=args.operators,
+            catalog=get_catalog(args.faction.upper()),
+        )
+        best = opt.optimize(initial_bo,
+                            checkpoint_path=args.checkpoint,
+                            checkpoint_every=args.checkpoint_every,
+                            resume=args.resume)
 
     # Show the result
     print("\n" + "=" * 60)
@@ -261,6 +458,14 @@ def cmd_optimize(args):
     result = engine.run()
     print_full_report(result)
 
+    if scenarios:
+        from bar_sim.robust import RobustEvaluator
+        scores = RobustEvaluator(goal, scenarios, args.duration,
+                                 catalog=get_catalog(args.faction.upper())).scenario_scores(best)
+        print("\n--- SCENARIO SCORES ---")
+        for sc, score in zip(scenarios, scores):
+            print(f"  {sc.name:<40} {score:>10.2f}")
+
     # Show top N candidates comparison
     top_n = getattr(args, "top", 1)
     if top_n > 1 and hasattr(opt, "top_results") and opt.top_results:
@@ -271,24 +476,23 @@ def cmd_optimize(args):
             sim = SimulationEngine(bo_candidate, args.duration)
             r = sim.run()
             factory_tick = r.time_to_first_factory or "-"
-            metal_300 = "-"
-            for snap in r.snapshots:
-                if snap.tick >= 300:
-                    metal_300 = f"{snap.metal_income:.1f}"
-                    break
+            snap = r.snapshot_at(300) if r.total_ticks >= 300 else None
+            metal_300 = f"{snap.metal_income:.1f}" if snap else "-"
             print(f"{i+1:<4} {score:>10.2f} {str(factory_tick):>10} {metal_300:>10}")
 
     # Auto-save: if --output not specified, save to default path
+    # (library answers are already stored, so only an explicit --output)
     output_path = args.output
-    if not output_path:
+    if not output_path and (not library_bo or args.refine):
         data_dir = Path(__file__).parent / "data" / "build_orders"
         data_dir.mkdir(parents=True, exist_ok=True)
         map_slug = map_label.replace(" ", "_").lower()
         output_path = str(data_dir / f"optimized_{map_slug}_{args.goal}.yaml")
 
-    from bar_sim.io import save_build_order
-    save_build_order(best, output_path)
-    print(f"\nSaved to {output_path}")
+    if output_path:
+        from bar_sim.io import save_build_order
+        save_build_order(best, output_path)
+        print(f"\nSaved to {output_path}")
 
     if args.export_json:
         from bar_sim.io import export_build_order_json
@@ -296,6 +500,163 @@ def cmd_optimize(args):
         print(f"\nExported JSON to {args.export_json}")
 
 
+def cmd_pareto(args):
+    from pathlib import Path
+    from bar_sim.pareto import ParetoOptimizer, save_front
+
+    mc, map_label = _map_config_from_args(args)
+    goal_names = args.goals.split(",")
+    goals = [make_goal(g, target_time=args.target_time) for g in goal_names]
+
+    scenarios = None
+    if args.seeds:
+        from bar_sim.robust import make_scenarios
+        scenarios = make_scenarios([mc], [int(x) for x in args.seeds.split(",")], [map_label])
+
+    print("=" * 60)
+    print("  BAR PARETO OPTIMIZER (NSGA-II)")
+    print("=" * 60)
+    for g in goals:
+        print(f"  Objective:   {g.description}")
+    print(f"  Map:         {map_label}")
+    print(f"  GA:          pop={args.pop_size}, generations={args.generations}")
+    print(f"  Duration:    {args.duration}s")
+    if scenarios:
+        print(f"  Seeds:       {len(scenarios)} ({args.aggregate})")
+    print("=" * 60)
+    print()
+
+    initial_bo = None
+    if args.start_from:
+        initial_bo = load_build_order(args.start_from)
+        initial_bo.map_config = mc
+
+    opt = ParetoOptimizer(
+        goals=goals,
+        map_config=mc,
+        duration=args.duration,
+        population_size=args.pop_size,
+        max_generations=args.generations,
+        scenarios=scenarios,
+        aggregate=args.aggregate,
+        workers=args.workers,
+        catalog=get_catalog(args.faction.upper()),
+    )
+    front = opt.optimize(initial_bo)
+
+    print("\n--- PARETO FRONT ---")
+    print(f"{'#':<4}" + "".join(f"{g:>18}" for g in goal_names))
+    for i, (objectives, _) in enumerate(front, 1):
+        print(f"{i:<4}" + "".join(f"{v:>18.2f}" for v in objectives))
+
+    output_dir = args.output_dir
+    if not output_dir:
+        map_slug = map_label.replace(" ", "_").lower()
+        output_dir = str(Path(__file__).parent / "data" / "build_orders"
+                         / f"pareto_{map_slug}_{'_'.join(goal_names)}")
+    paths = save_front(front, goals, output_dir)
+    print(f"\nSaved {len(paths)} build orders to {output_dir}")
+
+
+def cmd_sweep(args):
+    from bar_sim.models import BuildOrder
+    from bar_sim.strategy import StrategyConfig
+    from bar_sim.sweep import grid_cells, lhs_cells, parse_param, run_sweep
+
+    try:
+        params = [parse_param(p) for p in args.param]
+        cells = lhs_cells(params, args.lhs, args.lhs_seed) if args.lhs else grid_cells(params)
+        index, _, count = args.shard.partition("/")
+        shard = (int(index), int(count or 1))
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if args.build_order:
+        base = load_build_order(args.build_order)
+    else:
+        base = BuildOrder(name="sweep", strategy_config=StrategyConfig())
+    if args.map:
+        base.map_config = _resolve_map_config(args.map)
+
+    print("=" * 60)
+    print("  BAR PARAMETER SWEEP")
+    print("=" * 60)
+    print(f"  Build order: {args.build_order or 'strategy mode (empty queues)'}")
+    print(f"  Parameters:  {', '.join(p.name for p in params)}")
+    print(f"  Cells:       {len(cells)} ({f'LHS, seed {args.lhs_seed}' if args.lhs else 'grid'})"
+          f"{f', shard {shard[0]}/{shard[1]}' if shard[1] > 1 else ''}")
+    print(f"  Duration:    {args.duration}s, metrics @ {args.at}s, workers={args.workers}")
+    print(f"  Output:      {args.output}")
+    print("=" * 60)
+
+    def progress(done, total):
+        if done == total or done % max(1, total // 20) == 0:
+            print(f"  {done}/{total} cells", file=sys.stderr)
+
+    summary = run_sweep(base, params, cells, args.output, duration=args.duration,
+                        at=args.at, workers=args.workers, shard=shard,
+                        resume=not args.no_resume, progress=progress)
+    print(f"\n{summary.cells} cells in shard: {summary.skipped} already done, "
+          f"{summary.simulated} simulated, {summary.cache_hits} duplicates reused, "
+          f"{summary.errors} errors")
+    print(f"Wrote {args.output}")
+
+
+def cmd_bench(args):
+    from pathlib import Path
+    from bar_sim.bench import (
+        DEFAULT_BASELINE, BenchConfig, compare, load_report, run_suite, save_report,
+    )
+
+    cfg = BenchConfig(repeat=args.repeat, quick=args.quick, duration=args.duration)
+    only = args.only.split(",") if args.only else None
+    report = run_suite(only, cfg, progress=lambda g: print(f"[bench] {g}...", file=sys.stderr))
+
+    baseline_path = Path(args.baseline) if args.baseline else DEFAULT_BASELINE
+    rows = {}
+    if baseline_path.exists() and not args.save_baseline:
+        rows = {r["name"]: r for r in compare(report, load_report(baseline_path), args.threshold)}
+
+    print(f"{'Metric':<58} {'Value':>12} {'Unit':<8} {'vs base':>8}")
+    print("-" * 90)
+    for name, m in report["metrics"].items():
+        row = rows.get(name)
+        delta = f"{row['change']:+.0%}" if row else "-"
+        flag = "  REGRESSION" if row and row["regression"] else ""
+        print(f"{name:<58} {m['value']:>12.2f} {m['unit']:<8} {delta:>8}{flag}")
+
+    if args.output:
+        save_report(report, args.output)
+        print(f"\nWrote {args.output}")
+    if args.save_baseline:
+        save_report(report, baseline_path)
+        print(f"\nSaved baseline to {baseline_path}")
+    elif not rows:
+        print(f"\nNo baseline at {baseline_path} (create one with --save-baseline)")
+
+    regressions = [r for r in rows.values() if r["regression"]]
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+
+
+def _parse_address(value: str):
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def cmd_island_worker(args):
+    from bar_sim.islands import connect_island
+    host, port = _parse_address(args.connect)
+    print(f"Joining island run at {host}:{port}...")
+    try:
+        connect_island(host, port, args.authkey.encode() if args.authkey else None)
+    except ValueError as e:
+        sys.exit(str(e))
+    print("Island run finished.")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="BAR Build Order Simulator",
@@ -320,10 +681,23 @@ def main():
                        help="Map name (auto-populates wind/mex/tidal from map data)")
     p_sim.add_argument("--export-json", default=None,
                        help="Export build order as JSON for Lua widget consumption")
+    p_sim.add_argument("--export-result", default=None,
+                       help="Export the result in columnar format (.json, .msgpack or .arrow)")
     p_sim.add_argument("--strategy", "-s", default=None,
                        help="Strategy config: 'role=aggro,composition=bots,posture=aggressive'")
     p_sim.add_argument("--goal", "-g", action="append", default=None,
                        help="Add goal (repeatable): 'economy_target:20' or 'tech_transition'")
+    p_sim.add_argument("--profile", action="store_true",
+                       help="Time each engine phase and print a profile")
+    p_sim.add_argument("--profile-out", default=None, metavar="FILE",
+                       help="With --profile, write folded stacks for flamegraph tools")
+    p_sim.add_argument("--snapshot-interval", type=int, default=30, metavar="TICKS",
+                       help="Seconds between economy snapshots (default: 30)")
+    p_sim.add_argument("--ensemble", type=int, default=0, metavar="N",
+                       help="Run across up to N wind seeds and report means, percentiles "
+                            "and 95%% confidence intervals (stops early once they are tight)")
+    p_sim.add_argument("--workers", type=int, default=1,
+                       help="With --ensemble, worker processes (default: 1)")
 
     # compare
     p_cmp = sub.add_parser("compare", aliases=["cmp"],
@@ -351,25 +725,163 @@ def main():
                        help="GA generations (default: 100)")
     p_opt.add_argument("--pop-size", "-p", type=int, default=60,
                        help="Population size (default: 60)")
-    p_opt.add_argument("--wind", type=float, default=12.0,
-                       help="Average wind speed (default: 12.0)")
-    p_opt.add_argument("--mex-value", type=float, default=2.0,
-                       help="Metal extractor value (default: 2.0)")
-    p_opt.add_argument("--mex-spots", type=int, default=6,
-                       help="Available mex spots (default: 6)")
-    p_opt.add_argument("--has-geo", action="store_true",
-                       help="Map has geothermal vent")
-    p_opt.add_argument("--map", default=None,
-                       help="Map name (overrides manual wind/mex/tidal args)")
+    _add_map_args(p_opt)
     p_opt.add_argument("--start-from", "-s",
                        help="Start from existing build order YAML")
     p_opt.add_argument("--output", "-o",
                        help="Save optimized build order to YAML")
+    p_opt.add_argument("--prune", default="population",
+                       choices=["off", "population", "elite"],
+                       help="Abandon runs that provably can't beat the worst "
+                            "survivor / weakest elite (default: population)")
+    p_opt.add_argument("--operators", default="uniform", choices=["uniform", "adaptive"],
+                       help="Operator selection: fixed probabilities, or shift them toward "
+                            "operators whose offspring improve most (default: uniform)")
+    p_opt.add_argument("--surrogate", type=float, default=0.0, metavar="RATIO",
+                       help="Breed RATIO x more offspring and simulate only those a "
+                            "learned surrogate ranks best (needs numpy; default: off)")
+    p_opt.add_argument("--maps", default=None, metavar="NAME,NAME",
+                       help="Robust mode: score over these maps (comma-separated)")
+    p_opt.add_argument("--seeds", default=None, metavar="N,N",
+                       help="Robust mode: wind seeds per map (comma-separated, default: 42)")
+    p_opt.add_argument("--aggregate", default="mean", choices=["mean", "worst", "cvar"],
+                       help="Robust mode: how to combine scenario scores (default: mean)")
+    p_opt.add_argument("--cvar-alpha", type=float, default=0.25,
+                       help="Fraction of worst scenarios averaged by cvar (default: 0.25)")
+    p_opt.add_argument("--no-race", action="store_true",
+                       help="Robust mode: score every candidate on every scenario")
+    p_opt.add_argument("--workers", type=int, default=1,
+                       help="Robust mode: processes evaluating scenarios (default: 1)")
+    p_opt.add_argument("--checkpoint", default=None, metavar="PATH",
+                       help="Save the GA state to PATH periodically")
+    p_opt.add_argument("--checkpoint-every", type=int, default=10,
+                       help="Generations between checkpoints (default: 10)")
+    p_opt.add_argument("--resume", action="store_true",
+                       help="Continue from --checkpoint if it exists")
+    p_opt.add_argument("--telemetry", default=None, metavar="PATH",
+                       help="Append per-generation metrics (evals/s, sim vs operator "
+                            "time, diversity, pruning) to PATH as JSON lines")
+    p_opt.add_argument("--islands", type=int, default=1,
+                       help="Run K island populations in worker processes (default: 1)")
+    p_opt.add_argument("--migration-interval", type=int, default=10,
+                       help="Generations between island migrations (default: 10)")
+    p_opt.add_argument("--migrants", type=int, default=2,
+                       help="Elites sent to the next island per migration (default: 2)")
+    p_opt.add_argument("--listen", default=None, metavar="HOST:PORT",
+                       help="Coordinate islands over TCP (remote islands join "
+                            "with 'island-worker --connect'). Islands exchange pickles: "
+                            "a non-loopback HOST or remote islands need --authkey or "
+                            "BAR_SIM_AUTHKEY, shared only with trusted workers")
+    p_opt.add_argument("--authkey", default=None, metavar="SECRET",
+                       help="With --listen, shared secret islands authenticate with "
+                            "(default: $BAR_SIM_AUTHKEY)")
+    p_opt.add_argument("--local-islands", type=int, default=None,
+                       help="With --listen, islands to start locally (default: all)")
+    p_opt.add_argument("--from-library", action="store_true",
+                       help="Answer from the precomputed library (needs --map; falls "
+                            "back to the full GA when the library has no entry)")
+    p_opt.add_argument("--refine", type=int, default=0, metavar="N",
+                       help="With --from-library, refine the stored build order with "
+                            "an N-generation GA seeded with it (default: 0 = as stored)")
     p_opt.add_argument("--top", type=int, default=1,
                        help="Show top N candidates after optimization (default: 1)")
     p_opt.add_argument("--export-json", default=None,
                        help="Export optimized build order as JSON for Lua widget consumption")
 
+    # pareto
+    p_par = sub.add_parser("pareto",
+                           help="Multi-objective optimization (NSGA-II Pareto front)")
+    p_par.add_argument("--goals", required=True, metavar="GOAL,GOAL[,...]",
+                       help="Comma-separated goals, e.g. fastest_factory,max_metal,min_stall")
+    p_par.add_argument("--target-time", "-t", type=int, default=300,
+                       help="Target time for time-based goals (default: 300)")
+    p_par.add_argument("--duration", "-d", type=int, default=600,
+                       help="Simulation duration (default: 600)")
+    p_par.add_argument("--generations", "-n", type=int, default=100,
+                       help="GA generations (default: 100)")
+    p_par.add_argument("--pop-size", "-p", type=int, default=60,
+                       help="Population size (default: 60)")
+    _add_map_args(p_par)
+    p_par.add_argument("--seeds", default=None, metavar="N,N",
+                       help="Score each objective over these wind seeds")
+    p_par.add_argument("--aggregate", default="mean", choices=["mean", "worst", "cvar"],
+                       help="How to combine per-seed scores (default: mean)")
+    p_par.add_argument("--workers", type=int, default=1,
+                       help="Processes evaluating candidates (default: 1)")
+    p_par.add_argument("--start-from", "-s",
+                       help="Seed the population with an existing build order YAML")
+    p_par.add_argument("--output-dir", "-o",
+                       help="Directory for the front's build order YAMLs")
+
+    # library
+    p_lib = sub.add_parser("library",
+                           help="Precomputed best build orders per map and goal")
+    p_lib.add_argument("library_action", choices=["build", "list"],
+                       help="build=optimize missing map x goal entries, list=show entries")
+    p_lib.add_argument("--maps", default=None, metavar="NAME,NAME",
+                       help="Maps to build (default: every cached map)")
+    p_lib.add_argument("--goals", default=None, metavar="GOAL,GOAL",
+                       help="Goals to build (default: all)")
+    p_lib.add_argument("--target-time", "-t", type=int, default=300,
+                       help="Target time for time-based goals (default: 300)")
+    p_lib.add_argument("--duration", "-d", type=int, default=600,
+                       help="Simulation duration (default: 600)")
+    p_lib.add_argument("--generations", "-n", type=int, default=100,
+                       help="GA generations per entry (default: 100)")
+    p_lib.add_argument("--pop-size", "-p", type=int, default=60,
+                       help="Population size (default: 60)")
+    p_lib.add_argument("--workers", type=int, default=1,
+                       help="Entries optimized in parallel (default: 1)")
+    p_lib.add_argument("--force", action="store_true",
+                       help="Re-optimize entries already in the library")
+
+    # sweep
+    p_sweep = sub.add_parser("sweep",
+                             help="Simulate a grid / Latin hypercube of map and strategy settings")
+    p_sweep.add_argument("--param", action="append", required=True, metavar="NAME=SPEC",
+                         help="Swept MapConfig/StrategyConfig field (repeatable): "
+                              "lo:hi:n, lo:hi (LHS), a,b,c or * for every enum value")
+    p_sweep.add_argument("--output", "-o", required=True,
+                         help="Results file (.csv or .parquet); resumed if it exists")
+    p_sweep.add_argument("--build-order", "-b", default=None,
+                         help="Base build order YAML (default: strategy mode, empty queues)")
+    p_sweep.add_argument("--map", "-m", default=None,
+                         help="Base map (swept map fields override it)")
+    p_sweep.add_argument("--lhs", type=int, default=0, metavar="N",
+                         help="Latin hypercube of N samples instead of the full grid")
+    p_sweep.add_argument("--lhs-seed", type=int, default=0,
+                         help="Seed for --lhs sampling (default: 0)")
+    p_sweep.add_argument("--duration", "-d", type=int, default=600,
+                         help="Simulation duration (default: 600)")
+    p_sweep.add_argument("--at", type=int, default=300,
+                         help="Time for the income/army columns (default: 300)")
+    p_sweep.add_argument("--workers", type=int, default=1,
+                         help="Worker processes (default: 1)")
+    p_sweep.add_argument("--shard", default="0/1", metavar="I/N",
+                         help="Run only cells with index %% N == I (default: 0/1)")
+    p_sweep.add_argument("--no-resume", action="store_true",
+                         help="Overwrite the output instead of skipping finished cells")
+
+    # bench
+    p_bench = sub.add_parser("bench", help="Run the performance benchmark suite")
+    p_bench.add_argument("--only", default=None, metavar="GROUP,GROUP",
+                         help="Groups to run: startup, engine, optimizer, operators, "
+                              "db, maps, web (default: all)")
+    p_bench.add_argument("--repeat", type=int, default=3,
+                         help="Runs per measurement; the best is kept (default: 3)")
+    p_bench.add_argument("--quick", action="store_true",
+                         help="Smaller workloads (smoke test)")
+    p_bench.add_argument("--duration", "-d", type=int, default=600,
+                         help="Simulation duration (default: 600)")
+    p_bench.add_argument("--output", "-o", default=None,
+                         help="Write the JSON report here")
+    p_bench.add_argument("--baseline", default=None,
+                         help="Baseline report (default: data/bench_baseline.json)")
+    p_bench.add_argument("--save-baseline", action="store_true",
+                         help="Store this run as the baseline")
+    p_bench.add_argument("--threshold", type=float, default=0.15,
+                         help="Relative slowdown counted as a regression (default: 0.15)")
+
     # map
     p_map = sub.add_parser("map", help="Map data management")
     p_map.add_argument("map_action", choices=["list", "info", "scan", "cache-popular"],
@@ -383,6 +895,14 @@ def main():
     p_web.add_argument("--port", type=int, default=8080,
                        help="Port to serve on (default: 8080)")
 
+    # island-worker
+    p_island = sub.add_parser("island-worker",
+                              help="Join a distributed island optimization as a worker")
+    p_island.add_argument("--connect", required=True, metavar="HOST:PORT",
+                          help="Address of the 'optimize --listen' master")
+    p_island.add_argument("--authkey", default=None, metavar="SECRET",
+                          help="The master's shared secret (default: $BAR_SIM_AUTHKEY)")
+
     args = parser.parse_args()
 
     # Apply faction selection before running any command
@@ -398,11 +918,21 @@ def main():
         cmd_interactive(args)
     elif args.command in ("optimize", "opt"):
         cmd_optimize(args)
+    elif args.command == "bench":
+        cmd_bench(args)
+    elif args.command == "pareto":
+        cmd_pareto(args)
+    elif args.command == "sweep":
+        cmd_sweep(args)
+    elif args.command == "library":
+        cmd_library(args)
     elif args.command == "map":
         cmd_map(args)
     elif args.command in ("web", "serve"):
         from bar_sim.web import start_server
         start_server(port=args.port)
+    elif args.command == "island-worker":
+        cmd_island_worker(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,30 @@
+"""Tests for the benchmark suite runner and baseline comparison."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.bench import BenchConfig, compare, run_suite
+
+
+def _report(**values):
+    return {"metrics": {name: {"value": v, "unit": "x", "higher_is_better": not name.endswith("_ms")}
+                        for name, v in values.items()}}
+
+
+def test_compare_respects_metric_direction():
+    base = _report(rate=100.0, latency_ms=10.0, gone=1.0)
+    rows = {r["name"]: r for r in compare(_report(rate=80.0, latency_ms=9.0, new=1.0), base)}
+    assert set(rows) == {"rate", "latency_ms"}
+    assert rows["rate"]["regression"] and rows["rate"]["change"] == -0.2
+    assert not rows["latency_ms"]["regression"] and rows["latency_ms"]["change"] == 0.1
+
+
+def test_quick_suite_reports_selected_groups():
+    report = run_suite(["operators", "maps"], BenchConfig(repeat=1, quick=True))
+    names = list(report["metrics"])
+    assert "operators.mutation_us" in names
+    assert all(n.split(".")[0] in ("operators", "maps") for n in names)
+    assert all(m["value"] > 0 for m in report["metrics"].values())
+    assert report["meta"]["config"]["quick"] is True
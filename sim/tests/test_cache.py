@@ -0,0 +1,41 @@
+"""Tests for the request-keyed result cache."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.cache import ResultCache, canonical_hash
+
+
+def test_canonical_hash_ignores_key_order():
+    a = canonical_hash({"duration": 600, "filename": "wind_opening.yaml"})
+    b = canonical_hash({"filename": "wind_opening.yaml", "duration": 600})
+    assert a == b
+    assert a != canonical_hash({"filename": "wind_opening.yaml", "duration": 300})
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1      # "a" is now most recent
+    cache.put("c", 3)               # evicts "b"
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_clear_retires_keys():
+    """Clearing bumps the generation so old keys (and ETags) no longer match."""
+    cache = ResultCache()
+    key = cache.key("/api/simulate", {"filename": "x.yaml"})
+    cache.put(key, b"payload")
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.key("/api/simulate", {"filename": "x.yaml"}) != key
+
+
+def test_keys_differ_between_caches():
+    """A fresh cache (e.g. after a server restart) never reissues old keys."""
+    parts = ("/api/simulate", {"filename": "x.yaml"})
+    assert ResultCache().key(*parts) != ResultCache().key(*parts)
@@ -0,0 +1,51 @@
+"""Tests for optimizer checkpoint / resume."""
+
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.checkpoint import load_checkpoint, save_checkpoint
+from bar_sim.optimizer import Optimizer, make_goal
+
+
+def _opt(map_config, goal="min_stall"):
+    return Optimizer(make_goal(goal), map_config, duration=300, population_size=10,
+                     max_generations=6, stagnation_limit=2, catastrophe_limit=4,
+                     seed=11, verbose=False)
+
+
+def test_resumed_run_matches_uninterrupted_run(default_map_config, tmp_path):
+    ckpt = str(tmp_path / "run.ckpt")
+    full = _opt(default_map_config)
+    expected = full.optimize()
+
+    # "Pre-empted" after 3 generations, with a checkpoint every 3
+    first = _opt(default_map_config)
+    first.optimize(checkpoint_path=ckpt, checkpoint_every=3,
+                   progress_callback=lambda info: info["generation"] >= 3)
+    assert load_checkpoint(ckpt)["generation"] == 3
+
+    resumed = _opt(default_map_config)
+    best = resumed.optimize(checkpoint_path=ckpt, resume=True)
+    assert resumed.history == full.history
+    assert resumed.eval_stats == full.eval_stats
+    assert [a.unit_key for a in best.commander_queue] == \
+        [a.unit_key for a in expected.commander_queue]
+
+
+def test_checkpoint_rejects_other_goal_and_bad_files(default_map_config, tmp_path):
+    ckpt = tmp_path / "run.ckpt"
+    opt = _opt(default_map_config)
+    opt.start()
+    save_checkpoint(opt.state_dict(), ckpt)
+    assert [p.name for p in tmp_path.iterdir()] == ["run.ckpt"]
+    with pytest.raises(ValueError):
+        _opt(default_map_config, goal="max_metal").load_state_dict(load_checkpoint(ckpt))
+
+    ckpt.write_bytes(pickle.dumps({"version": 0, "state": {}}))
+    with pytest.raises(ValueError):
+        load_checkpoint(ckpt)
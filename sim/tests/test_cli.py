@@ -39,3 +39,13 @@ def test_map_info_cached():
     # Should either succeed or warn about missing map
     # (depends on whether cache files are available)
     assert result.returncode == 0 or "not found" in result.stderr.lower() or "warning" in result.stdout.lower()
+
+
+def test_pareto_runs_end_to_end(tmp_path):
+    """A tiny pareto run should finish and save its front."""
+    result = _run_cli("pareto", "--goals", "fastest_factory,max_metal",
+                      "--generations", "2", "--pop-size", "6", "--duration", "120",
+                      "--output-dir", str(tmp_path), timeout=120)
+    assert result.returncode == 0, f"stderr: {result.stderr}"
+    assert "PARETO FRONT" in result.stdout
+    assert list(tmp_path.glob("*.yaml"))
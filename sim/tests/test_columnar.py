@@ -0,0 +1,99 @@
+"""Tests for the columnar result format."""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.columnar import (
+    delta_decode, delta_encode, format_available, negotiate_format,
+    result_to_columnar, columnar_to_result, encode_result, decode_result,
+)
+from bar_sim.engine import SimulationEngine
+from bar_sim.models import BuildOrder, Snapshot
+from bar_sim.strategy import StrategyConfig
+from bar_sim.io import save_result, load_result
+
+
+def test_delta_round_trip():
+    ticks = [0, 30, 60, 90, 120]
+    assert delta_encode(ticks) == [0, 30, 30, 30, 30]
+    assert delta_decode(delta_encode(ticks)) == ticks
+
+
+def test_result_round_trip(wind_opening_bo):
+    """Columnar encode/decode should reproduce the original result."""
+    result = SimulationEngine(wind_opening_bo, duration=300).run()
+    back = decode_result(encode_result(result))
+
+    assert [s.tick for s in back.snapshots] == [s.tick for s in result.snapshots]
+    assert [s.metal_income for s in back.snapshots] == [s.metal_income for s in result.snapshots]
+    assert [s.unit_counts for s in back.snapshots] == [s.unit_counts for s in result.snapshots]
+    assert back.completion_log == result.completion_log
+    assert [m.event for m in back.milestones] == [m.event for m in result.milestones]
+    assert back.time_to_first_factory == result.time_to_first_factory
+
+
+def test_army_by_role_round_trip(default_map_config):
+    """army_by_role survives every wire format, including zero counts."""
+    bo = BuildOrder(name="strategy", map_config=default_map_config,
+                    strategy_config=StrategyConfig())
+    result = SimulationEngine(bo, duration=600).run()
+    result.snapshots.append(Snapshot(tick=301, army_by_role={"raider": 0}))
+    expected = [s.army_by_role for s in result.snapshots]
+    assert any(roles and roles != {"raider": 0} for roles in expected)
+
+    for fmt in ("columnar", "msgpack", "arrow"):
+        if format_available(fmt):
+            back = decode_result(encode_result(result, fmt), fmt)
+            assert [s.army_by_role for s in back.snapshots] == expected, fmt
+
+
+def test_document_round_trip_keeps_snapshots(default_map_config):
+    """result -> columnar document -> result reproduces every snapshot."""
+    bo = BuildOrder(name="strategy", map_config=default_map_config,
+                    strategy_config=StrategyConfig())
+    result = SimulationEngine(bo, duration=300).run()
+    back = columnar_to_result(result_to_columnar(result))
+    assert back.snapshots == result.snapshots
+    assert back.stall_events == result.stall_events
+    assert back.army_composition_final == result.army_composition_final
+
+
+def test_columnar_smaller_than_rows(wind_opening_bo):
+    """Keys are stored once, so the payload should shrink."""
+    result = SimulationEngine(wind_opening_bo, duration=600).run()
+    rows = [{"tick": s.tick, "metal_income": s.metal_income,
+             "energy_income": s.energy_income, "metal_stored": s.metal_stored,
+             "energy_stored": s.energy_stored, "build_power": s.build_power,
+             "unit_counts": s.unit_counts} for s in result.snapshots]
+    assert len(encode_result(result)) < len(json.dumps(rows))
+    doc = result_to_columnar(result)
+    assert doc["unit_keys"] and all(isinstance(k, str) for k in doc["unit_keys"])
+
+
+def test_save_and_load_result(wind_opening_bo):
+    result = SimulationEngine(wind_opening_bo, duration=120).run()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "result.json")
+        save_result(result, path)
+        loaded = load_result(path)
+    assert loaded.build_order_name == result.build_order_name
+    assert len(loaded.snapshots) == len(result.snapshots)
+
+
+def test_negotiate_format():
+    assert negotiate_format(None) == "json"
+    assert negotiate_format("*/*") == "json"
+    assert negotiate_format("application/vnd.bar-sim.columnar+json") == "columnar"
+    assert negotiate_format("application/json;q=0.5, application/x-msgpack") == "msgpack"
+    assert negotiate_format("text/html") is None
+
+    # Unavailable or disallowed formats fall through to the next acceptable one
+    accept = "application/x-msgpack, application/json;q=0.5"
+    assert negotiate_format(accept, supported=["json", "columnar"]) == "json"
+    assert negotiate_format("application/x-msgpack", supported=["json"]) is None
+    assert negotiate_format("*/*", supported=["columnar"]) == "columnar"
+    assert negotiate_format("application/vnd.apache.arrow.file") is None
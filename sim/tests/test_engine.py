@@ -6,7 +6,10 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from bar_sim.engine import SimulationEngine
-from bar_sim.models import BuildOrder, BuildAction, MapConfig
+from bar_sim.models import (
+    BuildOrder, BuildAction, BuildActionType, MapConfig, Snapshot, SnapshotConfig,
+    expand_unit_counts,
+)
 
 
 def test_mex_income(simple_mex_bo):
@@ -111,3 +114,157 @@ def test_full_wind_opening():
     assert factory_milestone is not None
     # Should be within a reasonable timeframe (60-150s)
     assert 60 <= factory_milestone.tick <= 150
+
+
+def test_catalog_isolated_from_set_faction(simple_mex_bo):
+    """A run with an explicit catalog ignores later set_faction() calls."""
+    from copy import deepcopy
+    from bar_sim.econ import get_catalog, get_faction, set_faction
+
+    armada = get_catalog("ARMADA")
+    assert get_catalog("armada") is armada
+    expected = SimulationEngine(deepcopy(simple_mex_bo), 300, catalog=armada).run()
+
+    previous = get_faction()
+    set_faction("CORTEX")
+    try:
+        result = SimulationEngine(deepcopy(simple_mex_bo), 300, catalog=armada).run()
+    finally:
+        set_faction(previous)
+
+    assert result.completion_log == expected.completion_log
+    assert result.peak_energy_income == expected.peak_energy_income
+
+
+def test_iter_run_matches_run_and_stops_early(simple_mex_bo):
+    """Streaming yields the same snapshots as run() and can stop early."""
+    from copy import deepcopy
+
+    full = SimulationEngine(deepcopy(simple_mex_bo), 300).run()
+
+    engine = SimulationEngine(deepcopy(simple_mex_bo), 300)
+    snaps = [e.data for e in engine.iter_run() if e.kind == "snapshot"]
+    assert [s.tick for s in snaps] == [s.tick for s in full.snapshots]
+    assert engine.result.total_ticks == 300
+
+    engine = SimulationEngine(deepcopy(simple_mex_bo), 300, keep_snapshots=False)
+    for event in engine.iter_run():
+        if event.tick >= 90:
+            break
+    partial = engine.finish()
+    assert partial.total_ticks == 90
+    assert partial.snapshots == []
+
+
+def test_step_advances_in_chunks(simple_mex_bo):
+    from copy import deepcopy
+
+    engine = SimulationEngine(deepcopy(simple_mex_bo), 120)
+    kinds = []
+    while not engine.done:
+        kinds += [e.kind for e in engine.step(50)]
+    assert engine.state.tick == 120
+    assert kinds.count("snapshot") == 5  # ticks 0, 30, 60, 90, 120
+    assert engine.step(10) == []
+
+
+def test_task_index_tracks_active_tasks(wind_opening_bo):
+    """Walking and building tasks partition active_tasks, oldest first."""
+    from copy import deepcopy
+
+    engine = SimulationEngine(deepcopy(wind_opening_bo), 600)
+    seen_walking = False
+    while not engine.done:
+        engine.step(1)
+        active = list(engine.state.active_tasks)
+        walking, building = list(engine._walking), list(engine._building)
+        assert sorted(walking + building) == sorted(active)
+        assert active == sorted(active) and building == sorted(building)
+        assert all(t.walk_delay > 0 for t in engine._walking.values())
+        seen_walking = seen_walking or bool(walking)
+    assert seen_walking
+    done = [t.task_id for t in engine.state.completed_tasks]
+    assert len(done) == len(set(done))
+
+
+def test_builder_indexes_track_builders():
+    """Idle map, factory registry and BP total agree with a full scan."""
+    from bar_sim.strategy import StrategyConfig
+
+    bo = BuildOrder(name="idx", map_config=MapConfig(),
+                    commander_queue=[BuildAction(k) for k in
+                                     ["mex", "mex", "wind", "wind", "bot_lab", "wind", "nano"]],
+                    factory_queues={"factory_0": [BuildAction("con_bot", BuildActionType.PRODUCE_UNIT)]},
+                    constructor_queues={"con_1": [BuildAction("mex"), BuildAction("nano")]})
+    engines = []
+    for order in (bo, BuildOrder(name="strat", strategy_config=StrategyConfig())):
+        engine = SimulationEngine(order, 900)
+        engines.append(engine)
+        while not engine.done:
+            engine.step(10)
+            builders = engine.state.builders
+            idle = [bid for bid, b in builders.items()
+                    if b.is_idle and bid not in engine._parked]
+            assert sorted(engine._idle) == sorted(idle)
+            assert engine._active_bp == sum(b.build_power for b in builders.values())
+            assert engine._factories == [bid for bid, b in builders.items()
+                                         if b.builder_type == "factory"]
+        assert "factory_0" in engine.state.builders
+    assert {"con_1", "nano_0"} <= set(engines[0].state.builders)
+
+
+def test_snapshot_config(wind_opening_bo):
+    """Interval, field selection, count deltas and score-only recording."""
+    from copy import deepcopy
+
+    full = SimulationEngine(deepcopy(wind_opening_bo), 600).run()
+    assert full.snapshot_config is None
+
+    cfg = SnapshotConfig(interval=60, fields={"metal_income", "unit_counts"},
+                         unit_count_deltas=True)
+    lean = SimulationEngine(deepcopy(wind_opening_bo), 600, snapshot_config=cfg).run()
+    every_60 = [s for s in full.snapshots if s.tick % 60 == 0]
+    assert [s.tick for s in lean.snapshots] == [s.tick for s in every_60]
+    assert [s.metal_income for s in lean.snapshots] == [s.metal_income for s in every_60]
+    assert all(s.energy_income == 0.0 and not s.army_by_role for s in lean.snapshots)
+    assert expand_unit_counts(lean.snapshots) == [s.unit_counts for s in every_60]
+    assert sum(map(len, (s.unit_counts for s in lean.snapshots))) < \
+        sum(map(len, (s.unit_counts for s in every_60)))
+
+    engine = SimulationEngine(deepcopy(wind_opening_bo), 600,
+                              snapshot_config=SnapshotConfig.score_only(["metal_income"], 310))
+    events = [e for e in engine.iter_run() if e.kind == "snapshot"]
+    assert len(events) == len(full.snapshots)
+    assert all(e.data is None for e in events if e.tick > 310)
+    assert engine.result.snapshots == [Snapshot(tick=300, metal_income=full.snapshots[10].metal_income)]
+
+
+def test_result_time_series_accessors(wind_opening_bo):
+    """snapshot_at/value_at/milestone/series agree with linear scans."""
+    import pickle
+    from copy import deepcopy
+
+    import pytest
+    np = pytest.importorskip("numpy")
+
+    result = SimulationEngine(deepcopy(wind_opening_bo), 600).run()
+    snaps = result.snapshots
+    for tick in (-1, 0, 29, 30, 31, 299, 300, 599, 5000):
+        expected = [s for s in snaps if s.tick <= tick]
+        assert result.snapshot_at(tick) == (expected[-1] if expected else None)
+    assert result.value_at("metal_income", 300) == snaps[10].metal_income
+    mid = (snaps[10].energy_income + snaps[11].energy_income) / 2
+    assert result.value_at("energy_income", 315) == pytest.approx(mid)
+    assert result.value_at("metal_stored", 10_000) == snaps[-1].metal_stored
+
+    for m in result.milestones:
+        assert result.milestone(m.event) is m
+    assert result.milestone("no_such_event") is None
+
+    income = result.series("metal_income")
+    assert np.array_equal(income, [s.metal_income for s in snaps])
+    assert np.array_equal(result.series("tick"), [s.tick for s in snaps])
+    assert result.series("metal_income") is income
+    result.snapshots.append(Snapshot(tick=630, metal_income=1.0))
+    assert len(result.series("metal_income")) == len(snaps)
+    assert pickle.loads(pickle.dumps(result))._series_cache is None
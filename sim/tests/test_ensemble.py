@@ -0,0 +1,37 @@
+"""Tests for wind ensembles."""
+
+import sys
+from copy import deepcopy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.engine import SimulationEngine
+from bar_sim.ensemble import run_ensemble, summarize
+
+
+def test_summarize():
+    m = summarize("x", "X", [1.0, 2.0, 3.0, 4.0, None])
+    assert (m.n, m.missing, m.mean, m.p50) == (4, 1, 2.5, 2.5)
+    assert m.p10 == 1.3 and m.ci_low < 2.5 < m.ci_high
+    assert summarize("x", "X", [5.0, 5.0]).is_tight(0.0)
+
+
+def test_ensemble_over_wind_seeds(wind_opening_bo):
+    ens = run_ensemble(wind_opening_bo, runs=12, duration=300, min_runs=6, rel_tol=0)
+    assert ens.seeds == list(range(42, 54)) and ens.simulated == 12
+    assert not ens.wind_independent and not ens.converged
+    plain = SimulationEngine(deepcopy(wind_opening_bo), 300, seed=45).run()
+    assert ens.samples["energy_income"][3] == plain.snapshot_at(300).energy_income
+    energy = ens.metrics["energy_income"]
+    assert energy.std > 0 and energy.p10 <= energy.p50 <= energy.p90
+
+    early = run_ensemble(wind_opening_bo, runs=12, duration=300, min_runs=6, rel_tol=0.5)
+    assert early.converged and early.runs == 6
+    assert early.samples["energy_income"] == ens.samples["energy_income"][:6]
+
+
+def test_wind_independent_build_needs_one_run(simple_mex_bo):
+    ens = run_ensemble(simple_mex_bo, runs=20, duration=300)
+    assert ens.wind_independent and ens.simulated == 1 and ens.runs == 20
+    assert ens.metrics["metal_income"].std == 0
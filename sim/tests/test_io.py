@@ -46,3 +46,59 @@ def test_save_and_reload_round_trip(default_map_config):
         assert loaded.commander_queue[1].unit_key == "wind"
     finally:
         Path(tmppath).unlink(missing_ok=True)
+
+
+def test_loaded_actions_are_interned_and_shared_by_copies():
+    """Loaded queues share BuildAction instances; copies and pickles keep sharing."""
+    import copy
+    import pickle
+
+    import pytest
+    from bar_sim.models import BuildActionType, build_action
+
+    bo_path = Path(__file__).parent.parent / "data" / "build_orders" / "wind_opening.yaml"
+    bo = load_build_order(str(bo_path))
+    mex = build_action("mex")
+    assert any(a is mex for a in bo.commander_queue)
+    assert build_action("tick", BuildActionType.PRODUCE_UNIT) == BuildAction(
+        "tick", BuildActionType.PRODUCE_UNIT)
+
+    clone = copy.deepcopy(bo)
+    assert clone.commander_queue is not bo.commander_queue
+    assert all(a is b for a, b in zip(clone.commander_queue, bo.commander_queue))
+    assert pickle.loads(pickle.dumps(bo)).commander_queue[0] is bo.commander_queue[0]
+    with pytest.raises(AttributeError):
+        mex.unit_key = "wind"
+
+
+def test_load_cache_returns_copies_and_sees_rewrites(tmp_path, default_map_config):
+    from bar_sim.io import index_build_orders
+
+    path = tmp_path / "bo.yaml"
+    bo = BuildOrder(name="Cached", map_config=default_map_config,
+                    commander_queue=[BuildAction("mex")],
+                    factory_queues={"factory_0": [BuildAction("tick")]})
+    save_build_order(bo, str(path))
+
+    first = load_build_order(str(path))
+    first.commander_queue.append(BuildAction("wind"))
+    first.map_config.avg_wind = 0
+    second = load_build_order(str(path))
+    assert len(second.commander_queue) == 1
+    assert second.map_config.avg_wind == default_map_config.avg_wind
+
+    bo.commander_queue.append(BuildAction("solar"))
+    save_build_order(bo, str(path))
+    assert [a.unit_key for a in load_build_order(str(path)).commander_queue] == ["mex", "solar"]
+
+    (tmp_path / "notes.txt").write_text("not a build order")
+    (tmp_path / "list.yaml").write_text("- mex\n- wind\n")
+    (tmp_path / "scalar.yaml").write_text("just a string\n")
+    (tmp_path / "empty.yaml").write_text("")
+    index = index_build_orders(tmp_path)
+    assert index == [{
+        "filename": "bo.yaml", "stem": "bo", "name": "Cached", "description": "",
+        "map_name": None, "commander_items": 2, "factories": 1, "constructors": 0,
+        "has_strategy": False,
+    }]
+    assert index_build_orders(tmp_path / "missing") == []
@@ -0,0 +1,52 @@
+"""Tests for the island-model GA."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from bar_sim.islands import IslandOptimizer, connect_island, island_schedule
+
+
+def _run(map_config, **kwargs):
+    opt = IslandOptimizer("max_metal", map_config, target_time=180, duration=240,
+                          islands=2, population_size=6, max_generations=4,
+                          migration_interval=2, migrants=1, verbose=False, **kwargs)
+    return opt.optimize()
+
+
+def test_island_schedules_differ():
+    schedules = [island_schedule(i, 4) for i in range(4)]
+    assert len(set(schedules)) == 4
+    assert island_schedule(0, 1) == (0.4, 0.995)
+
+
+def test_islands_reproducible_across_transports(default_map_config):
+    """Same master seed gives the same result over pipes and TCP."""
+    a = _run(default_map_config)
+    b = _run(default_map_config, transport="tcp")
+    assert a.best_score == b.best_score
+    assert a.history == b.history
+    assert [x.unit_key for x in a.best_bo.commander_queue] == \
+        [x.unit_key for x in b.best_bo.commander_queue]
+    assert len(a.island_scores) == 2
+
+
+def test_tcp_requires_authkey_off_loopback(default_map_config, monkeypatch):
+    monkeypatch.delenv("BAR_SIM_AUTHKEY", raising=False)
+    make = lambda **kw: IslandOptimizer("max_metal", default_map_config, transport="tcp",
+                                        verbose=False, **kw)
+    with pytest.raises(ValueError, match="authkey"):
+        make(address=("0.0.0.0", 0))
+    with pytest.raises(ValueError, match="authkey"):
+        make(islands=2, local_islands=1)
+    with pytest.raises(ValueError, match="authkey"):
+        connect_island("127.0.0.1", 1)
+
+    a, b = make(), make()
+    assert a.authkey and a.authkey != b.authkey  # random per run
+    assert make(address=("0.0.0.0", 0), authkey=b"secret").authkey == b"secret"
+    monkeypatch.setenv("BAR_SIM_AUTHKEY", "from-env")
+    assert make(address=("0.0.0.0", 0)).authkey == b"from-env"
@@ -0,0 +1,43 @@
+"""Tests for the precomputed build order library."""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.library import BuildOrderLibrary, build_library
+
+
+def _build(tmp_path, library, goals, **kwargs):
+    return build_library(["delta_siege_dry"], goals, duration=120, generations=2,
+                         pop_size=6, library=library,
+                         checkpoint_dir=tmp_path / "ckpt", **kwargs)
+
+
+def test_build_and_lookup(tmp_path):
+    library = BuildOrderLibrary(tmp_path / "lib")
+    added = _build(tmp_path, library, ["max_metal", "fastest_factory"])
+    assert [e.goal for e in added] == ["max_metal", "fastest_factory"]
+    assert not list((tmp_path / "ckpt").iterdir())
+
+    # A second process sees the entries through index.json
+    fresh = BuildOrderLibrary(tmp_path / "lib")
+    entry = fresh.lookup("delta_siege_dry", "max_metal", duration=120)
+    assert entry is not None and entry.score == added[0].score
+    assert fresh.lookup("delta_siege_dry", "max_metal") is None  # other duration
+    assert fresh.lookup("delta_siege_dry", "max_metal", duration=120, faction="CORTEX") is None
+
+    bo = fresh.build_order(entry)
+    assert bo.map_name == "delta_siege_dry" and bo.commander_queue
+    bo.commander_queue.clear()
+    assert fresh.build_order(entry).commander_queue
+
+
+def test_build_skips_existing_entries(tmp_path):
+    library = BuildOrderLibrary(tmp_path / "lib")
+    _build(tmp_path, library, ["min_stall"])
+    seen = []
+    added = _build(tmp_path, library, ["min_stall", "max_energy"],
+                   progress=lambda task, entry, error: seen.append(task.goal))
+    assert seen == ["max_energy"] and len(added) == 1
+    assert len(library.entries()) == 2
@@ -0,0 +1,112 @@
+"""Tests for optimizer candidate evaluation, pruning, operator selection and strategy search."""
+
+import random
+import sys
+from copy import deepcopy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.engine import SimulationEngine
+from bar_sim.optimizer import (
+    CROSSOVERS, MUTATIONS, EvalStats, OperatorSelector, Optimizer, StrategyOptimizer,
+    enforce_constraints, evaluate_candidate, make_goal, make_strategy_goal, random_seed,
+)
+from bar_sim.strategy import AttackStrategy, Posture, StrategyConfig
+
+
+def _candidates(map_config, n=12):
+    rng = random.Random(7)
+    return [enforce_constraints(random_seed(map_config, rng), map_config) for _ in range(n)]
+
+
+def test_settled_goals_stop_early_with_exact_score(default_map_config):
+    """Snapshot goals stop at the target time without changing the score."""
+    goal = make_goal("max_metal", target_time=300)
+    stats = EvalStats()
+    for bo in _candidates(default_map_config):
+        full = goal.score(SimulationEngine(deepcopy(bo), 600).run())
+        assert evaluate_candidate(deepcopy(bo), goal, 600, stats=stats) == full
+    assert stats.settled == stats.evaluations
+    assert stats.sim_fraction < 0.6
+
+
+def test_pruned_scores_are_never_better_than_truth(default_map_config):
+    """A pruned run scores worst_score, so it can't outrank its own full run."""
+    for name in ("min_stall", "fastest_factory", "balanced"):
+        goal = make_goal(name, target_time=300)
+        bos = _candidates(default_map_config)
+        full = [goal.score(SimulationEngine(deepcopy(bo), 600).run()) for bo in bos]
+        threshold = sorted(full, reverse=goal.higher_is_better)[len(full) // 2]
+        stats = EvalStats()
+        for bo, truth in zip(bos, full):
+            score = evaluate_candidate(deepcopy(bo), goal, 600, threshold, stats=stats)
+            if score != truth:
+                assert score == goal.worst_score
+                assert not goal.is_better(truth, threshold)
+        assert stats.pruned > 0, name
+
+
+def test_widget_only_strategy_fields_share_one_simulation(default_map_config):
+    """Configs differing only in fields the engine ignores are simulated once."""
+    opt = StrategyOptimizer(make_strategy_goal("max_eco_strat"), default_map_config,
+                            verbose=False)
+    a = opt._evaluate(StrategyConfig())
+    b = opt._evaluate(StrategyConfig(posture=Posture.AGGRESSIVE, econ_army_balance=10,
+                                     attack_strategy=AttackStrategy.PIERCING))
+    assert a == b
+    assert opt.eval_stats.evaluations == 1 and opt.cache_hits == 1
+
+
+def test_strategy_backends_agree(default_map_config):
+    """Halving finds the exhaustive optimum; the GA reuses cached configs."""
+    goal = make_strategy_goal("max_eco_strat", target_time=300)
+    exhaustive = StrategyOptimizer(goal, default_map_config, backend="exhaustive",
+                                   verbose=False)
+    exhaustive.optimize()
+    assert exhaustive.eval_stats.evaluations == len(StrategyOptimizer.candidate_configs())
+
+    halving = StrategyOptimizer(goal, default_map_config, backend="halving", verbose=False)
+    halving.optimize()
+    assert halving.history[-1] == exhaustive.history[-1]
+
+    ga = StrategyOptimizer(goal, default_map_config, population_size=20,
+                           max_generations=5, verbose=False)
+    ga.optimize()
+    assert ga.cache_hits > 0
+    assert ga.eval_stats.evaluations + ga.cache_hits == 20 + 5 * 18
+
+
+def test_adaptive_selection_shifts_toward_productive_operators():
+    uniform = OperatorSelector(MUTATIONS)
+    adaptive = OperatorSelector(MUTATIONS, adaptive=True)
+    for sel in (uniform, adaptive):
+        for _ in range(200):
+            sel.credit([0], 0.1)
+            sel.credit([1, 2, 3, 4], 0.0)
+    assert uniform.probabilities() == [0.2] * 5
+    p = adaptive.probabilities()
+    assert abs(sum(p) - 1) < 1e-9
+    assert p[0] > 0.5 and min(p) >= adaptive.p_min
+    assert adaptive.stats()["mutate_swap"]["success_rate"] == 1.0
+
+    # Fixed weights draw with the same RNG calls as the original 70/30 split
+    xo = OperatorSelector(CROSSOVERS, weights=(0.7, 0.3))
+    a, b = random.Random(3), random.Random(3)
+    assert [xo.pick(a) for _ in range(50)] == [0 if b.random() < 0.7 else 1 for _ in range(50)]
+
+
+def test_adaptive_optimizer_credits_operators(default_map_config):
+    opt = Optimizer(make_goal("max_metal"), default_map_config, population_size=10,
+                    max_generations=3, verbose=False, operator_selection="adaptive")
+    opt.optimize()
+    stats = opt.operator_stats()
+    assert set(stats) == {"crossover_one_point", "crossover_uniform", "mutate_swap",
+                          "mutate_replace", "mutate_insert", "mutate_remove",
+                          "mutate_shuffle_segment"}
+    assert sum(st["uses"] for st in stats.values()) > 0
+
+    restored = Optimizer(make_goal("max_metal"), default_map_config, population_size=10,
+                         verbose=False, operator_selection="adaptive")
+    restored.load_state_dict(opt.state_dict())
+    assert restored.operator_stats() == stats
@@ -0,0 +1,57 @@
+"""Tests for the NSGA-II multi-objective optimizer."""
+
+import math
+import random
+import sys
+from copy import deepcopy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.engine import SimulationEngine
+from bar_sim.optimizer import EvalStats, enforce_constraints, make_goal, random_seed
+from bar_sim.pareto import (
+    ParetoOptimizer, crowding_distance, dominates, evaluate_objectives,
+    non_dominated_sort,
+)
+
+
+def _goals():
+    return [make_goal("fastest_factory"), make_goal("max_metal", target_time=300),
+            make_goal("min_stall")]
+
+
+def test_sorting_respects_goal_directions():
+    up, down = make_goal("max_metal"), make_goal("min_stall")
+    goals = [up, down]
+    points = [(10, 5), (8, 5), (10, 3), (12, 9), (7, 1)]
+    assert dominates((10, 3), (10, 5), goals)
+    assert not dominates((12, 9), (10, 3), goals)
+    fronts = non_dominated_sort(points, goals)
+    assert sorted(fronts[0]) == [2, 3, 4]
+    assert sorted(fronts[1]) == [0]
+    crowd = crowding_distance(points, fronts[0])
+    assert math.isinf(crowd[3]) and math.isinf(crowd[4]) and crowd[2] > 0
+
+
+def test_objectives_share_one_simulation(default_map_config):
+    rng = random.Random(3)
+    bo = enforce_constraints(random_seed(default_map_config, rng), default_map_config)
+    stats = EvalStats()
+    scores = evaluate_objectives(deepcopy(bo), _goals(), 600, stats=stats)
+    result = SimulationEngine(deepcopy(bo), 600).run()
+    assert scores == tuple(g.score(result) for g in _goals())
+    assert stats.evaluations == 1
+
+
+def test_front_is_mutually_non_dominated(default_map_config):
+    goals = _goals()
+    opt = ParetoOptimizer(goals, default_map_config, population_size=12,
+                          max_generations=3, verbose=False)
+    front = opt.optimize()
+    assert front
+    assert opt.eval_stats.evaluations == 12 * 4
+    points = [p for p, _ in front]
+    assert len(set(points)) == len(points)
+    for a in points:
+        assert not any(dominates(b, a, goals) for b in points)
@@ -0,0 +1,33 @@
+"""Tests for opt-in engine profiling."""
+
+import re
+import sys
+from copy import deepcopy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.engine import SimulationEngine
+
+
+def test_profiling_does_not_change_result(simple_mex_bo):
+    plain = SimulationEngine(deepcopy(simple_mex_bo), 300).run()
+    profiled = SimulationEngine(deepcopy(simple_mex_bo), 300, profile=True).run()
+    assert plain.profile is None
+    assert profiled.snapshots == plain.snapshots
+    assert profiled.milestones == plain.milestones
+    assert profiled.completion_log == plain.completion_log
+
+
+def test_profile_contents(simple_mex_bo):
+    result = SimulationEngine(deepcopy(simple_mex_bo), 300, profile=True).run()
+    prof = result.profile
+    assert prof.ticks == 300
+    assert prof.phases["_step_tick"].calls == 300
+    assert prof.phases["_calculate_income"].calls == 300
+    assert len(prof.samples) == prof.phases["_record_snapshot"].calls
+    assert prof.rows()[0][0] == "_step_tick"
+
+    lines = prof.folded().splitlines()
+    assert all(re.fullmatch(r"engine(;\w+)+ \d+", line) for line in lines)
+    assert any(line.startswith("engine;_step_tick;_calculate_income ") for line in lines)
@@ -0,0 +1,63 @@
+"""Tests for multi-scenario robust evaluation."""
+
+import pickle
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.econ import get_catalog
+from bar_sim.models import MapConfig
+from bar_sim.optimizer import enforce_constraints, make_goal, random_seed
+from bar_sim.robust import RobustEvaluator, aggregate_scores, make_scenarios
+
+
+def _scenarios():
+    return make_scenarios([MapConfig(avg_wind=6, wind_variance=4),
+                           MapConfig(avg_wind=14, mex_spots=4)], [1, 2, 3, 4])
+
+
+def _candidates(map_config, n=10):
+    rng = random.Random(5)
+    return [enforce_constraints(random_seed(map_config, rng), map_config) for _ in range(n)]
+
+
+def test_aggregates():
+    up, down = make_goal("max_metal"), make_goal("min_stall")
+    scores = [4.0, 1.0, 3.0, 2.0]
+    assert aggregate_scores(scores, up, "mean") == 2.5
+    assert aggregate_scores(scores, up, "worst") == 1.0
+    assert aggregate_scores(scores, down, "worst") == 4.0
+    assert aggregate_scores(scores, up, "cvar", cvar_alpha=0.5) == 1.5
+
+
+def test_racing_saves_runs_and_never_promotes_dropouts(default_map_config):
+    goal = make_goal("balanced", target_time=300)
+    bos = _candidates(default_map_config)
+    full = RobustEvaluator(goal, _scenarios(), aggregate="cvar", race=False)
+    raced = RobustEvaluator(goal, _scenarios(), aggregate="cvar")
+    exact = [s for s, _ in full.evaluate_many(bos)]
+    results = raced.evaluate_many(bos)
+
+    assert raced.stats()["scenario_runs"] < full.stats()["scenario_runs"]
+    finished = [s for s, complete in results if complete]
+    for (score, complete), truth in zip(results, exact):
+        if complete:
+            assert score == truth
+        else:
+            assert score <= min(finished)
+
+
+def test_goals_and_catalogs_pickle_for_workers(default_map_config):
+    goal = pickle.loads(pickle.dumps(make_goal("max_army", target_time=240)))
+    assert goal.name == "max_army" and "240s" in goal.description
+    assert pickle.loads(pickle.dumps(get_catalog("ARMADA"))) is get_catalog("ARMADA")
+
+    bos = _candidates(default_map_config, n=4)
+    serial = RobustEvaluator(make_goal("balanced"), _scenarios())
+    parallel = RobustEvaluator(make_goal("balanced"), _scenarios(), workers=2)
+    try:
+        assert serial.evaluate_many(bos) == parallel.evaluate_many(bos)
+    finally:
+        parallel.close()
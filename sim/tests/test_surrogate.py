@@ -0,0 +1,49 @@
+"""Tests for the surrogate fitness model."""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("numpy")
+
+from bar_sim.optimizer import Optimizer, enforce_constraints, make_goal, random_seed
+from bar_sim.surrogate import BuildOrderFeatures, SurrogateModel, spearman
+
+
+def test_features_fixed_length(default_map_config):
+    rng = random.Random(3)
+    enc = BuildOrderFeatures()
+    for _ in range(5):
+        bo = enforce_constraints(random_seed(default_map_config, rng), default_map_config)
+        assert len(enc.encode(bo)) == enc.size
+
+
+def test_spearman():
+    assert spearman([1, 2, 3, 4], [10, 20, 30, 40]) == pytest.approx(1.0)
+    assert spearman([1, 2, 3, 4], [4, 3, 2, 1]) == pytest.approx(-1.0)
+
+
+def test_surrogate_learns_mex_count(default_map_config):
+    """A target that depends only on queue contents is ranked well."""
+    rng = random.Random(5)
+    model = SurrogateModel(min_samples=10)
+    mex = lambda bo: sum(a.unit_key == "mex" for a in bo.commander_queue)
+    for _ in range(200):
+        bo = random_seed(default_map_config, rng)
+        model.observe(bo, float(mex(bo)))
+    test = [random_seed(default_map_config, rng) for _ in range(50)]
+    assert spearman(model.predict(test), [mex(bo) for bo in test]) > 0.8
+
+
+def test_optimizer_reports_surrogate_stats(default_map_config):
+    opt = Optimizer(make_goal("max_metal", 180), default_map_config, duration=240,
+                    population_size=10, max_generations=6, verbose=False,
+                    surrogate_ratio=3, surrogate_min_samples=10)
+    opt.optimize()
+    info = opt.progress()
+    assert info["sims_saved"] > 0
+    assert info["surrogate_samples"] >= 10
@@ -0,0 +1,73 @@
+"""Tests for parameter sweeps."""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.models import BuildOrder
+from bar_sim.strategy import EnergyStrategy, StrategyConfig
+from bar_sim.sweep import (
+    completed_cells, grid_cells, lhs_cells, parse_param, run_sweep,
+)
+
+
+def _base():
+    return BuildOrder(name="sweep", strategy_config=StrategyConfig())
+
+
+def test_parse_and_grid():
+    wind = parse_param("avg_wind=4:20:5")
+    assert wind.values == (4.0, 8.0, 12.0, 16.0, 20.0) and (wind.low, wind.high) == (4, 20)
+    energy = parse_param("energy_strategy=*")
+    assert energy.values == tuple(EnergyStrategy)
+    assert parse_param("opening_mex_count=1,3").values == (1, 3)
+    with pytest.raises(ValueError):
+        parse_param("not_a_field=1")
+    with pytest.raises(ValueError):
+        grid_cells([parse_param("mex_value=1:4")])
+    cells = grid_cells([wind, energy])
+    assert len(cells) == 20 and cells[1] == {"avg_wind": 4.0, "energy_strategy": EnergyStrategy.WIND_ONLY}
+
+
+def test_lhs_covers_every_stratum():
+    params = [parse_param("mex_value=1:3"), parse_param("opening_mex_count=1:4")]
+    cells = lhs_cells(params, 8, seed=3)
+    assert sorted(int((c["mex_value"] - 1) / 2 * 8) for c in cells) == list(range(8))
+    assert sorted(c["opening_mex_count"] for c in cells) == [1, 1, 2, 2, 3, 3, 4, 4]
+    assert cells == lhs_cells(params, 8, seed=3)
+
+
+def test_sweep_shards_resume_and_reuse(tmp_path):
+    params = [parse_param("avg_wind=6:18:3"), parse_param("energy_strategy=wind_only,solar_only")]
+    cells = grid_cells(params) + [grid_cells(params)[0]]
+    full = run_sweep(_base(), params, cells, duration=200)
+    assert full.simulated == 6 and full.cache_hits == 1
+    assert full.rows[-1] == {**full.rows[0], "cell": 6}
+
+    out = tmp_path / "sweep.csv"
+    first = run_sweep(_base(), params, cells, str(out), duration=200, shard=(0, 2))
+    assert [r["cell"] for r in first.rows] == [0, 2, 4, 6]
+    again = run_sweep(_base(), params, cells, str(out), duration=200, shard=(0, 2))
+    assert again.skipped == 4 and again.simulated == 0
+    run_sweep(_base(), params, cells, str(out), duration=200, shard=(1, 2))
+    assert completed_cells(out) == set(range(7))
+    with open(out, newline="") as f:
+        rows = {int(r["cell"]): r for r in csv.DictReader(f)}
+    assert float(rows[3]["metal_income"]) == full.rows[3]["metal_income"]
+    assert rows[1]["energy_strategy"] == "solar_only"
+
+
+def test_sweep_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    params = [parse_param("mex_value=1,2"), parse_param("posture=*")]
+    out = tmp_path / "sweep.parquet"
+    cells = grid_cells(params)
+    run_sweep(_base(), params, cells[:3], str(out), duration=150)
+    run_sweep(_base(), params, cells, str(out), duration=150)
+    table = pq.read_table(out)
+    assert sorted(table.column("cell").to_pylist()) == list(range(len(cells)))
+    assert table.schema.field("posture").type == "string"
@@ -0,0 +1,66 @@
+"""Tests for optimizer telemetry."""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.models import BuildAction, BuildOrder
+from bar_sim.optimizer import Optimizer, StrategyOptimizer, make_goal, make_strategy_goal
+from bar_sim.telemetry import (
+    Telemetry, population_diversity, queue_edit_distance, queue_genotype,
+)
+
+
+def _bo(commander, factory=()):
+    return BuildOrder(name="t", commander_queue=[BuildAction(k) for k in commander],
+                      factory_queues={"factory_0": [BuildAction(k) for k in factory]})
+
+
+def test_queue_edit_distance():
+    a = queue_genotype(_bo(["mex", "mex", "wind"], ["tick"]))
+    b = queue_genotype(_bo(["mex", "wind", "wind", "solar"], ["tick"]))
+    c = queue_genotype(_bo(["mex", "mex", "wind"]))
+    assert queue_edit_distance(a, a) == 0
+    assert queue_edit_distance(a, b) == 2
+    assert queue_edit_distance(a, c) == 1
+    stats = population_diversity([a, a, b], queue_edit_distance)
+    assert stats == {"diversity": round(4 / 3, 3), "unique_fraction": round(2 / 3, 3)}
+
+
+def test_ga_telemetry_stream(tmp_path, default_map_config):
+    def run(telemetry):
+        opt = Optimizer(make_goal("max_metal"), default_map_config, population_size=10,
+                        max_generations=3, verbose=False, telemetry=telemetry)
+        seen = []
+        opt.optimize(progress_callback=seen.append)
+        return opt, seen
+
+    path = tmp_path / "run.jsonl"
+    plain, _ = run(None)
+    opt, seen = run(Telemetry(path, run_id="t"))
+    assert opt.history == plain.history
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [r["generation"] for r in lines] == [0, 1, 2, 3]
+    assert [info["telemetry"] for info in seen] == lines
+    last = lines[-1]
+    assert last["run"] == "t"
+    assert last["evaluations"] == opt.eval_stats.evaluations
+    assert last["pruned"] == opt.eval_stats.pruned
+    assert last["sim_seconds"] > 0 and last["operator_seconds"] > 0
+    assert last["diversity"] >= 0 and 0 < last["unique_fraction"] <= 1
+
+
+def test_strategy_telemetry_reports_cache(default_map_config):
+    telemetry = Telemetry()
+    opt = StrategyOptimizer(make_strategy_goal("max_eco_strat"), default_map_config,
+                            duration=120, population_size=8, max_generations=2,
+                            verbose=False, telemetry=telemetry)
+    opt.optimize()
+    rec = telemetry.records[-1]
+    assert len(telemetry.records) == 3
+    assert rec["cache_hits"] == opt.cache_hits
+    assert rec["cache_hit_rate"] == round(opt.cache_hits / (opt.cache_hits + len(opt._cache)), 3)
+    assert rec["evaluations"] == len(opt._cache)
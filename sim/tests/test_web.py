@@ -0,0 +1,111 @@
+"""Tests for the web API."""
+
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+
+from bar_sim import web
+from bar_sim.models import MapData
+
+SIM_ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    orders = tmp_path / "build_orders"
+    orders.mkdir()
+    shutil.copy(SIM_ROOT / "data" / "build_orders" / "wind_opening.yaml", orders)
+    monkeypatch.setattr(web, "BUILD_ORDERS_DIR", orders)
+    monkeypatch.setattr(web, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    return TestClient(web.app)
+
+
+SIMULATE = {"filename": "wind_opening.yaml", "duration": 60}
+
+
+def test_simulate_etag_and_not_modified(client):
+    first = client.post("/api/simulate", json=SIMULATE)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200 and first.headers["X-Cache"] == "miss"
+
+    again = client.post("/api/simulate", json=SIMULATE)
+    assert again.headers["X-Cache"] == "hit" and again.headers["ETag"] == etag
+    assert again.content == first.content
+
+    cond = client.post("/api/simulate", json=SIMULATE, headers={"If-None-Match": etag})
+    assert cond.status_code == 304 and cond.content == b""
+    assert cond.headers["ETag"] == etag
+
+    other = client.post("/api/simulate", json={**SIMULATE, "duration": 90},
+                        headers={"If-None-Match": etag})
+    assert other.status_code == 200 and other.headers["ETag"] != etag
+
+
+def test_unavailable_format_falls_back_to_next_accepted(client, monkeypatch):
+    monkeypatch.setattr(web, "format_available", lambda fmt: fmt not in ("msgpack", "arrow"))
+    accept = {"Accept": "application/x-msgpack, application/json;q=0.5"}
+    r = client.post("/api/simulate", json=SIMULATE, headers=accept)
+    assert r.status_code == 200 and r.headers["content-type"] == "application/json"
+    r = client.post("/api/simulate", json=SIMULATE, headers={"Accept": "application/x-msgpack"})
+    assert r.status_code == 406
+
+
+def _assert_invalidated(client, etag):
+    after = client.post("/api/simulate", json=SIMULATE, headers={"If-None-Match": etag})
+    assert after.status_code == 200 and after.headers["X-Cache"] == "miss"
+    assert after.headers["ETag"] != etag
+
+
+def test_save_invalidates_cache(client):
+    etag = client.post("/api/simulate", json=SIMULATE).headers["ETag"]
+    bo = client.get("/api/build-orders/wind_opening.yaml").json()
+    saved = client.post("/api/save", json={"build_order": bo, "filename": "copy"})
+    assert saved.json() == {"saved": "copy.yaml"}
+    _assert_invalidated(client, etag)
+
+
+def test_map_scan_invalidates_cache(client, monkeypatch):
+    import bar_sim.headless
+
+    class FakeHeadless:
+        def scan_map(self, name):
+            return MapData(name=name, filename=f"{name}.sd7")
+
+    monkeypatch.setattr(bar_sim.headless, "HeadlessEngine", FakeHeadless)
+    etag = client.post("/api/simulate", json=SIMULATE).headers["ETag"]
+    assert client.post("/api/maps/test_map/scan").json()["status"] == "ok"
+    _assert_invalidated(client, etag)
+
+
+def _events(body: str):
+    return [line.split(": ", 1)[1] for line in body.splitlines()
+            if line.startswith("event: ")]
+
+
+def test_finished_job_leaves_no_checkpoint(client, tmp_path):
+    r = client.post("/api/optimize", json={"goal": "max_metal", "duration": 120,
+                                           "generations": 2, "pop_size": 6,
+                                           "job_id": "done"})
+    assert _events(r.text)[0] == "job" and _events(r.text)[-1] == "complete"
+    assert not list((tmp_path / "checkpoints").glob("*.ckpt"))
+
+
+def test_abandoned_checkpoints_expire(client, tmp_path):
+    ckpt_dir = tmp_path / "checkpoints"
+    ckpt_dir.mkdir()
+    old, fresh = ckpt_dir / "old.ckpt", ckpt_dir / "fresh.ckpt"
+    old.write_bytes(b"")
+    fresh.write_bytes(b"")
+    stale = time.time() - web.CHECKPOINT_MAX_AGE - 60
+    os.utime(old, (stale, stale))
+    web._prune_checkpoints()
+    assert not old.exists() and fresh.exists()
@@ -0,0 +1,43 @@
+"""Tests for shared wind traces."""
+
+import math
+import random
+import sys
+from copy import deepcopy
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bar_sim.engine import SimulationEngine
+from bar_sim.wind import clear_cache, generate_wind_trace, wind_trace
+
+
+def test_trace_matches_per_tick_draws():
+    rng = random.Random(7)
+    expected = []
+    for tick in range(1, 301):
+        base = 12.0 + 3.0 * math.sin(tick * 0.05)
+        expected.append(max(0, min(25, base + rng.uniform(-3.0 * 0.3, 3.0 * 0.3))))
+    assert list(generate_wind_trace(12.0, 3.0, 7, 300)) == expected
+
+
+def test_traces_are_shared_prefixes():
+    clear_cache()
+    long = wind_trace(12.0, 3.0, 1, 600)
+    assert wind_trace(12.0, 3.0, 1, 120) is long
+    assert wind_trace(12.0, 3.0, 2, 600) != long
+    longer = wind_trace(12.0, 3.0, 1, 900)
+    assert longer[:600] == long
+
+
+def test_engine_rng_does_not_shift_wind(wind_opening_bo):
+    plain = SimulationEngine(deepcopy(wind_opening_bo), 300)
+    plain.run()
+    noisy = SimulationEngine(deepcopy(wind_opening_bo), 300)
+    winds = []
+    while not noisy.done:
+        noisy.rng.random()  # another stochastic feature drawing each tick
+        noisy.step(1)
+        winds.append(noisy.state.current_wind)
+    assert winds == list(plain._wind[:300])
+    assert noisy.result.snapshots == plain.result.snapshots